@@ -0,0 +1,26 @@
+"""操作日志游标分页索引
+
+Revision ID: b7d2e4a91c30
+Revises: 6581efd64942
+Create Date: 2026-10-18 10:12:41.108532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4a91c30'
+down_revision: Union[str, None] = '6581efd64942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_system_operation_log_created_at_id', 'system_operation_log', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_system_operation_log_created_at_id', table_name='system_operation_log')
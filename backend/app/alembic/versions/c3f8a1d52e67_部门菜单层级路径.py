@@ -0,0 +1,56 @@
+"""部门菜单层级路径
+
+Revision ID: c3f8a1d52e67
+Revises: b7d2e4a91c30
+Create Date: 2026-10-18 14:26:09.573184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d52e67'
+down_revision: Union[str, None] = 'b7d2e4a91c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TREE_TABLES = ('system_dept', 'system_menu')
+
+
+def _backfill_tree_path(table_name: str) -> None:
+    """根据parent_id回填存量数据的层级路径"""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('parent_id', sa.Integer), sa.column('tree_path', sa.String))
+    parent_map = {row.id: row.parent_id for row in bind.execute(sa.select(table.c.id, table.c.parent_id))}
+    paths = {}
+
+    def build(node_id: int) -> str:
+        if node_id not in paths:
+            parent_id = parent_map.get(node_id)
+            prefix = build(parent_id) if parent_id in parent_map else '/'
+            paths[node_id] = f'{prefix}{node_id}/'
+        return paths[node_id]
+
+    for node_id in parent_map:
+        build(node_id)
+    if paths:
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('node_id')).values(tree_path=sa.bindparam('path')),
+            [{'node_id': k, 'path': v} for k, v in paths.items()]
+        )
+
+
+def upgrade() -> None:
+    for table_name in TREE_TABLES:
+        op.add_column(table_name, sa.Column('tree_path', sa.String(length=255), nullable=True, comment='层级路径(如：/1/4/9/)'))
+        op.create_index(op.f(f'ix_{table_name}_tree_path'), table_name, ['tree_path'], unique=False)
+        _backfill_tree_path(table_name)
+
+
+def downgrade() -> None:
+    for table_name in TREE_TABLES:
+        op.drop_index(op.f(f'ix_{table_name}_tree_path'), table_name=table_name)
+        op.drop_column(table_name, 'tree_path')
@@ -0,0 +1,49 @@
+"""操作日志大字段压缩存储
+
+Revision ID: d4a7c9e2b815
+Revises: c3f8a1d52e67
+Create Date: 2026-10-18 16:05:37.284619
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c9e2b815'
+down_revision: Union[str, None] = 'c3f8a1d52e67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {'request_payload': '请求体', 'response_json': '响应体'}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    # SQLite 列类型不做强制约束,无需修改即可存储二进制数据
+    if dialect == 'sqlite':
+        return
+    for column, comment in COLUMNS.items():
+        if dialect == 'mysql':
+            op.alter_column('system_operation_log', column, existing_type=sa.Text(), type_=mysql.MEDIUMBLOB(),
+                            existing_nullable=True, comment=comment, existing_comment=comment)
+        else:
+            op.alter_column('system_operation_log', column, existing_type=sa.Text(), type_=sa.LargeBinary(),
+                            existing_nullable=True, postgresql_using=f"convert_to({column}, 'UTF8')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return
+    # 已压缩的数据无法直接还原为文本,降级前请先导出
+    for column, comment in COLUMNS.items():
+        if dialect == 'mysql':
+            op.alter_column('system_operation_log', column, existing_type=mysql.MEDIUMBLOB(), type_=sa.Text(),
+                            existing_nullable=True, comment=comment, existing_comment=comment)
+        else:
+            op.alter_column('system_operation_log', column, existing_type=sa.LargeBinary(), type_=sa.Text(),
+                            existing_nullable=True, postgresql_using=f"convert_from({column}, 'UTF8')")
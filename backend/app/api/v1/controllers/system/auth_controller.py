@@ -36,12 +36,17 @@ router = APIRouter(route_class=OperationLogRoute)
 @router.post("/login", summary="登录", description="登录", response_model=JWTOutSchema)
 async def login_for_access_token_controller(
     request: Request,
+    background_tasks: BackgroundTasks,
     redis: Redis = Depends(redis_getter),
     login_form: CustomOAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(db_getter),
 ) -> Union[JSONResponse, Dict]:
     user = await LoginService.authenticate_user_service(request=request, redis=redis, login_form=login_form, db=db)
-    login_token = await LoginService.create_token_service(redis=redis, username=user.username)
+    login_token = LoginService.issue_token_service(username=user.username)
+    # 令牌和在线用户信息在响应前一次写入,最后登录时间和登录地点在响应返回后由后台任务补全
+    online = LoginService.build_online_service(request=request, user=user, token=login_token)
+    await LoginService.save_token_service(redis=redis, username=user.username, token=login_token, online=online)
+    background_tasks.add_task(LoginService.record_login_service, redis=redis, online=online)
     logger.info(f"用户{user.username}登录成功")
 
     # 如果是文档请求，则不记录日志:http://localhost:8000/api/v1/docs
@@ -15,7 +15,6 @@ from app.api.v1.schemas.system.dept_schema import (
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.core.base_schema import BatchSetAvailable
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.core.base_params import PaginationQueryParams
 
 
@@ -28,8 +27,7 @@ async def get_obj_list_controller(
     search: DeptQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:dept:query"]))
 ) -> JSONResponse:
-    result_dict_list = await DeptService.get_dept_list_service(search=search, auth=auth, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list=result_dict_list, page_no=page.page_no, page_size=page.page_size)
+    result_dict = await DeptService.get_dept_page_service(search=search, auth=auth, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询部门成功")
     return SuccessResponse(data=result_dict, msg="查询部门成功")
 
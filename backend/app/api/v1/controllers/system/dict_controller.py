@@ -9,8 +9,8 @@ from app.common.response import StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParams
 from app.core.dependencies import AuthPermission, redis_getter
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.params.system.dict_param import DictTypeQueryParams, DictDataQueryParams
@@ -40,8 +40,7 @@ async def get_type_list_controller(
     search: DictTypeQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:dict_type:query"]))
 ) -> JSONResponse:
-    result_dict_list = await DictTypeService.get_obj_list_service(auth=auth, search=search, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await DictTypeService.get_obj_page_service(auth=auth, search=search, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询字典类型列表成功")
     return SuccessResponse(data=result_dict, msg="查询字典类型列表成功")
 
@@ -86,11 +85,20 @@ async def delete_type_controller(
 @router.post('/type/export', summary="导出字典类型", description="导出字典类型")
 async def export_type_list_controller(
     search: DictTypeQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:dict_type:export"]))
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="字典类型", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: DictTypeService.get_obj_list_service(search=search, auth=job_auth),
+            export=lambda data_list: DictTypeService.export_obj_service(data_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交字典类型导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     result_dict_list = await DictTypeService.get_obj_list_service(search=search, auth=auth)
-    export_result = await DictTypeService.export_obj_service(data_list=result_dict_list)
+    export_result = DictTypeService.export_obj_service(data_list=result_dict_list)
     logger.info('导出字典类型成功')
 
     return StreamResponse(
@@ -116,8 +124,7 @@ async def get_data_list_controller(
     search: DictDataQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:dict_data:query"]))
 ) -> JSONResponse:
-    result_dict_list = await DictDataService.get_obj_list_service(auth=auth, search=search, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await DictDataService.get_obj_page_service(auth=auth, search=search, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询字典数据列表成功")
     return SuccessResponse(data=result_dict, msg="查询字典数据列表成功")
 
@@ -154,11 +161,20 @@ async def delete_data_controller(
 @router.post('/data/export', summary="导出字典数据", description="导出字典数据")
 async def export_data_list_controller(
     search: DictDataQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:dict_data:export"]))
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="字典数据", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: DictDataService.get_obj_list_service(search=search, auth=job_auth),
+            export=lambda data_list: DictDataService.export_obj_service(data_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交字典数据导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     result_dict_list = await DictDataService.get_obj_list_service(search=search, auth=auth)
-    export_result = await DictDataService.export_obj_service(data_list=result_dict_list)
+    export_result = DictDataService.export_obj_service(data_list=result_dict_list)
     logger.info('导出字典数据成功')
 
     return StreamResponse(
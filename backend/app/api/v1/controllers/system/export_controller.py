@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import urllib.parse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse, JSONResponse
+
+from app.common.response import SuccessResponse
+from app.core.dependencies import get_current_user
+from app.core.exceptions import CustomException
+from app.core.export_job import ExportJob
+from app.api.v1.schemas.system.auth_schema import AuthSchema
+from app.core.logger import logger
+
+router = APIRouter()
+
+
+@router.get("/detail", summary="导出任务详情", description="查询后台导出任务状态和进度")
+async def get_export_job_detail_controller(
+    job_id: str = Query(..., description="导出任务ID"),
+    auth: AuthSchema = Depends(get_current_user)
+) -> JSONResponse:
+    job = await ExportJob.get(job_id=job_id, user_id=auth.user.id)
+    return SuccessResponse(data=job, msg="获取导出任务详情成功")
+
+
+@router.get("/download", summary="下载导出文件", description="下载已完成的后台导出文件")
+async def download_export_file_controller(
+    job_id: str = Query(..., description="导出任务ID"),
+    auth: AuthSchema = Depends(get_current_user)
+) -> FileResponse:
+    job = await ExportJob.get(job_id=job_id, user_id=auth.user.id)
+    if job.get("status") != ExportJob.SUCCESS:
+        raise CustomException(msg="导出任务尚未完成")
+
+    path = ExportJob.file_path(job_id=job_id, suffix=job["suffix"])
+    if not path.exists():
+        raise CustomException(msg="导出文件不存在或已过期")
+
+    logger.info(f"{auth.user.name} 下载导出文件 {job_id}")
+    return FileResponse(
+        path=path,
+        headers={
+            'Content-Disposition': f'attachment; filename={urllib.parse.quote(job["name"] + "." + job["suffix"])}',
+            'Access-Control-Expose-Headers': 'Content-Disposition'
+        }
+    )
@@ -7,8 +7,8 @@ from app.common.response import StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParams
 from app.core.dependencies import AuthPermission
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.params.system.job_param import JobQueryParams
@@ -37,8 +37,7 @@ async def get_obj_list_controller(
     search: JobQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:job:query"]))
 ) -> JSONResponse:
-    result_dict_list = await JobService.get_job_list_service(auth=auth, search=search, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await JobService.get_job_page_service(auth=auth, search=search, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询定时任务列表成功")
     return SuccessResponse(data=result_dict, msg="查询定时任务列表成功")
 
@@ -72,11 +71,20 @@ async def delete_obj_controller(
 @router.post('/export', summary="导出定时任务", description="导出定时任务")
 async def export_obj_list_controller(
     search: JobQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:job:export"]))
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="定时任务", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: JobService.get_job_list_service(search=search, auth=job_auth),
+            export=lambda data_list: JobService.export_job_service(data_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交定时任务导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     result_dict_list = await JobService.get_job_list_service(search=search, auth=auth)
-    export_result = await JobService.export_job_service(data_list=result_dict_list)
+    export_result = JobService.export_job_service(data_list=result_dict_list)
     logger.info('导出定时任务成功')
 
     return StreamResponse(
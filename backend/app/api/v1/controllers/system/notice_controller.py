@@ -7,9 +7,9 @@ from app.common.response import StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParams
 from app.core.dependencies import AuthPermission, get_current_user
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.base_schema import BatchSetAvailable
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.params.system.notice_param import NoticeQueryParams
@@ -37,8 +37,7 @@ async def get_obj_list_controller(
     search: NoticeQueryParams = Depends(),
     auth: AuthSchema = Depends(get_current_user)
 ) -> JSONResponse:
-    result_dict_list = await NoticeService.get_notice_list_service(auth=auth, search=search, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await NoticeService.get_notice_page_service(auth=auth, search=search, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询公告列表成功")
     return SuccessResponse(data=result_dict, msg="查询公告列表成功")
 
@@ -53,8 +52,7 @@ async def get_public_notice_list_controller(
     """
     search = NoticeQueryParams(available=True)
 
-    result_dict_list = await NoticeService.get_notice_list_service(auth=auth, search=search, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await NoticeService.get_notice_page_service(auth=auth, search=search, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询公开公告列表成功")
     return SuccessResponse(data=result_dict, msg="查询公开公告列表成功")
 
@@ -97,11 +95,20 @@ async def batch_set_available_obj_controller(
 @router.post('/export', summary="导出公告", description="导出公告")
 async def export_obj_list_controller(
     search: NoticeQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:notice:export"]))
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="公告", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: NoticeService.get_notice_list_service(search=search, auth=job_auth),
+            export=lambda data_list: NoticeService.export_notice_service(notice_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交公告导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     result_dict_list = await NoticeService.get_notice_list_service(search=search, auth=auth)
-    export_result = await NoticeService.export_notice_service(notice_list=result_dict_list)
+    export_result = NoticeService.export_notice_service(notice_list=result_dict_list)
     logger.info('导出公告成功')
 
     return StreamResponse(
@@ -1,36 +1,48 @@
 # -*- coding: utf-8 -*-
 
+from typing import AsyncIterator
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.common.request import PaginationService
 from app.common.response import SuccessResponse, StreamResponse
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob, ProgressCallback
 from app.core.dependencies import AuthPermission
+from app.core.exceptions import CustomException
+from app.core.operation_log_sink import SQLOperationLogSink
+from app.core.operation_log_writer import OperationLogWriter
 from app.core.base_params import PaginationQueryParams
 from app.api.v1.params.system.operation_log_param import OperationLogQueryParams
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.services.system.operation_log_service import OperationLogService
 from app.core.logger import logger
-from app.utils.common_util import bytes2file_response
+from app.utils.excel_util import ExcelUtil
 
 router = APIRouter(route_class=OperationLogRoute)
 
 
-@router.get("/list", summary="查询日志", description="查询日志")
+def check_log_readable() -> None:
+    """操作日志写入MongoDB或文件时数据库中没有新日志,不支持在系统中查询和导出"""
+    if not isinstance(OperationLogWriter.sink(), SQLOperationLogSink):
+        raise CustomException(msg="操作日志未写入数据库,请到MongoDB或日志文件中查看")
+
+
+@router.get("/list", summary="查询日志", description="查询日志", dependencies=[Depends(check_log_readable)])
 async def get_obj_list_controller(
     page: PaginationQueryParams = Depends(),
     search: OperationLogQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:log:query"]))
 ) -> JSONResponse:
     """ 查询日志 """
-    result_dict_list = await OperationLogService.get_log_list_service(search=search, auth=auth, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    if page.use_cursor:
+        result_dict = await OperationLogService.get_log_cursor_page_service(search=search, auth=auth, page_size=page.page_size or 10, cursor=page.cursor)
+    else:
+        result_dict = await OperationLogService.get_log_page_service(search=search, auth=auth, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询日志成功")
     return SuccessResponse(data=result_dict, msg="查询日志成功")
 
 
-@router.get("/detail", summary="日志详情", description="日志详情")
+@router.get("/detail", summary="日志详情", description="日志详情", dependencies=[Depends(check_log_readable)])
 async def get_obj_detail_controller(
     id: int = Query(..., description="操作日志ID"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:log:query"]))
@@ -52,20 +64,28 @@ async def delete_obj_log_controller(
     return SuccessResponse(msg="删除日志成功")
 
 
-@router.post("/export", summary="导出日志", description="导出日志")
+@router.post("/export", summary="导出日志", description="导出日志", dependencies=[Depends(check_log_readable)])
 async def export_obj_list_controller(
     search: OperationLogQueryParams = Depends(),
+    file_format: str = Query('xlsx', alias="format", pattern="^(xlsx|csv|tsv)$", description="导出格式(xlsx/csv/tsv)"),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:log:export"]))
 ) -> StreamingResponse:
     """ 导出日志 """
-    operation_log_list = await OperationLogService.get_log_list_service(search=search, auth=auth)
-    operation_log_export_result = await OperationLogService.export_log_list_service(operation_log_list=operation_log_list)
+    if background:
+        async def builder(job_auth: AuthSchema, progress: ProgressCallback) -> AsyncIterator[bytes]:
+            return OperationLogService.export_log_stream_service(search=search, auth=job_auth, file_format=file_format, progress=progress)
+        job_id = await ExportJob.submit(auth=auth, name="操作日志", builder=builder, suffix=file_format)
+        logger.info(f"{auth.user.name} 提交操作日志导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
+    operation_log_export_result = OperationLogService.export_log_stream_service(search=search, auth=auth, file_format=file_format)
     logger.info('导出日志成功')
 
     return StreamResponse(
-        data=bytes2file_response(operation_log_export_result),
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        data=operation_log_export_result,
+        media_type=ExcelUtil.EXPORT_MEDIA_TYPES[file_format],
         headers = {
-            'Content-Disposition': 'attachment; filename=data.xlsx'
+            'Content-Disposition': f'attachment; filename=data.{file_format}'
         }
     )
@@ -7,6 +7,7 @@ from app.common.response import StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParams
 from app.api.v1.params.system.position_param import PositionQueryParams
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.dependencies import AuthPermission
 from app.api.v1.services.system.position_service import PositionService
 from app.api.v1.schemas.system.auth_schema import AuthSchema
@@ -16,7 +17,6 @@ from app.api.v1.schemas.system.position_schema import (
 )
 from app.core.base_schema import BatchSetAvailable
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 
 
@@ -29,8 +29,7 @@ async def get_obj_list_controller(
     search: PositionQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:position:query"])),
 ) -> JSONResponse:
-    result_dict_list = await PositionService.get_position_list_service(search=search, auth=auth, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await PositionService.get_position_page_service(search=search, auth=auth, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询岗位列表成功")
     return SuccessResponse(data=result_dict, msg="查询岗位列表成功")
 
@@ -88,11 +87,20 @@ async def batch_set_available_obj_controller(
 @router.post('/export', summary="导出岗位", description="导出岗位")
 async def export_obj_list_controller(
     search: PositionQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:position:export"])),
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="岗位", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: PositionService.get_position_list_service(search=search, auth=job_auth),
+            export=lambda data_list: PositionService.export_post_list_service(post_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交岗位导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     position_query_result = await PositionService.get_position_list_service(search=search, auth=auth)
-    position_export_result = await PositionService.export_post_list_service(post_list=position_query_result)
+    position_export_result = PositionService.export_post_list_service(post_list=position_query_result)
     logger.info('导出岗位成功')
 
     return StreamResponse(
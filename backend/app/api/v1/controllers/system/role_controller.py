@@ -6,6 +6,7 @@ from aioredis import Redis
 
 from app.common.response import StreamResponse, SuccessResponse
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.base_params import PaginationQueryParams
 from app.api.v1.params.system.role_param import RoleQueryParams
 from app.core.dependencies import AuthPermission, redis_getter
@@ -18,7 +19,6 @@ from app.api.v1.schemas.system.role_schema import (
 )
 from app.core.base_schema import BatchSetAvailable
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 
 
@@ -31,8 +31,7 @@ async def get_obj_list_controller(
     search: RoleQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:role:query"])),
 ) -> JSONResponse:
-    result_dict_list = await RoleService.get_role_list_service(search=search, auth=auth, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await RoleService.get_role_page_service(search=search, auth=auth, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询角色成功")
     return SuccessResponse(data=result_dict, msg="查询角色成功")
 
@@ -101,10 +100,19 @@ async def set_role_permission_controller(
 @router.post('/export', summary="导出角色", description="导出角色")
 async def export_obj_list_controller(
     search: RoleQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:role:export"])),
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="角色", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: RoleService.get_role_list_service(search=search, auth=job_auth),
+            export=lambda data_list: RoleService.export_role_list_service(role_list=data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交角色导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     role_query_result = await RoleService.get_role_list_service(search=search, auth=auth)
-    role_export_result = await RoleService.export_role_list_service(role_list=role_query_result)
+    role_export_result = RoleService.export_role_list_service(role_list=role_query_result)
     logger.info('导出角色成功')
 
     return StreamResponse(
@@ -8,6 +8,7 @@ import urllib.parse
 from app.common.response import StreamResponse, SuccessResponse
 from app.api.v1.services.system.user_service import UserService
 from app.core.router_class import OperationLogRoute
+from app.core.export_job import ExportJob
 from app.core.dependencies import db_getter, get_current_user, AuthPermission
 from app.core.base_params import PaginationQueryParams
 from app.api.v1.params.system.user_param import UserQueryParams
@@ -22,7 +23,6 @@ from app.api.v1.schemas.system.user_schema import (
 )
 from app.core.base_schema import BatchSetAvailable
 from app.core.logger import logger
-from app.common.request import PaginationService
 from app.utils.common_util import bytes2file_response
 
 router = APIRouter(route_class=OperationLogRoute)
@@ -95,8 +95,7 @@ async def get_obj_list_controller(
     search: UserQueryParams = Depends(),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:user:query"])),
 ) -> JSONResponse:
-    result_dict_list = await UserService.get_user_list_service(search=search, auth=auth, order_by=page.order_by)
-    result_dict = await PaginationService.get_page_obj(data_list= result_dict_list, page_no= page.page_no, page_size = page.page_size)
+    result_dict = await UserService.get_user_page_service(search=search, auth=auth, page_no=page.page_no, page_size=page.page_size, order_by=page.order_by)
     logger.info(f"{auth.user.name} 查询用户成功")
     return SuccessResponse(data=result_dict, msg="查询用户成功")
 
@@ -170,11 +169,20 @@ async def export_obj_template_controller()-> StreamingResponse:
 async def export_obj_list_controller(
     page: PaginationQueryParams = Depends(),
     search: UserQueryParams = Depends(),
+    background: bool = Query(False, description="是否提交后台导出任务"),
     auth: AuthSchema = Depends(AuthPermission(permissions=["system:user:export"])),
 ) -> StreamingResponse:
+    if background:
+        job_id = await ExportJob.submit(auth=auth, name="用户", builder=ExportJob.list_builder(
+            fetch=lambda job_auth: UserService.get_user_list_service(auth=job_auth, search=search, order_by=page.order_by),
+            export=lambda data_list: UserService.export_user_list_service(data_list)
+        ))
+        logger.info(f"{auth.user.name} 提交用户导出任务 {job_id}")
+        return SuccessResponse(data={"job_id": job_id}, msg="导出任务已提交")
+
     # 获取全量数据
     user_list = await UserService.get_user_list_service(auth=auth, search=search, order_by=page.order_by)
-    user_export_result = await UserService.export_user_list_service(user_list)
+    user_export_result = UserService.export_user_list_service(user_list)
     logger.info('导出用户成功')
 
     return StreamResponse(
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.dept_model import DeptModel
@@ -42,6 +43,25 @@ class DeptCRUD(CRUDBase[DeptModel, DeptCreateSchema, DeptUpdateSchema]):
         :return: 部门列表
         """
         obj_list = await self.list(search=search, order_by=order_by)
+        await self.__set_parent_name(obj_list)
+        return obj_list
+
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[DeptModel], int]:
+        """
+        分页获取部门列表及总数
+        
+        :param page_no: 当前页码
+        :param page_size: 每页数量
+        :param search: 搜索条件
+        :param order_by: 排序字段
+        :return: 部门列表, 总数
+        """
+        obj_list, total = await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+        await self.__set_parent_name(obj_list)
+        return obj_list, total
+
+    async def __set_parent_name(self, obj_list: Sequence[DeptModel]) -> None:
+        """批量填充父级部门名称"""
         parent_ids = [obj.parent_id for obj in obj_list if obj.parent_id]
         if parent_ids:
             parents = await self.list(search={"id": ("in", parent_ids)})
@@ -49,16 +69,41 @@ class DeptCRUD(CRUDBase[DeptModel, DeptCreateSchema, DeptUpdateSchema]):
             for obj in obj_list:
                 if obj.parent_id:
                     obj.parent_name = parent_map.get(obj.parent_id)
-        return obj_list
 
     async def set_available_crud(self, ids: List[int], available: bool) -> None:
         """
-        批量设置部门可用状态
+        批量设置部门可用状态,启用时同时启用所有上级,禁用时同时禁用所有下级
         
         :param ids: 部门ID列表
         :param available: 可用状态
         """
-        await self.set(ids=ids, available=available)
+        await self.set_tree_available(ids=ids, available=available)
+
+    async def get_map_crud(self, ids: List[int]) -> Dict[int, DeptModel]:
+        """
+        根据id列表批量获取部门,一次IN查询
+        
+        :param ids: 部门ID列表
+        :return: {部门ID: 部门信息} 映射字典
+        """
+        ids = list({id for id in ids if id})
+        if not ids:
+            return {}
+        obj_list = await self.list(search={"id": ("in", ids)})
+        return {obj.id: obj for obj in obj_list}
+
+    async def get_exist_ids_crud(self, ids: List[int]) -> Set[int]:
+        """
+        批量筛选存在的部门ID,只查询主键列
+        
+        :param ids: 部门ID列表
+        :return: 存在的部门ID集合
+        """
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        result = await self.db.execute(select(DeptModel.id).where(DeptModel.id.in_(ids)))
+        return set(result.scalars().all())
 
     async def get_name_crud(self, id: int) -> Optional[str]:
         """
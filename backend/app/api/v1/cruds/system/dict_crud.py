@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.dict_model import DictDataModel, DictTypeModel
@@ -24,6 +24,10 @@ class DictTypeCRUD(CRUDBase[DictTypeModel, DictTypeCreateSchema, DictTypeUpdateS
         """获取数据字典类型列表"""
         return await self.list(search=search, order_by=order_by)
     
+    async def get_obj_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[DictTypeModel], int]:
+        """获取数据字典类型分页列表及总数"""
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+    
     async def create_obj_crud(self, data: DictTypeCreateSchema) -> Optional[DictTypeModel]:
         """创数据字典类型"""
         return await self.create(data=data)
@@ -57,6 +61,10 @@ class DictDataCRUD(CRUDBase[DictDataModel, DictDataCreateSchema, DictDataUpdateS
         """获取数据字典数据列表"""
         return await self.list(search=search, order_by=order_by)
     
+    async def get_obj_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[DictDataModel], int]:
+        """获取数据字典数据分页列表及总数"""
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+    
     async def create_obj_crud(self, data: DictDataCreateSchema) -> Optional[DictDataModel]:
         """创建数据字典数据"""
         return await self.create(data=data)
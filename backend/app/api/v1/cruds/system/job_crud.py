@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.job_model import JobModel
@@ -24,6 +24,10 @@ class JobCRUD(CRUDBase[JobModel, JobCreateSchema, JobUpdateSchema]):
         """获取定时任务列表"""
         return await self.list(search=search, order_by=order_by)
     
+    async def get_obj_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[JobModel], int]:
+        """获取定时任务分页列表及总数"""
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+    
     async def create_obj_crud(self, data: JobCreateSchema) -> Optional[JobModel]:
         """创定时任务"""
         return await self.create(data=data)
@@ -55,12 +55,12 @@ class MenuCRUD(CRUDBase[MenuModel, MenuCreateSchema, MenuUpdateSchema]):
 
     async def set_available_crud(self, ids: List[int], available: bool) -> None:
         """
-        批量设置菜单可用状态
+        批量设置菜单可用状态,启用时同时启用所有上级,禁用时同时禁用所有下级
 
         :param ids: 菜单ID列表
         :param available: 可用状态
         """
-        await self.set(ids=ids, available=available)
+        await self.set_tree_available(ids=ids, available=available)
 
     async def get_roles_by_menu_id_crud(self, menu_id: int) -> List[RoleModel]:
         """
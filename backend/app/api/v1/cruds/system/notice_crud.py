@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.notice_model import NoticeModel
@@ -24,6 +24,10 @@ class NoticeCRUD(CRUDBase[NoticeModel, NoticeCreateSchema, NoticeUpdateSchema]):
         """获取公告列表"""
         return await self.list(search=search, order_by=order_by)
     
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[NoticeModel], int]:
+        """获取公告分页列表及总数"""
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+    
     async def create_crud(self, data: NoticeCreateSchema) -> Optional[NoticeModel]:
         """创建公告"""
         return await self.create(data=data)
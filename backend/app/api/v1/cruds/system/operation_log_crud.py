@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.orm import defer
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.operation_log_model import OperationLogModel
@@ -11,6 +14,14 @@ from app.api.v1.schemas.system.auth_schema import AuthSchema
 class OperationLogCRUD(CRUDBase[OperationLogModel, OperationLogCreateSchema, None]):
     """操作日志数据层"""
 
+    loader_profiles = {
+        # 列表: 不查询请求体和响应体大字段
+        "list": [
+            defer(OperationLogModel.request_payload, raiseload=True),
+            defer(OperationLogModel.response_json, raiseload=True),
+        ],
+    }
+
     def __init__(self, auth: AuthSchema) -> None:
         """初始化操作日志CRUD"""
         self.auth = auth
@@ -25,6 +36,30 @@ class OperationLogCRUD(CRUDBase[OperationLogModel, OperationLogCreateSchema, Non
         """
         return await self.create(data=data.model_dump())
 
+    async def create_batch_crud(self, data_list: List[Dict]) -> None:
+        """
+        批量创建操作日志记录,合并为多行INSERT且不回读记录
+        
+        :param data_list: 操作日志字典列表
+        """
+        if data_list:
+            await self.db.execute(insert(self.model), data_list)
+
+    async def get_expired_batch_crud(self, before: datetime, limit: int) -> List[Dict]:
+        """
+        按创建时间顺序获取一批过期的操作日志,只查询本表字段,不加载关联对象
+        
+        :param before: 过期时间点,创建时间早于该时间的记录视为过期
+        :param limit: 单批条数
+        :return: 操作日志字典列表
+        """
+        sql = (select(*self.model.__table__.columns)
+              .where(self.model.created_at < before)
+              .order_by(self.model.created_at, self.model.id)
+              .limit(limit))
+        result = await self.db.execute(sql)
+        return [dict(row) for row in result.mappings().all()]
+
     async def get_by_id_crud(self, id: int) -> Optional[OperationLogModel]:
         """
         根据ID获取操作日志详情
@@ -44,3 +79,39 @@ class OperationLogCRUD(CRUDBase[OperationLogModel, OperationLogCreateSchema, Non
         """
         return await self.list(search=search, order_by=order_by)
 
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None, profile: Optional[str] = None) -> Tuple[Sequence[OperationLogModel], int]:
+        """
+        分页获取操作日志列表及总数
+        
+        :param page_no: 当前页码
+        :param page_size: 每页数量
+        :param search: 搜索条件
+        :param order_by: 排序字段
+        :param profile: 加载策略配置名
+        :return: 操作日志列表, 总数
+        """
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by, profile=profile)
+
+    async def get_cursor_page_crud(self, page_size: int, cursor: Optional[Tuple[datetime, int]] = None, search: Dict = None, profile: Optional[str] = None) -> Tuple[Sequence[OperationLogModel], Optional[Tuple[datetime, int]]]:
+        """
+        按 (created_at, id) 倒序游标分页获取操作日志列表
+        
+        :param page_size: 每页数量
+        :param cursor: 上一页最后一条记录的 (created_at, id)
+        :param search: 搜索条件
+        :param profile: 加载策略配置名
+        :return: 操作日志列表, 下一页游标
+        """
+        return await self.cursor_page(page_size=page_size, cursor=cursor, search=search, profile=profile)
+
+    async def get_stream_crud(self, search: Dict = None, order_by: List[Dict[str, str]] = None, chunk_size: int = 1000) -> AsyncIterator[Sequence[OperationLogModel]]:
+        """
+        以服务端游标分块读取操作日志,用于导出
+        
+        :param search: 搜索条件
+        :param order_by: 排序字段
+        :param chunk_size: 每块条数
+        :return: 操作日志分块的异步迭代器
+        """
+        async for log_list in self.stream(search=search, order_by=order_by, chunk_size=chunk_size):
+            yield log_list
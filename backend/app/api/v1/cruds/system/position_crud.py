@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.base_crud import CRUDBase
 from app.api.v1.models.system.position_model import PositionModel
@@ -35,6 +35,18 @@ class PositionCRUD(CRUDBase[PositionModel, PositionCreateSchema, PositionUpdateS
         """
         return await self.list(search=search, order_by=order_by)
 
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[PositionModel], int]:
+        """
+        分页获取岗位列表及总数
+        
+        :param page_no: 当前页码
+        :param page_size: 每页数量
+        :param search: 搜索条件
+        :param order_by: 排序字段
+        :return: 岗位列表, 总数
+        """
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+
     async def set_available_crud(self, ids: List[int], available: bool) -> None:
         """
         批量设置岗位可用状态
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Sequence, Optional
+from typing import Dict, List, Sequence, Optional, Tuple
 from sqlalchemy import select
 
 from app.core.base_crud import CRUDBase
@@ -27,6 +27,10 @@ class RoleCRUD(CRUDBase[RoleModel, RoleCreateSchema, RoleUpdateSchema]):
         """获取角色列表"""
         return await self.list(search=search, order_by=order_by)
 
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Tuple[Sequence[RoleModel], int]:
+        """获取角色分页列表及总数"""
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by)
+
     async def set_role_menus_crud(self, role_ids: List[int], menu_ids: List[int]) -> None:
         """设置角色的菜单权限"""
         roles = await self.list(search={"id": ("in", role_ids)})
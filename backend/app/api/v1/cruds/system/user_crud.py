@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Sequence, Optional
+from typing import Dict, List, Sequence, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import load_only, noload, selectinload
 
-
-from app.core.base_crud import CRUDBase
+from app.core.base_crud import CRUDBase, load_creator
 from app.api.v1.models.system.user_model import UserModel
+from app.api.v1.models.system.role_model import RoleModel
+from app.api.v1.models.system.position_model import PositionModel
 from app.api.v1.cruds.system.role_crud import RoleCRUD
 from app.api.v1.cruds.system.position_crud import PositionCRUD
 from app.api.v1.schemas.system.user_schema import (
@@ -19,58 +22,164 @@ from app.api.v1.schemas.system.auth_schema import AuthSchema
 class UserCRUD(CRUDBase[UserModel, UserCreateSchema, UserUpdateSchema]):
     """用户模块数据层"""
 
+    loader_profiles = {
+        # 认证: 加载权限计算和用户快照所需的全部关联
+        "auth": [
+            selectinload(UserModel.dept),
+            selectinload(UserModel.roles).options(
+                selectinload(RoleModel.menus), selectinload(RoleModel.depts), load_creator(RoleModel)
+            ),
+            selectinload(UserModel.positions).options(load_creator(PositionModel)),
+        ],
+        # 详情: 同认证,部门名称由服务层批量填充
+        "detail": [
+            selectinload(UserModel.roles).options(
+                selectinload(RoleModel.menus), selectinload(RoleModel.depts), load_creator(RoleModel)
+            ),
+            selectinload(UserModel.positions).options(load_creator(PositionModel)),
+        ],
+        # 列表: 只需角色、岗位本身,不加载角色的菜单和数据权限部门
+        "list": [
+            selectinload(UserModel.roles).options(
+                noload(RoleModel.menus), noload(RoleModel.depts), load_creator(RoleModel)
+            ),
+            selectinload(UserModel.positions).options(load_creator(PositionModel)),
+        ],
+        # 导出: 导出字段不包含角色、岗位
+        "export": [
+            noload(UserModel.roles),
+            noload(UserModel.positions),
+        ],
+    }
+
     def __init__(self, auth: AuthSchema) -> None:
         """初始化用户CRUD"""
         super().__init__(model=UserModel, auth=auth)
 
-    async def get_by_id_crud(self, id: int) -> Optional[UserModel]:
+    async def get_by_id_crud(self, id: int, profile: Optional[str] = None) -> Optional[UserModel]:
         """
         根据id获取用户信息
         
         Args:
             id: 用户ID
+            profile: 加载策略配置名
             
         Returns:
             Optional[UserModel]: 用户信息
         """
-        return await self.get(id=id)
+        return await self.get(id=id, profile=profile)
 
-    async def get_by_username_crud(self, username: str) -> Optional[UserModel]:
+    async def get_by_username_crud(self, username: str, profile: Optional[str] = None) -> Optional[UserModel]:
         """
         根据用户名获取用户信息
         
+        Args:
+            username: 用户名
+            profile: 加载策略配置名
+            
+        Returns:
+            Optional[UserModel]: 用户信息
+        """
+        return await self.get(username=username, profile=profile)
+
+    async def get_login_user_crud(self, username: str) -> Optional[UserModel]:
+        """
+        获取登录校验所需的用户信息,只查询登录用到的列,不加载任何关联
+        
+        完整的权限信息由主体缓存在之后的请求中加载,登录(包括失败的登录)不必在密码校验前加载角色、菜单等关联。
+        
         Args:
             username: 用户名
             
         Returns:
             Optional[UserModel]: 用户信息
         """
-        return await self.get(username=username)
+        result = await self.db.execute(
+            select(UserModel)
+            .where(UserModel.username == username)
+            .options(
+                load_only(UserModel.id, UserModel.username, UserModel.name, UserModel.password, UserModel.available),
+                noload("*")
+            )
+        )
+        return result.scalars().first()
 
-    async def get_list_crud(self, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Sequence[UserModel]:
+    async def get_list_crud(self, search: Dict = None, order_by: List[Dict[str, str]] = None, profile: Optional[str] = None) -> Sequence[UserModel]:
         """
         获取用户列表
         
         Args:
             search: 搜索条件
             order_by: 排序字段
+            profile: 加载策略配置名
             
         Returns:
             Sequence[UserModel]: 用户列表
         """
-        return await self.list(search=search, order_by=order_by)
+        return await self.list(search=search, order_by=order_by, profile=profile)
 
-    async def update_last_login_crud(self, id: int) -> Optional[UserModel]:
+    async def get_page_crud(self, page_no: Optional[int] = None, page_size: Optional[int] = None, search: Dict = None, order_by: List[Dict[str, str]] = None, profile: Optional[str] = None) -> Tuple[Sequence[UserModel], int]:
         """
-        更新用户最后登录时间
+        分页获取用户列表及总数
+        
+        Args:
+            page_no: 当前页码
+            page_size: 每页数量
+            search: 搜索条件
+            order_by: 排序字段
+            profile: 加载策略配置名
+            
+        Returns:
+            Tuple[Sequence[UserModel], int]: 用户列表, 总数
+        """
+        return await self.page(page_no=page_no, page_size=page_size, search=search, order_by=order_by, profile=profile)
+
+    async def update_last_login_crud(self, id: int, last_login: Optional[datetime] = None) -> None:
+        """
+        更新用户最后登录时间(单条UPDATE,不加载用户及其关联)
         
         Args:
             id: 用户ID
+            last_login: 登录时间,为空时取当前时间
+        """
+        await self.set(ids=[id], last_login=last_login or datetime.now())
+
+    async def get_username_map_crud(self, usernames: List[str]) -> Dict[str, int]:
+        """
+        按用户名批量获取用户ID,只查询用户名和主键列,不加载关联
+        
+        Args:
+            usernames: 用户名列表
             
         Returns:
-            Optional[UserModel]: 更新后的用户信息
+            Dict[str, int]: {用户名: 用户ID} 映射字典
+        """
+        result = await self.db.execute(
+            select(UserModel.username, UserModel.id).where(UserModel.username.in_(set(usernames)))
+        )
+        return {username: id for username, id in result.all()}
+
+    async def bulk_create_crud(self, data_list: List[Dict]) -> None:
+        """
+        批量创建用户,合并为多行INSERT且不回读记录
+        
+        Args:
+            data_list: 用户字典列表
+        """
+        if not data_list:
+            return
+        creator_id = self.current_user.id if self.current_user else None
+        await self.db.execute(insert(UserModel), [{**data, "creator_id": creator_id} for data in data_list])
+
+    async def bulk_update_crud(self, data_list: List[Dict]) -> None:
+        """
+        按主键批量更新用户,每条字典需包含id
+        
+        Args:
+            data_list: 用户字典列表
         """
-        return await self.update(id=id, data={"last_login": datetime.now()})
+        if data_list:
+            await self.db.execute(update(UserModel), data_list)
 
     async def set_available_crud(self, ids: List[int], available: bool) -> None:
         """
@@ -27,6 +27,7 @@ class DeptModel(ModelBase):
         index=True, 
         comment="父级部门ID"
     )
+    tree_path = Column(String(255), nullable=True, index=True, comment="层级路径(如：/1/4/9/)")
     parent = relationship(
         "DeptModel", 
         cascade='all, delete-orphan', 
@@ -34,7 +34,7 @@ class DictTypeModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
@@ -72,7 +72,7 @@ class DictDataModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
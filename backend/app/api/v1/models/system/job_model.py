@@ -46,7 +46,7 @@ class JobModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
@@ -45,6 +45,7 @@ class MenuModel(ModelBase):
         index=True, 
         comment="父级菜单ID"
     )
+    tree_path = Column(String(255), nullable=True, index=True, comment="层级路径(如：/1/4/9/)")
     parent = relationship(
         "MenuModel", 
         cascade='all, delete-orphan',
@@ -38,7 +38,7 @@ class NoticeModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
@@ -27,7 +27,7 @@ class PositionModel(ModelBase):
         "UserModel", 
         secondary=UserPositionsModel.__tablename__, 
         back_populates='positions', 
-        lazy="joined",
+        lazy="raise",
         post_update=True,
         uselist=True
     )
@@ -46,7 +46,7 @@ class PositionModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
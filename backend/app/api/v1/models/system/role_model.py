@@ -82,7 +82,7 @@ class RoleModel(ModelBase):
     menus = relationship(
         "MenuModel",
         secondary=RoleMenusModel.__tablename__,
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete",
         passive_deletes=True,
         post_update=True,
@@ -91,7 +91,7 @@ class RoleModel(ModelBase):
     depts = relationship(
         "DeptModel",
         secondary=RoleDeptsModel.__tablename__,
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete",
         passive_deletes=True,
         post_update=True,
@@ -112,7 +112,7 @@ class RoleModel(ModelBase):
     creator = relationship(
         "UserModel", 
         foreign_keys=creator_id, 
-        lazy="joined",
+        lazy="selectin",
         post_update=True,
         uselist=False
     )
@@ -92,12 +92,12 @@ class UserModel(ModelBase):
     roles = relationship(
         "RoleModel", 
         secondary=UserRolesModel.__tablename__, 
-        lazy="joined", 
+        lazy="selectin", 
         uselist=True)
     positions = relationship(
         "PositionModel", 
         secondary=UserPositionsModel.__tablename__, 
-        lazy="joined", 
+        lazy="selectin", 
         uselist=True)
     
     # 审计字段
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List
+from typing import List, Optional
 
 
 class CpuInfoSchema(BaseModel):
@@ -68,6 +68,19 @@ class DiskInfoSchema(BaseModel):
     usage: float = Field(ge=0, le=100, description="使用率(%)")
 
 
+class PwdPoolInfoSchema(BaseModel):
+    """密码计算线程池信息模型"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    workers: int = Field(description="线程数")
+    running: int = Field(description="正在计算数")
+    waiting: int = Field(description="排队等待数")
+    max_waiting: int = Field(description="历史最大排队数")
+    rejected: int = Field(description="排队已满拒绝数")
+    total: int = Field(description="累计完成数")
+
+
 class ServerMonitorSchema(BaseModel):
     """服务器监控信息模型"""
 
@@ -78,3 +91,4 @@ class ServerMonitorSchema(BaseModel):
     py: PyInfoSchema = Field(description="Python运行信息")
     sys: SysInfoSchema = Field(description="系统信息")
     disks: List[DiskInfoSchema] = Field(default_factory=list, description="磁盘信息")
+    pwd: Optional[PwdPoolInfoSchema] = Field(default=None, description="密码计算线程池信息")
@@ -15,6 +15,7 @@ class AuthSchema(BaseModel):
 
     user: Optional[UserOutSchema] = Field(default=None, description='用户信息')
     check_data_scope: bool = Field(default=True, description='是否检查数据权限')
+    permission_version: Optional[str] = Field(default=None, description='当前请求读取的全局权限版本号')
     db: AsyncSession | Session = Field(default=None, description='数据库会话')
 
 
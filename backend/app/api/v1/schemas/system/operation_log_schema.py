@@ -25,3 +25,18 @@ class OperationLogCreateSchema(BaseModel):
 class OperationLogOutSchema(OperationLogCreateSchema, BaseSchema):
     """日志响应模型"""
     model_config = ConfigDict(from_attributes=True)
+
+
+class OperationLogListOutSchema(BaseSchema):
+    """日志列表响应模型,不包含请求体和响应体"""
+    model_config = ConfigDict(from_attributes=True)
+
+    request_path: Optional[str] = Field(default=None, description="请求路径")
+    request_method: Optional[str] = Field(default=None, description="请求方法")
+    request_ip: Optional[str] = Field(default=None, description="请求 IP 地址")
+    login_location: Optional[str] = Field(default=None, description="登录位置")
+    request_os: Optional[str] = Field(default=None, description="请求操作系统")
+    request_browser: Optional[str] = Field(default=None, description="请求浏览器")
+    response_code: Optional[int] = Field(default=None, description="响应状态码")
+    process_time: Optional[float] = Field(default=None, description="处理时间")
+    description: Optional[str] = Field(default=None, max_length=255, description="备注")
@@ -59,7 +59,7 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 缓存键名列表信息
         """
-        cache_keys = await RedisCURD(redis).get_keys(f'{cache_name}*')
+        cache_keys = await RedisCURD(redis).get_keys(f'{cache_name}:*')
         cache_key_list = [key.split(':', 1)[1] for key in cache_keys if key.startswith(f'{cache_name}:')]
 
         return cache_key_list
@@ -87,11 +87,7 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 操作缓存响应信息
         """
-        cache_keys = await RedisCURD(redis).get_keys(f'{cache_name}*')
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-
-        return True
+        return await RedisCURD(redis).clear(f'{cache_name}*')
 
     @classmethod
     async def clear_cache_monitor_cache_key_service(cls, redis: Redis, cache_key: str)->bool:
@@ -102,11 +98,7 @@ class CacheService:
         :param cache_key: 缓存键名
         :return: 操作缓存响应信息
         """
-        cache_keys = await RedisCURD(redis).get_keys(f'*{cache_key}')
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-
-        return True
+        return await RedisCURD(redis).clear(f'*{cache_key}')
 
     @classmethod
     async def clear_cache_monitor_all_service(cls, redis: Redis)->bool:
@@ -116,8 +108,4 @@ class CacheService:
         :param redis: Redis对象
         :return: 操作缓存响应信息
         """
-        cache_keys = await RedisCURD(redis).get_keys
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-
-        return True
+        return await RedisCURD(redis).clear()
@@ -5,6 +5,7 @@ from typing import Dict, List
 from aioredis import Redis
 
 from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
 from app.core.exceptions import CustomException
 from app.api.v1.params.monitor.online_param import OnlineQueryParams
 from app.api.v1.schemas.monitor.online_schema import OnlineOutSchema
@@ -16,16 +17,17 @@ class OnlineService:
     @classmethod
     async def get_online_list_service(cls, redis: Redis, search: OnlineQueryParams) -> List[Dict]:
         """获取在线用户列表信息"""
-        # 获取所有在线用户信息
-        token_keys = await RedisCURD(redis).get_keys(f'{RedisInitKeyConfig.ONLINE_USER.key}*')
-        if not token_keys:
-            return []
-            
-        # 批量获取在线用户信息
-        online_values = await RedisCURD(redis).mget(*token_keys)
+        # SCAN获取所有在线用户键名,再分批MGET
+        token_keys = await RedisCURD(redis).get_keys(f'{RedisInitKeyConfig.ONLINE_USER.key}:*')
+        online_values = []
+        for i in range(0, len(token_keys), settings.REDIS_SCAN_COUNT):
+            online_values.extend(await RedisCURD(redis).mget(*token_keys[i:i + settings.REDIS_SCAN_COUNT]))
         online_list = []
         
         for online_value in online_values:
+            # 扫描后过期的键值为None
+            if online_value is None:
+                continue
             # 将字符串解析为字典
             online_data = json.loads(online_value)
             online_info = OnlineOutSchema(
@@ -51,11 +53,12 @@ class OnlineService:
         if not username:
             raise CustomException(msg='传入username不能为空')
             
-        # 批量删除token
-
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ONLINE_USER.key}:{username}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}")
+        # 一次删除在线用户和token
+        await RedisCURD(redis).delete_many([
+            f"{RedisInitKeyConfig.ONLINE_USER.key}:{username}",
+            f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}",
+            f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}"
+        ])
         return True
     
     @staticmethod
@@ -69,7 +72,7 @@ class OnlineService:
                 
         if search.login_location:
             search_location = search.login_location[1].strip('%')
-            if search_location not in online_info['login_location']:
+            if search_location not in (online_info['login_location'] or ''):
                 return False
                 
         # ipaddr是精确匹配
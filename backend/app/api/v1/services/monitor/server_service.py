@@ -13,8 +13,10 @@ from app.api.v1.schemas.monitor.server_schema import (
     PyInfoSchema,
     ServerMonitorSchema,
     DiskInfoSchema,
-    SysInfoSchema
+    SysInfoSchema,
+    PwdPoolInfoSchema
 )
+from app.core.hash_bcrpy import PwdUtil
 from app.utils.common_util import bytes2human
 
 
@@ -29,7 +31,8 @@ class ServerService:
             mem=cls._get_memory_info().model_dump(),
             sys=cls._get_system_info().model_dump(),
             py=cls._get_python_info().model_dump(),
-            disks=cls._get_disk_info()
+            disks=cls._get_disk_info(),
+            pwd=PwdPoolInfoSchema(**PwdUtil.stats()).model_dump()
         ).model_dump()
 
     @classmethod
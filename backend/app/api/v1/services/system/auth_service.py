@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Union, NewType
-import json
+from typing import Dict, Optional, Union, NewType
 from fastapi import Request
 from aioredis import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,7 +14,7 @@ from app.core.exceptions import CustomException
 from app.api.v1.schemas.monitor.online_schema import OnlineOutSchema
 from app.api.v1.schemas.system.menu_schema import MenuOutSchema
 from app.utils.common_util import get_random_character
-from app.utils.captcha_util import CaptchaUtil
+from app.utils.captcha_util import CaptchaPool
 from app.api.v1.cruds.system.user_crud import UserCRUD
 from app.api.v1.cruds.system.menu_crud import MenuCRUD
 from app.api.v1.models.system.user_model import UserModel
@@ -35,6 +34,9 @@ from app.core.security import (
 )
 from app.utils.ip_local_util import IpLocalUtil
 from app.core.redis_crud import RedisCURD
+from app.core.database import session_connect
+from app.core.principal_cache import PrincipalCache
+from app.core.permission_cache import PermissionCache
 
 CaptchaKey = NewType('CaptchaKey', str)
 CaptchaBase64 = NewType('CaptchaBase64', str)
@@ -69,52 +71,84 @@ class LoginService:
 
         # 用户认证
         auth = AuthSchema(db=db)
-        user = await UserCRUD(auth).get_by_username_crud(username=login_form.username)
+        user = await UserCRUD(auth).get_login_user_crud(username=login_form.username)
 
         if not user:
             raise CustomException(msg="用户不存在")
 
-        if not PwdUtil.verify_password(plain_password=login_form.password, password_hash=user.password):
+        if not await PwdUtil.verify_password_async(plain_password=login_form.password, password_hash=user.password):
             logger.warning(f'用户 {login_form.username} 密码错误')
             raise CustomException(msg="密码错误")
 
         if not user.available:
             raise CustomException(msg="用户已被停用")
 
-        # 更新最后登录时间
-        user = await UserCRUD(auth).update_last_login_crud(id=user.id)
+        return user
+
+    @classmethod
+    def build_online_service(cls, request: Request, user: UserModel, token: JWTOutSchema) -> OnlineOutSchema:
+        """
+        构建在线用户信息(不含登录地点,由后台任务补全)
 
-        # 创建token
-        token = await cls.create_token_service(redis=redis, username=user.username)
+        Args:
+            request: 请求对象
+            user: 登录用户
+            token: 本次登录签发的令牌
+
+        Returns:
+            OnlineOutSchema: 在线用户信息
+        """
         user_agent = parse(request.headers.get("user-agent"))
-        login_location = await IpLocalUtil.get_ip_location(request.client.host)
-        # 缓存中构建在线用户信息
-        await RedisCURD(redis).set(
-            key=f"{RedisInitKeyConfig.ONLINE_USER.key}:{user.username}",
-            value=OnlineOutSchema(
-                session_id=token.access_token,
-                user_id=user.id,
-                name=user.name,
-                user_name=user.username,
-                ipaddr=request.client.host,
-                login_location=login_location,
-                os=user_agent.os.family,
-                browser = user_agent.browser.family,
-                login_time=user.last_login
-            ).model_dump_json(),
-            expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        return OnlineOutSchema(
+            session_id=token.access_token,
+            user_id=user.id,
+            name=user.name,
+            user_name=user.username,
+            ipaddr=request.client.host,
+            os=user_agent.os.family,
+            browser=user_agent.browser.family,
+            login_time=datetime.now()
         )
 
-        return user
+    @classmethod
+    async def record_login_service(cls, redis: Redis, online: OnlineOutSchema) -> None:
+        """
+        登录后台任务: 更新最后登录时间,解析登录地点并补全在线用户信息
+
+        在登录响应返回后执行,任一步骤失败只记录日志,不影响本次登录。
+        补全登录地点时比较并替换: 在线用户记录仍是本次登录写入的内容时才更新,
+        期间已退出登录、被强制下线或再次登录时不做修改,不会恢复已删除的记录。
+
+        Args:
+            redis: Redis连接
+            online: 在线用户信息(与 save_token_service 写入的内容一致)
+        """
+        try:
+            async with session_connect() as session:
+                async with session.begin():
+                    await UserCRUD(AuthSchema(db=session)).update_last_login_crud(id=online.user_id, last_login=online.login_time)
+        except Exception as e:
+            logger.error(f"更新用户 {online.user_name} 最后登录时间失败: {str(e)}")
+
+        saved = online.model_dump_json()
+        online.login_location = await IpLocalUtil.get_ip_location(online.ipaddr)
+        try:
+            await RedisCURD(redis).compare_and_set(
+                key=f"{RedisInitKeyConfig.ONLINE_USER.key}:{online.user_name}",
+                expected=saved,
+                value=online.model_dump_json(),
+                expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            )
+        except Exception as e:
+            logger.error(f"补全用户 {online.user_name} 登录地点失败: {str(e)}")
 
     @classmethod
-    async def create_token_service(cls, redis: Redis, username: str) -> JWTOutSchema:
+    def issue_token_service(cls, username: str) -> JWTOutSchema:
         """
-        创建访问令牌和刷新令牌
+        签发访问令牌和刷新令牌(不写入缓存)
 
         Args:
             username: 用户名
-            request: 请求对象
 
         Returns:
             JWTOutSchema: 包含访问令牌和刷新令牌的响应对象
@@ -134,23 +168,6 @@ class LoginService:
             exp=now + refresh_expires,
         ))
 
-        # 清除该用户之前的token
-        await RedisCURD(redis).delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}')
-        await RedisCURD(redis).delete(f'{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}')
-
-        # 设置新的token
-        await RedisCURD(redis).set(
-            key=f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}',
-            value=access_token,
-            expire=int(access_expires.total_seconds())
-        )
-
-        await RedisCURD(redis).set(
-            key=f'{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}',
-            value=refresh_token,
-            expire=int(refresh_expires.total_seconds())
-        )
-
         return JWTOutSchema(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -158,6 +175,46 @@ class LoginService:
             token_type=settings.TOKEN_TYPE
         )
 
+    @classmethod
+    async def save_token_service(cls, redis: Redis, username: str, token: JWTOutSchema, online: Optional[OnlineOutSchema] = None) -> None:
+        """
+        写入令牌缓存,登录时同时写入在线用户信息(登录地点待后台任务补全)
+
+        在一次MULTI/EXEC中执行,SET直接覆盖该用户之前的记录;在登录响应返回前调用,
+        保证之后的退出登录、强制下线一定能删除在线用户记录。
+
+        Args:
+            redis: Redis连接
+            username: 用户名
+            token: 本次签发的令牌
+            online: 在线用户信息,刷新令牌时不传
+        """
+        access_expire = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        try:
+            async with RedisCURD(redis).pipeline() as pipe:
+                pipe.set(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}', token.access_token, ex=access_expire)
+                pipe.set(f'{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}', token.refresh_token, ex=settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60)
+                if online is not None:
+                    pipe.set(f'{RedisInitKeyConfig.ONLINE_USER.key}:{username}', online.model_dump_json(), ex=access_expire)
+        except Exception as e:
+            logger.error(f"写入用户 {username} 令牌缓存失败: {str(e)}")
+
+    @classmethod
+    async def create_token_service(cls, redis: Redis, username: str) -> JWTOutSchema:
+        """
+        创建访问令牌和刷新令牌并写入缓存
+
+        Args:
+            redis: Redis连接
+            username: 用户名
+
+        Returns:
+            JWTOutSchema: 包含访问令牌和刷新令牌的响应对象
+        """
+        token = cls.issue_token_service(username=username)
+        await cls.save_token_service(redis=redis, username=username, token=token)
+        return token
+
     @classmethod
     async def refresh_token_service(cls, redis: Redis, refresh_token: RefreshTokenPayloadSchema) -> JWTOutSchema:
         """
@@ -193,10 +250,12 @@ class LoginService:
         payload: JWTPayloadSchema = decode_access_token(token.token)
         username: str = payload.sub
 
-        # 删除Redis中的在线用户、访问令牌、刷新令牌
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ONLINE_USER.key}:{username}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}")
+        # 一次删除Redis中的在线用户、访问令牌、刷新令牌
+        await RedisCURD(redis).delete_many([
+            f"{RedisInitKeyConfig.ONLINE_USER.key}:{username}",
+            f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{username}",
+            f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{username}"
+        ])
 
         logger.info(f"用户退出登录成功,会话账号:{username}")
         return True
@@ -221,26 +280,18 @@ class LoginService:
             # 创建认证对象
             auth = AuthSchema(db=db)
 
+            # 先读取全局权限版本号再查询用户,快照按该版本号标记;
+            # 查询期间若有权限变更,版本号随之递增,该快照读取时即被视为过期
+            permission_version = await PrincipalCache.get_version()
+
             # 获取用户信息
-            user = await UserCRUD(auth).get_by_username_crud(username=username)
+            user = await UserCRUD(auth).get_by_username_crud(username=username, profile="auth")
             if not user:
                 raise CustomException(msg="用户不存在")
             if not user.available:
                 raise CustomException(msg="用户已被停用")
 
-            # 过滤可用的角色和职位
-            if hasattr(user, 'roles'):
-                user.roles = [role for role in user.roles if role.available]
-
-            # 获取用户权限集合
-            user_permissions = {
-                menu.permission
-                for role in user.roles
-                for menu in role.menus
-                if menu.permission and menu.available
-            }
-
-            # 获取菜单权限
+            # 获取菜单权限(仅统计可用的角色)
             if user.is_superuser:
                 menu_all = await MenuCRUD(auth).get_list_crud(search={'type': ('in', [1, 2]), 'available': True})
                 menus = [MenuOutSchema.model_validate(menu).model_dump() for menu in menu_all]
@@ -248,25 +299,18 @@ class LoginService:
                 menus = [
                     MenuOutSchema.model_validate(menu).model_dump()
                     for role in user.roles
+                    if role.available
                     for menu in role.menus
                     if menu.available and menu.type in [1, 2]
                 ]
 
-            # 构建用户权限信息
-            user_permission_info = {
-                "permissions": list(user_permissions),
-                "menus": menus,
-                "roles": [role.name for role in user.roles if role.available],
-                "is_superuser": user.is_superuser
-            }
-
-            # 保存到Redis
-            redis_key = f"user_permissions:{username}"
-            await RedisCURD(redis).set(
-                key=redis_key,
-                value=json.dumps(user_permission_info, ensure_ascii=False),
-                expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            # 构建用户权限快照并保存到Redis
+            user_permission_info = PermissionCache.build(
+                user=user,
+                menus=menus,
+                permission_version=permission_version
             )
+            await PermissionCache.save(redis=redis, username=username, info=user_permission_info)
 
             logger.info(f"刷新用户 {username} 权限成功")
             return True
@@ -295,8 +339,8 @@ class CaptchaService:
         if not settings.CAPTCHA_ENABLE:
             raise CustomException(msg="未开启验证码服务")
 
-        # 生成验证码图片和值
-        captcha_base64, captcha_value = CaptchaUtil.captcha_arithmetic()
+        # 从预生成验证码池取出验证码图片和值
+        captcha_base64, captcha_value = await CaptchaPool.get()
         captcha_key = get_random_character()
 
         # 保存到Redis并设置过期时间
@@ -334,10 +378,15 @@ class CaptchaService:
         if not captcha:
             raise CustomException(msg="验证码不能为空")
 
-        # 获取Redis中存储的验证码
+        # 原子读取并删除Redis中存储的验证码,无论校验结果如何都只能使用一次,
+        # 并发请求中只有一个能取到验证码
         redis_key = f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{key}'
 
-        captcha_value = await RedisCURD(redis).get(redis_key)
+        try:
+            captcha_value = await RedisCURD(redis).getdel(redis_key)
+        except Exception as e:
+            logger.error(f"读取验证码失败: {str(e)}")
+            raise CustomException(msg="验证码校验失败")
         if not captcha_value:
             logger.warning('验证码已过期或不存在')
             raise CustomException(msg="验证码已过期")
@@ -347,7 +396,5 @@ class CaptchaService:
             logger.warning(f'验证码错误,用户输入:{captcha},正确值:{captcha_value}')
             raise CustomException(msg="验证码错误")
 
-        # 验证成功后删除验证码,避免重复使用
-        await RedisCURD(redis).delete(redis_key)
         logger.info(f'验证码校验成功,key:{key}')
         return True
@@ -11,12 +11,8 @@ from app.api.v1.schemas.system.dept_schema import (
 )
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
-from app.utils.common_util import (
-    get_parent_id_map,
-    get_parent_recursion,
-    get_child_id_map,
-    get_child_recursion
-)
+from app.core.principal_cache import PrincipalCache
+from app.common.request import PaginationService
 from app.api.v1.params.system.dept_param import DeptQueryParams
 
 
@@ -54,6 +50,26 @@ class DeptService:
         dept_list = await DeptCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
         return [DeptOutSchema.model_validate(dept).model_dump() for dept in dept_list]
 
+    @classmethod
+    async def get_dept_page_service(cls, auth: AuthSchema, search: DeptQueryParams, page_no: int = None, page_size: int = None, order_by: List[Dict] = None) -> Dict:
+        """
+        分页获取部门列表service(数据库分页)
+        
+        :param auth: 认证对象
+        :param search: 查询参数对象
+        :param page_no: 当前页码
+        :param page_size: 每页数量
+        :param order_by: 排序参数
+        :return: 分页结果
+        """
+        if order_by:
+            order_by = eval(order_by)
+        else:
+            order_by = [{"order": "asc"}]
+        dept_list, total = await DeptCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [DeptOutSchema.model_validate(dept).model_dump() for dept in dept_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+
     @classmethod
     async def create_dept_service(cls, auth: AuthSchema, data: DeptCreateSchema) -> Dict:
         """
@@ -67,6 +83,7 @@ class DeptService:
         if dept:
             raise CustomException(msg='创建失败，该部门已存在')
         dept = await DeptCRUD(auth).create(data=data)
+        await PrincipalCache.invalidate(db=auth.db)
         return DeptOutSchema.model_validate(dept).model_dump()
 
     @classmethod
@@ -103,6 +120,7 @@ class DeptService:
         if not dept:
             raise CustomException(msg='删除失败，该部门不存在')
         await DeptCRUD(auth).delete(ids=[id])
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
     async def batch_set_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
@@ -112,18 +130,6 @@ class DeptService:
         :param auth: 认证对象
         :param data: 批量设置可用状态对象
         """
-        dept_list = await DeptCRUD(auth).get_list_crud()
-        total_ids = []
-        
-        if data.available:
-            id_map = get_parent_id_map(model_list=dept_list)
-            for dept_id in data.ids:
-                enable_ids = get_parent_recursion(id=dept_id, id_map=id_map)
-                total_ids.extend(enable_ids)
-        else:
-            id_map = get_child_id_map(model_list=dept_list)
-            for dept_id in data.ids:
-                disable_ids = get_child_recursion(id=dept_id, id_map=id_map)
-                total_ids.extend(disable_ids)
-
-        await DeptCRUD(auth).set_available_crud(ids=total_ids, available=data.available)
+        # 启用时同时启用所有上级部门,禁用时同时禁用所有下级部门
+        await DeptCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
+        await PrincipalCache.invalidate(db=auth.db)
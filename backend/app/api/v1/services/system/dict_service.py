@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.schemas.system.dict_schema import DictDataCreateSchema,DictDataOutSchema,DictDataUpdateSchema,DictTypeCreateSchema,DictTypeOutSchema,DictTypeUpdateSchema
 from app.common.enums import RedisInitKeyConfig
+from app.common.request import PaginationService
 from app.api.v1.params.system.dict_param import DictDataQueryParams, DictTypeQueryParams
 from app.api.v1.cruds.system.dict_crud import DictDataCRUD, DictTypeCRUD
 from app.core.redis_crud import RedisCURD
@@ -35,6 +36,14 @@ class DictTypeService:
         obj_list = await DictTypeCRUD(auth).get_obj_list_crud()
         return [DictTypeOutSchema.model_validate(obj).model_dump() for obj in obj_list]
     
+    @classmethod
+    async def get_obj_page_service(cls, auth: AuthSchema, search: DictTypeQueryParams = None, page_no: int = None, page_size: int = None, order_by: List[Dict[str, str]] = None) -> Dict:
+        if order_by:
+            order_by = eval(order_by)
+        obj_list, total = await DictTypeCRUD(auth).get_obj_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__ if search else None, order_by=order_by)
+        items = [DictTypeOutSchema.model_validate(obj).model_dump() for obj in obj_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+    
     @classmethod
     async def create_obj_service(cls, auth: AuthSchema, redis: Redis, data: DictTypeCreateSchema) -> Dict:
         exist_obj = await DictTypeCRUD(auth).get(dict_name=data.dict_name)
@@ -135,7 +144,7 @@ class DictTypeService:
             raise CustomException(msg=f"删除字典类型失败 {e}")
 
     @classmethod
-    async def export_obj_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
+    def export_obj_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
         """导出公告列表"""
         mapping_dict = {
             'id': '编号',
@@ -175,6 +184,14 @@ class DictDataService:
         obj_list = await DictDataCRUD(auth).get_obj_list_crud(search=search.__dict__, order_by=order_by)
         return [DictDataOutSchema.model_validate(obj).model_dump() for obj in obj_list]
 
+    @classmethod
+    async def get_obj_page_service(cls, auth: AuthSchema, search: DictDataQueryParams = None, page_no: int = None, page_size: int = None, order_by: List[Dict[str, str]] = None) -> Dict:
+        if order_by:
+            order_by = eval(order_by)
+        obj_list, total = await DictDataCRUD(auth).get_obj_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [DictDataOutSchema.model_validate(obj).model_dump() for obj in obj_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+
     @classmethod
     async def init_dict_service(cls, redis: Redis, db: AsyncSession):
         """应用初始化: 获取所有字典类型对应的字典数据信息并缓存service"""
@@ -184,28 +201,25 @@ class DictDataService:
         if not obj_list:
             logger.warning("未找到任何字典类型数据")
             return
+
+        # 一次查询全部字典数据,按字典类型分组
+        dict_data_map: Dict[str, List[Dict]] = {}
+        for row in await DictDataCRUD(auth).get_obj_list_crud():
+            dict_data_map.setdefault(row.dict_type, []).append(DictDataOutSchema.model_validate(row).model_dump())
+
+        mapping = {}
         for obj in obj_list:
             dict_type = obj.dict_type
-            dict_data_list = await DictDataCRUD(auth).get_obj_list_crud(search={'dict_type': dict_type})
-            
-            if not dict_data_list:
+            dict_data = dict_data_map.get(dict_type)
+            if not dict_data:
                 logger.warning(f"字典类型 {dict_type} 未找到对应的字典数据")
                 continue
-            
-            dict_data = [DictDataOutSchema.model_validate(row).model_dump() for row in dict_data_list if row]
+            mapping[f"{RedisInitKeyConfig.System_Dict.key}:{dict_type}"] = json.dumps(dict_data, ensure_ascii=False)
+
+        # 一次管道往返写入全部字典缓存并设置过期时间
+        if not await RedisCURD(redis).set_many(mapping=mapping, expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60):
+            logger.error("初始化字典数据写入缓存失败")
     
-            # 保存到Redis并设置过期时间
-            redis_key = f"{RedisInitKeyConfig.System_Dict.key}:{dict_type}"
-            try:
-                value = json.dumps(dict_data, ensure_ascii=False)
-                await RedisCURD(redis).set(
-                        key=redis_key,
-                        value=value,
-                        expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-                    )
-            except Exception as e:
-                logger.error(f"初始化字典数据失败: {e}")
-                raise CustomException(msg=f"初始化字典数据成功 {e}")
     
     @classmethod
     async def get_init_dict_service(cls, redis: Redis) -> Dict:
@@ -325,7 +339,7 @@ class DictDataService:
             raise CustomException(msg=f"删除字典数据失败 {e}")
 
     @classmethod
-    async def export_obj_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
+    def export_obj_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
         """导出公告列表"""
         mapping_dict = {
             'id': '编号',
@@ -5,6 +5,7 @@ from typing import Any, List, Dict
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.core.ap_scheduler import SchedulerUtil
 from app.core.exceptions import CustomException
+from app.common.request import PaginationService
 from app.utils.cron_util import CronUtil
 from app.utils.excel_util import ExcelUtil
 from app.api.v1.schemas.system.job_schema import JobCreateSchema, JobUpdateSchema, JobOutSchema
@@ -29,6 +30,14 @@ class JobService:
         obj_list = await JobCRUD(auth).get_obj_list_crud(search=search.__dict__, order_by=order_by)
         return [JobOutSchema.model_validate(obj).model_dump() for obj in obj_list]
     
+    @classmethod
+    async def get_job_page_service(cls, auth: AuthSchema, search: JobQueryParams = None, page_no: int = None, page_size: int = None, order_by: List[Dict[str, str]] = None) -> Dict:
+        if order_by:
+            order_by = eval(order_by)
+        obj_list, total = await JobCRUD(auth).get_obj_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [JobOutSchema.model_validate(obj).model_dump() for obj in obj_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+    
     @classmethod
     async def create_job_service(cls, auth: AuthSchema, data: JobCreateSchema) -> Dict:
         exist_obj = await JobCRUD(auth).get(name=data.name)
@@ -82,7 +91,7 @@ class JobService:
             await JobCRUD(auth).set_obj_field_crud(ids=[id], status=False)
 
     @classmethod
-    async def export_job_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
+    def export_job_service(cls, data_list: List[Dict[str, Any]]) -> bytes:
         """导出公告列表"""
         mapping_dict = {
             'id': '编号',
@@ -14,12 +14,7 @@ from app.api.v1.schemas.system.menu_schema import (
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
 from app.core.logger import logger
-from app.utils.common_util import (
-    get_parent_id_map,
-    get_parent_recursion,
-    get_child_id_map,
-    get_child_recursion
-)
+from app.core.principal_cache import PrincipalCache
 from app.api.v1.params.system.menu_param import MenuQueryParams
 from app.api.v1.services.system.auth_service import LoginService
 
@@ -127,26 +122,13 @@ class MenuService:
         if not menu:
             raise CustomException(msg='删除失败，该菜单不存在')
         await MenuCRUD(auth).delete(ids=[id])
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
     async def set_menu_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
         """
-        递归获取所有父、子级菜单，然后批量修改菜单可用状态
+        按层级路径批量修改菜单及其父、子级菜单可用状态
         """
-        menu_list = await MenuCRUD(auth).get_list_crud()
-        total_ids = []
-
-        if data.available:
-            # 激活，则需要把所有父级菜单都激活
-            id_map = get_parent_id_map(model_list=menu_list)
-            for menu_id in data.ids:
-                enable_ids = get_parent_recursion(id=menu_id, id_map=id_map)
-                total_ids.extend(enable_ids)
-        else:
-            # 禁止，则需要把所有子级菜单都禁止
-            id_map = get_child_id_map(model_list=menu_list)
-            for menu_id in data.ids:
-                disable_ids = get_child_recursion(id=menu_id, id_map=id_map)
-                total_ids.extend(disable_ids)
-
-        await MenuCRUD(auth).set_available_crud(ids=total_ids, available=data.available)
+        # 激活则同时激活所有父级菜单,禁止则同时禁止所有子级菜单
+        await MenuCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
+        await PrincipalCache.invalidate(db=auth.db)
@@ -8,6 +8,7 @@ from app.core.base_schema import BatchSetAvailable
 from app.api.v1.params.system.notice_param import NoticeQueryParams
 from app.api.v1.cruds.system.notice_crud import NoticeCRUD
 from app.core.exceptions import CustomException
+from app.common.request import PaginationService
 from app.utils.excel_util import ExcelUtil
 
 
@@ -28,6 +29,14 @@ class NoticeService:
         config_obj_list = await NoticeCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
         return [NoticeOutSchema.model_validate(config_obj).model_dump() for config_obj in config_obj_list]
     
+    @classmethod
+    async def get_notice_page_service(cls, auth: AuthSchema, search: NoticeQueryParams = None, page_no: int = None, page_size: int = None, order_by: List[Dict[str, str]] = None) -> Dict:
+        if order_by:
+            order_by = eval(order_by)
+        obj_list, total = await NoticeCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [NoticeOutSchema.model_validate(obj).model_dump() for obj in obj_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+    
     @classmethod
     async def create_notice_service(cls, auth: AuthSchema, data: NoticeCreateSchema) -> Dict:
         config = await NoticeCRUD(auth).get(notice_title=data.notice_title)
@@ -59,7 +68,7 @@ class NoticeService:
         await NoticeCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
     
     @classmethod
-    async def export_notice_service(cls, notice_list: List[Dict[str, Any]]) -> bytes:
+    def export_notice_service(cls, notice_list: List[Dict[str, Any]]) -> bytes:
         """导出公告列表"""
         mapping_dict = {
             'id': '编号',
@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 
 from app.api.v1.cruds.system.operation_log_crud import OperationLogCRUD
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.schemas.system.operation_log_schema import (
     OperationLogCreateSchema,
-    OperationLogOutSchema
+    OperationLogOutSchema,
+    OperationLogListOutSchema
 )
 from app.utils.excel_util import ExcelUtil
+from app.core.database import session_connect
+from app.common.request import PaginationService
 from app.api.v1.params.system.operation_log_param import OperationLogQueryParams
 
 
@@ -18,6 +22,26 @@ class OperationLogService:
     日志模块服务层
     """
 
+    # 操作日志导出字段映射
+    EXPORT_MAPPING: Dict[str, str] = {
+        'id': '编号',
+        'request_path': '请求URL',
+        'request_method': '请求方式',
+        'request_payload': '请求参数',
+        'request_ip': '操作地址',
+        'login_location': '登录位置',
+        'request_os': '操作系统',
+        'request_browser': '浏览器',
+        'response_json': '返回参数',
+        'response_code': '相应状态',
+        'process_time': '处理时间',
+        'description': '备注',
+        'created_at': '创建时间',
+        'updated_at': '更新时间',
+        'creator_id': '创建者ID',
+        'creator': '创建者',
+    }
+
     @classmethod
     async def get_log_detail_service(cls, auth: AuthSchema, id: int) -> Dict:
         """获取日志详情"""
@@ -36,6 +60,29 @@ class OperationLogService:
         log_dict_list = [OperationLogOutSchema.model_validate(log).model_dump() for log in log_list]
         return log_dict_list
 
+    @classmethod
+    async def get_log_page_service(cls, auth: AuthSchema, search: OperationLogQueryParams, page_no: int = None, page_size: int = None, order_by: List[Dict] = None) -> Dict:
+        """分页获取日志列表(数据库分页)"""
+        if order_by:
+            order_by = eval(order_by)
+        else:
+            order_by = [{"created_at": "desc"}]
+        log_list, total = await OperationLogCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by, profile="list")
+        items = [OperationLogListOutSchema.model_validate(log).model_dump() for log in log_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+
+    @classmethod
+    async def get_log_cursor_page_service(cls, auth: AuthSchema, search: OperationLogQueryParams, page_size: int, cursor: Optional[str] = None) -> Dict:
+        """游标分页获取日志列表(按创建时间倒序,耗时与翻页深度无关)"""
+        log_list, next_cursor = await OperationLogCRUD(auth).get_cursor_page_crud(
+            page_size=page_size,
+            cursor=PaginationService.decode_cursor(cursor),
+            search=search.__dict__,
+            profile="list"
+        )
+        items = [OperationLogListOutSchema.model_validate(log).model_dump() for log in log_list]
+        return await PaginationService.get_cursor_result(items=items, page_size=page_size, next_cursor=PaginationService.encode_cursor(next_cursor))
+
     @classmethod
     async def create_log_service(cls, auth: AuthSchema, data: OperationLogCreateSchema) -> Dict:
         """创建日志"""
@@ -43,46 +90,71 @@ class OperationLogService:
         new_log_dict = OperationLogOutSchema.model_validate(new_log).model_dump()
         return new_log_dict
     
+    @classmethod
+    async def create_log_batch_service(cls, auth: AuthSchema, data_list: List[Dict]) -> None:
+        """批量创建日志"""
+        await OperationLogCRUD(auth).create_batch_crud(data_list=data_list)
+
+    @classmethod
+    async def purge_log_batch_service(cls, auth: AuthSchema, before: datetime, batch_size: int) -> List[Dict]:
+        """
+        删除一批过期日志
+        
+        :param auth: 认证对象
+        :param before: 过期时间点
+        :param batch_size: 单批条数
+        :return: 已删除的日志字典列表,供调用方归档
+        """
+        log_list = await OperationLogCRUD(auth).get_expired_batch_crud(before=before, limit=batch_size)
+        if log_list:
+            await OperationLogCRUD(auth).delete(ids=[log["id"] for log in log_list])
+        return log_list
+
     @classmethod
     async def delete_log_service(cls, auth: AuthSchema, id: int) -> None:
         """删除日志"""
         await OperationLogCRUD(auth).delete(ids=[id])
 
     @classmethod
-    async def export_log_list_service(cls, operation_log_list: List[Dict[str, Any]]) -> bytes:
+    def export_log_stream_service(
+            cls,
+            auth: AuthSchema,
+            search: OperationLogQueryParams,
+            file_format: str = 'xlsx',
+            chunk_size: int = 1000,
+            progress: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> AsyncIterator[bytes]:
         """
-        导出日志信息
+        流式导出日志信息
+
+        请求依赖的数据库会话在响应开始输出前已关闭,因此在独立的会话中以服务端游标分块读取,
+        每块转换后立即交给导出器,内存占用与日志总数无关。
 
         Args:
-            operation_log_list: 操作日志信息列表
+            auth: 认证对象
+            search: 查询参数
+            file_format: 导出格式(xlsx/csv/tsv)
+            chunk_size: 每块条数
+            progress: 进度回调,每块读取后传入该块条数(后台导出任务使用)
         
         Returns:
-            bytes: 操作日志信息excel的二进制数据
+            AsyncIterator[bytes]: 导出文件数据块的异步迭代器
         """
-        # 操作日志字段映射
-        mapping_dict = {
-            'id': '编号',
-            'request_path': '请求URL',
-            'request_method': '请求方式',
-            'request_payload': '请求参数',
-            'request_ip': '操作地址',
-            'login_location': '登录位置',
-            'request_os': '操作系统',
-            'request_browser': '浏览器',
-            'response_json': '返回参数',
-            'response_code': '相应状态',
-            'process_time': '处理时间',
-            'description': '备注',
-            'created_at': '创建时间',
-            'updated_at': '更新时间',
-            'creator_id': '创建者ID',
-            'creator': '创建者',
-        }
-
-        # 处理数据
-        data = operation_log_list.copy()
-        for item in data:
-            # 处理状态
-            item['response_code'] = '成功' if item.get('response_code') == 200 else '失败'
-
-        return ExcelUtil.export_list2excel(list_data=operation_log_list, mapping_dict=mapping_dict)
+        async def chunks() -> AsyncIterator[List[Dict]]:
+            async with session_connect() as session:
+                stream_auth = auth.model_copy(update={"db": session})
+                log_chunks = OperationLogCRUD(stream_auth).get_stream_crud(
+                    search=search.__dict__,
+                    order_by=[{'created_at': 'desc'}, {'id': 'desc'}],
+                    chunk_size=chunk_size
+                )
+                async for log_list in log_chunks:
+                    data = [OperationLogOutSchema.model_validate(log).model_dump() for log in log_list]
+                    for item in data:
+                        # 处理状态
+                        item['response_code'] = '成功' if item.get('response_code') == 200 else '失败'
+                    if progress:
+                        await progress(len(data))
+                    yield data
+
+        return ExcelUtil.stream_export(chunks=chunks(), mapping_dict=cls.EXPORT_MAPPING, file_format=file_format)
@@ -11,6 +11,7 @@ from app.api.v1.schemas.system.position_schema import (
 )
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.common.request import PaginationService
 from app.utils.excel_util import ExcelUtil
 from app.api.v1.params.system.position_param import PositionQueryParams
 
@@ -33,6 +34,17 @@ class PositionService:
         position_list = await PositionCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
         return [PositionOutSchema.model_validate(position).model_dump() for position in position_list]
 
+    @classmethod
+    async def get_position_page_service(cls, auth: AuthSchema, search: PositionQueryParams, page_no: int = None, page_size: int = None, order_by: List[Dict] = None) -> Dict:
+        """分页获取岗位列表(数据库分页)"""
+        if order_by:
+            order_by = eval(order_by)
+        else:
+            order_by = [{"order": "asc"}]
+        position_list, total = await PositionCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [PositionOutSchema.model_validate(position).model_dump() for position in position_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+
     @classmethod
     async def create_position_service(cls, auth: AuthSchema, data: PositionCreateSchema) -> Dict:
         """创建岗位"""
@@ -68,7 +80,7 @@ class PositionService:
         await PositionCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
 
     @classmethod
-    async def export_post_list_service(cls, post_list: List[Dict[str, Any]]) -> bytes:
+    def export_post_list_service(cls, post_list: List[Dict[str, Any]]) -> bytes:
         """导出岗位列表"""
         mapping_dict = {
             'id': '编号',
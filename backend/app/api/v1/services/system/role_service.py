@@ -5,7 +5,9 @@ from aioredis import Redis
 
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.common.request import PaginationService
 from app.core.logger import logger
+from app.core.principal_cache import PrincipalCache
 from app.api.v1.cruds.system.role_crud import RoleCRUD
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.schemas.system.role_schema import (
@@ -38,6 +40,17 @@ class RoleService:
         role_list = await RoleCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
         return [RoleOutSchema.model_validate(role).model_dump() for role in role_list]
 
+    @classmethod
+    async def get_role_page_service(cls, auth: AuthSchema, search: RoleQueryParams, page_no: int = None, page_size: int = None, order_by: List[Dict[str, str]] = None) -> Dict:
+        """分页获取角色列表(数据库分页)"""
+        if order_by:
+            order_by = eval(order_by)
+        else:
+            order_by = [{"order": "asc"}]
+        role_list, total = await RoleCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by)
+        items = [RoleOutSchema.model_validate(role).model_dump() for role in role_list]
+        return await PaginationService.get_page_result(items=items, total=total, page_no=page_no, page_size=page_size)
+
     @classmethod
     async def create_role_service(cls, auth: AuthSchema, data: RoleCreateSchema) -> Dict:
         """创建角色"""
@@ -57,6 +70,7 @@ class RoleService:
         if exist_role and exist_role.id != data.id:
             raise CustomException(msg='更新失败，角色名称重复')
         updated_role = await RoleCRUD(auth).update(id=data.id, data=data)
+        await PrincipalCache.invalidate(db=auth.db)
         return RoleOutSchema.model_validate(updated_role).model_dump()
 
     @classmethod
@@ -66,6 +80,7 @@ class RoleService:
         if not role:
             raise CustomException(msg='删除失败，该角色不存在')
         await RoleCRUD(auth).delete(ids=[id])
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
     async def set_role_permission_service(cls, auth: AuthSchema, data: RolePermissionSettingSchema, redis: Redis = None) -> None:
@@ -82,6 +97,8 @@ class RoleService:
         else:
             await RoleCRUD(auth).set_role_depts_crud(role_ids=data.role_ids, dept_ids=[])
 
+        await PrincipalCache.invalidate(db=auth.db)
+
         # 如果提供了Redis连接，刷新受影响角色的所有用户权限
         if redis:
             try:
@@ -105,9 +122,10 @@ class RoleService:
     async def set_role_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
         """设置角色可用状态"""
         await RoleCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
-    async def export_role_list_service(cls, role_list: List[Dict[str, Any]]) -> bytes:
+    def export_role_list_service(cls, role_list: List[Dict[str, Any]]) -> bytes:
         """导出角色列表"""
         # 字段映射配置
         mapping_dict = {
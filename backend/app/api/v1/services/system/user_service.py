@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import io
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
 from fastapi import UploadFile
 import pandas as pd
 
 from app.core.exceptions import CustomException
+from app.common.request import PaginationService
 from app.core.hash_bcrpy import PwdUtil
+from app.core.principal_cache import PrincipalCache
 from app.api.v1.cruds.system.position_crud import PositionCRUD
 from app.api.v1.cruds.system.role_crud import RoleCRUD
 from app.core.base_schema import BatchSetAvailable, UploadResponseSchema
@@ -15,6 +17,7 @@ from app.utils.upload_util import UploadUtil
 from app.api.v1.cruds.system.user_crud import UserCRUD
 from app.api.v1.cruds.system.menu_crud import MenuCRUD
 from app.api.v1.cruds.system.dept_crud import DeptCRUD
+from app.api.v1.models.system.user_model import UserModel
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.schemas.system.menu_schema import MenuOutSchema
 from app.api.v1.schemas.system.user_schema import (
@@ -32,38 +35,48 @@ from app.core.logger import logger
 class UserService:
     """用户模块服务层"""
 
+    IMPORT_CHUNK_SIZE: int = 500    # 批量导入单次写入/查询条数
+
+    @classmethod
+    async def _set_dept_name(cls, auth: AuthSchema, user_list: Sequence[UserModel]) -> None:
+        """
+        批量填充用户部门名称,整批用户只查询一次部门表
+        
+        部门对象加载后进入会话标识映射,序列化时访问 user.dept 直接命中,不再逐个懒加载
+        """
+        dept_map = await DeptCRUD(auth).get_map_crud(ids=[user.dept_id for user in user_list])
+        for user in user_list:
+            dept = dept_map.get(user.dept_id)
+            user.dept_name = dept.name if dept else None
+
     @classmethod
     async def get_detail_by_id_service(cls, auth: AuthSchema, id: int) -> Dict:
         """获取用户详情"""
-        user = await UserCRUD(auth).get_by_id_crud(id=id)
+        user = await UserCRUD(auth).get_by_id_crud(id=id, profile="detail")
         if not user:
             raise CustomException(msg="用户不存在")
         
-        # 如果用户绑定了部门,则获取部门名称
-        if user.dept_id:
-            dept = await DeptCRUD(auth).get_by_id_crud(id=user.dept_id)
-            user.dept_name = dept.name if dept else None
-        else:
-            user.dept_name = None
-            
+        await cls._set_dept_name(auth=auth, user_list=[user])
         return UserOutSchema.model_validate(user).model_dump()
 
     @classmethod
     async def get_user_list_service(cls, auth: AuthSchema, search: UserQueryParams, order_by: List[Dict]= None) -> List[Dict]:
         if order_by:
             order_by = eval(order_by)
-        user_list = await UserCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
-        user_dict_list = []
-        for user in user_list:
-            if user.dept_id:
-                dept = await DeptCRUD(auth).get_by_id_crud(id=user.dept_id)
-                user.dept_name = dept.name if dept else None
-            else:
-                user.dept_name = None
-            user_dict = UserOutSchema.model_validate(user).model_dump()
-            user_dict_list.append(user_dict)
+        user_list = await UserCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by, profile="export")
+        await cls._set_dept_name(auth=auth, user_list=user_list)
+        return [UserOutSchema.model_validate(user).model_dump() for user in user_list]
 
-        return user_dict_list
+    @classmethod
+    async def get_user_page_service(cls, auth: AuthSchema, search: UserQueryParams, page_no: int = None, page_size: int = None, order_by: List[Dict]= None) -> Dict:
+        """分页获取用户列表(数据库分页)"""
+        if order_by:
+            order_by = eval(order_by)
+        user_list, total = await UserCRUD(auth).get_page_crud(page_no=page_no, page_size=page_size, search=search.__dict__, order_by=order_by, profile="list")
+        await cls._set_dept_name(auth=auth, user_list=user_list)
+        user_dict_list = [UserOutSchema.model_validate(user).model_dump() for user in user_list]
+
+        return await PaginationService.get_page_result(items=user_dict_list, total=total, page_no=page_no, page_size=page_size)
 
     @classmethod
     async def create_user_service(cls, data: UserCreateSchema, auth: AuthSchema) -> Dict:
@@ -79,7 +92,7 @@ class UserService:
                 raise CustomException(msg='部门不存在')
 
         # 创建用户
-        data.password = PwdUtil.set_password_hash(password=data.password)
+        data.password = await PwdUtil.set_password_hash_async(password=data.password)
         user_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
         new_user = await UserCRUD(auth).create(data=user_dict)
 
@@ -114,7 +127,7 @@ class UserService:
 
         # 更新密码
         if data.password:
-            data.password = PwdUtil.set_password_hash(password=data.password)
+            data.password = await PwdUtil.set_password_hash_async(password=data.password)
 
         # 更新用户
         user_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
@@ -139,6 +152,7 @@ class UserService:
                 raise CustomException(msg='部分岗位已被禁用')
             await UserCRUD(auth).set_user_positions_crud(user_ids=[data.id], position_ids=data.position_ids)
 
+        await PrincipalCache.invalidate(db=auth.db)
         user_dict = UserOutSchema.model_validate(new_user).model_dump()
         return user_dict
 
@@ -162,16 +176,16 @@ class UserService:
         
         # 删除用户
         await UserCRUD(auth).delete(ids=[id])
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
     async def get_current_user_info_service(cls, auth: AuthSchema) -> Dict:
         """获取当前用户信息"""
         # 获取用户基本信息
-        user = await UserCRUD(auth).get_by_id_crud(id=auth.user.id)
+        user = await UserCRUD(auth).get_by_id_crud(id=auth.user.id, profile="detail")
         if not user:
             raise CustomException(msg="用户不存在")
-        dept = await DeptCRUD(auth).get_by_id_crud(id=user.dept_id)
-        user.dept_name = dept.name if dept else None
+        await cls._set_dept_name(auth=auth, user_list=[user])
         user_dict = UserOutSchema.model_validate(user).model_dump()
 
         # 获取菜单权限
@@ -195,6 +209,7 @@ class UserService:
         if not user:
             raise CustomException(msg="用户不存在")
         new_user = await UserCRUD(auth).update(id=auth.user.id, data=data)
+        await PrincipalCache.invalidate(db=auth.db)
         return UserOutSchema.model_validate(new_user).model_dump()
 
     @classmethod
@@ -207,6 +222,7 @@ class UserService:
             if user.is_superuser:
                 raise CustomException(msg="超级管理员状态不能修改")
         await UserCRUD(auth).set_available_crud(ids=data.ids, available=data.available)
+        await PrincipalCache.invalidate(db=auth.db)
 
     @classmethod
     async def upload_avatar_service(cls, base_url: str, file: UploadFile) -> Dict:
@@ -232,11 +248,11 @@ class UserService:
         user = await UserCRUD(auth).get_by_id_crud(id=auth.user.id)
         if not user:
             raise CustomException(msg="用户不存在")
-        if not PwdUtil.verify_password(plain_password=data.old_password, password_hash=user.password):
+        if not await PwdUtil.verify_password_async(plain_password=data.old_password, password_hash=user.password):
             raise CustomException(msg='原密码输入错误')
 
         # 更新密码
-        new_password_hash = PwdUtil.set_password_hash(password=data.new_password)
+        new_password_hash = await PwdUtil.set_password_hash_async(password=data.new_password)
         new_user = await UserCRUD(auth).change_password_crud(id=user.id, password_hash=new_password_hash)
         return UserOutSchema.model_validate(new_user).model_dump()
 
@@ -248,7 +264,7 @@ class UserService:
         if user:
             raise CustomException(msg='注册失败，用户名已存在')
 
-        data.password = PwdUtil.set_password_hash(password=data.password)
+        data.password = await PwdUtil.set_password_hash_async(password=data.password)
         dict_data = data.model_dump(exclude_unset=True)
         dict_data['creator_id'] = data.creator_id
         dict_data['dept_id'] = data.dept_id
@@ -268,7 +284,7 @@ class UserService:
             raise CustomException(msg="用户已停用")
         if user.mobile != data.mobile:
             raise CustomException(msg="手机号不匹配")
-        new_password_hash = PwdUtil.set_password_hash(password=data.new_password)
+        new_password_hash = await PwdUtil.set_password_hash_async(password=data.new_password)
         new_user = await UserCRUD(auth).forget_password_crud(id=user.id, password_hash=new_password_hash)
         return UserOutSchema.model_validate(new_user).model_dump()
 
@@ -287,9 +303,9 @@ class UserService:
         }
 
         try:
-            # 读取Excel文件
+            # 读取Excel文件,全部按文本读取,避免手机号等被解析为浮点数
             contents = await file.read()
-            df = pd.read_excel(io.BytesIO(contents))
+            df = pd.read_excel(io.BytesIO(contents), dtype=str)
             await file.close()
             
             if df.empty:
@@ -300,8 +316,9 @@ class UserService:
             if missing_headers:
                 raise CustomException(msg=f"导入文件缺少必要的列: {', '.join(missing_headers)}")
             
-            # 重命名列名
-            df.rename(columns=header_dict, inplace=True)
+            # 重命名列名,去除首尾空白,空字符串视为空值
+            df = df.rename(columns=header_dict)[list(header_dict.values())]
+            df = df.apply(lambda column: column.str.strip()).mask(lambda frame: frame == '')
             
             # 验证必填字段
             required_fields = ['username', 'name', 'dept_id']
@@ -310,67 +327,104 @@ class UserService:
                     missing_rows = df[df[field].isnull()].index.tolist()
                     raise CustomException(msg=f"{[k for k,v in header_dict.items() if v == field][0]}不能为空，第{[i+1 for i in missing_rows]}行")
             
-            error_msgs = []
-            success_count = 0
-            
-            # 处理每一行数据
-            for index, row in df.iterrows():
-                try:
-                    # 数据转换前的类型检查
-                    try:
-                        dept_id = int(row['dept_id'])
-                    except ValueError:
-                        error_msgs.append(f"第{index+1}行: 部门编号必须是数字")
-                        continue
-                    
-                    # 检查部门是否存在
-                    dept = await DeptCRUD(auth).get_by_id_crud(id=dept_id)
-                    if not dept:
-                        error_msgs.append(f"第{index+1}行: 部门ID {dept_id} 不存在")
-                        continue
-                    
-                    # 数据转换
-                    gender = 1 if row['gender'] == '男' else (2 if row['gender'] == '女' else 1)
-                    available = True if row['available'] == '正常' else False
-                    
-                    # 构建用户数据
-                    user_data = {
-                        "username": str(row['username']).strip(),
-                        "name": str(row['name']).strip(),
-                        "email": str(row['email']).strip() if not pd.isna(row['email']) else None,
-                        "mobile": str(row['mobile']).strip() if not pd.isna(row['mobile']) else None,
-                        "gender": gender,
-                        "available": available,
-                        "dept_id": dept_id,
-                        "password": PwdUtil.set_password_hash(password="123456")  # 设置默认密码
-                    }
-
-                    # 处理用户导入
-                    exists_user = await UserCRUD(auth).get_by_username_crud(username=user_data["username"])
-                    if exists_user:
-                        if update_support:
-                            await UserCRUD(auth).update(id=exists_user.id, data=user_data)
-                            success_count += 1
-                        else:
-                            error_msgs.append(f"第{index+1}行: 用户 {user_data['username']} 已存在")
-                    else:
-                        await UserCRUD(auth).create(data=user_data)
-                        success_count += 1
-                        
-                except Exception as e:
-                    error_msgs.append(f"第{index+1}行: {str(e)}")
-                    continue
+            # 按列整体校验,出错的行记录错误信息后剔除
+            errors: Dict[int, str] = {}
+
+            def reject(frame: pd.DataFrame, mask: pd.Series, msg: Callable[[pd.Series], str]) -> pd.DataFrame:
+                for index, row in frame[mask].iterrows():
+                    errors[index] = msg(row)
+                return frame[~mask]
+
+            dept_id = pd.to_numeric(df['dept_id'], errors='coerce')
+            df = reject(df, dept_id.isnull() | (dept_id % 1 != 0), lambda row: "部门编号必须是数字")
+            df = df.assign(dept_id=pd.to_numeric(df['dept_id']).astype(int))
+            df = reject(df, df['username'].duplicated(), lambda row: f"用户名 {row['username']} 在文件中重复")
+
+            # 批量预取存在的部门和已存在的用户名
+            exist_dept_ids = set()
+            exist_users: Dict[str, int] = {}
+            for i in range(0, len(df), cls.IMPORT_CHUNK_SIZE):
+                chunk = df.iloc[i:i + cls.IMPORT_CHUNK_SIZE]
+                exist_dept_ids |= await DeptCRUD(auth).get_exist_ids_crud(ids=chunk['dept_id'].tolist())
+                exist_users.update(await UserCRUD(auth).get_username_map_crud(usernames=chunk['username'].tolist()))
+
+            df = reject(df, ~df['dept_id'].isin(list(exist_dept_ids)), lambda row: f"部门ID {row['dept_id']} 不存在")
+            if not update_support:
+                df = reject(df, df['username'].isin(list(exist_users)), lambda row: f"用户 {row['username']} 已存在")
+
+            # 数据转换
+            df = df.assign(
+                gender=df['gender'].map({'男': '1', '女': '2', '未知': '3'}).fillna('1'),
+                available=df['available'] == '正常'
+            )
+            df = df.astype(object).where(df.notnull(), None)
+            # 默认密码逐行计算哈希,每个用户使用独立的盐
+            df = df.assign(password=await PwdUtil.set_password_hash_many_async(password="123456", count=len(df)))
+
+            create_rows: List[Tuple[int, Dict]] = []
+            update_rows: List[Tuple[int, Dict]] = []
+            for index, user_data in zip(df.index, df.to_dict(orient='records')):
+                user_id = exist_users.get(user_data['username'])
+                if user_id is None:
+                    create_rows.append((index, user_data))
+                else:
+                    update_rows.append((index, {**user_data, 'id': user_id}))
+
+            # 分块批量写入
+            success_count = await cls._write_import_chunks(auth, create_rows, UserCRUD(auth).bulk_create_crud, errors)
+            updated_count = await cls._write_import_chunks(auth, update_rows, UserCRUD(auth).bulk_update_crud, errors)
+            if updated_count:
+                await PrincipalCache.invalidate(db=auth.db)
+            success_count += updated_count
 
             # 返回详细的导入结果
             result = f"成功导入 {success_count} 条数据"
-            if error_msgs:
-                result += "\n错误信息:\n" + "\n".join(error_msgs)
+            if errors:
+                result += "\n错误信息:\n" + "\n".join(f"第{index+1}行: {msg}" for index, msg in sorted(errors.items()))
             return result
             
         except Exception as e:
             logger.error(f"批量导入用户失败: {str(e)}")
             raise CustomException(msg=f"导入失败: {str(e)}")
 
+    @classmethod
+    async def _write_import_chunks(
+            cls,
+            auth: AuthSchema,
+            rows: List[Tuple[int, Dict]],
+            write: Callable[[List[Dict]], Awaitable[None]],
+            errors: Dict[int, str]
+    ) -> int:
+        """
+        分块批量写入导入数据
+
+        每块在独立的保存点中执行;整块失败时回滚该块并逐行重试,定位出错的行。
+
+        :param auth: 认证信息
+        :param rows: (行号, 用户数据) 列表
+        :param write: 批量写入方法
+        :param errors: 行号到错误信息的映射,出错的行写入其中
+        :return: 写入成功的条数
+        """
+        success_count = 0
+        for i in range(0, len(rows), cls.IMPORT_CHUNK_SIZE):
+            chunk = rows[i:i + cls.IMPORT_CHUNK_SIZE]
+            try:
+                async with auth.db.begin_nested():
+                    await write([data for _, data in chunk])
+                success_count += len(chunk)
+                continue
+            except Exception as e:
+                logger.warning(f"导入用户分块写入失败,逐行重试: {str(e)}")
+            for index, data in chunk:
+                try:
+                    async with auth.db.begin_nested():
+                        await write([data])
+                    success_count += 1
+                except Exception as e:
+                    errors[index] = str(e)
+        return success_count
+
     @classmethod
     async def get_import_template_user_service(cls) -> bytes:
         """获取用户导入模板"""
@@ -384,7 +438,7 @@ class UserService:
         )
 
     @classmethod
-    async def export_user_list_service(cls, user_list: List[Dict[str, Any]]) -> bytes:
+    def export_user_list_service(cls, user_list: List[Dict[str, Any]]) -> bytes:
         """导出用户列表"""
         if not user_list:
             raise CustomException(msg="没有数据可导出")
@@ -13,6 +13,7 @@ from app.api.v1.controllers.system.notice_controller import router as NoticeRout
 from app.api.v1.controllers.system.config_controller import router as ConfigRouter
 from app.api.v1.controllers.system.dict_controller import router as DictRouter
 from app.api.v1.controllers.system.job_controller import router as JobRouter
+from app.api.v1.controllers.system.export_controller import router as ExportRouter
 
 SystemApiRouter = APIRouter(prefix="/system")
 
@@ -27,3 +28,4 @@ SystemApiRouter.include_router(router=NoticeRouter, prefix="/notice", tags=["通
 SystemApiRouter.include_router(router=ConfigRouter, prefix="/config", tags=["配置模块"])
 SystemApiRouter.include_router(router=DictRouter, prefix="/dict", tags=["字典模块"])
 SystemApiRouter.include_router(router=JobRouter, prefix="/job", tags=["任务模块"])
+SystemApiRouter.include_router(router=ExportRouter, prefix="/export", tags=["导出模块"])
@@ -31,6 +31,14 @@ class RedisInitKeyConfig(Enum):
     ONLINE_USER = {'key': 'online_user', 'remark': '在线用户信息'}
     System_Config = {'key': 'system_config', 'remark': '系统配置'}
     System_Dict = {'key': 'system_dict', 'remark': '数据字典'}
+    USER_PRINCIPAL = {'key': 'user_principal', 'remark': '认证用户快照'}
+    PERMISSION_VERSION = {'key': 'permission_version', 'remark': '权限版本号'}
+    USER_PERMISSIONS = {'key': 'user_permissions', 'remark': '用户权限快照'}
+    DATA_SCOPE = {'key': 'data_scope', 'remark': '数据权限可见部门'}
+    IP_LOCATION = {'key': 'ip_location', 'remark': 'IP归属地'}
+    EXPORT_JOB = {'key': 'export_job', 'remark': '后台导出任务'}
+    EXPORT_JOB_OWNER = {'key': 'export_job_owner', 'remark': '导出任务所属进程心跳'}
+    SCHEDULER_LOCK = {'key': 'scheduler_lock', 'remark': '系统定时任务锁'}
     
     @property
     def key(self) -> str:
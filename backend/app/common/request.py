@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import math
-from typing import Any, Dict, List, Optional
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import ConfigDict, Field, BaseModel
 from pydantic.alias_generators import to_camel
 
@@ -17,6 +20,7 @@ class PageResultSchema(BaseModel):
     page_size: Optional[int] = Field(default=None, ge=1, description="页面大小，默认为10") 
     total: int = Field(default=0, ge=0, description="总记录数")
     has_next: Optional[bool] = Field(default=False, description="是否有下一页")
+    next_cursor: Optional[str] = Field(default=None, description="下一页游标,仅游标分页时返回")
     items: List[Any] = Field(default_factory=list, description="分页后的数据列表")
 
 
@@ -67,4 +71,83 @@ class PaginationService:
             "page_no": page_no,
             "page_size": page_size,
             "has_next": has_next
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    async def get_page_result(items: List[Any], total: int, page_no: Optional[int] = None, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        输入数据库已分页的数据items与总数total，组装分页结果。
+        与get_page_obj返回结构一致，但不在内存中切片。
+
+        :param items: 当前页数据列表
+        :param total: 总记录数
+        :param page_no: 当前页码,默认为None
+        :param page_size: 当前页面数据量,默认为None
+        :return: 分页或非分页数据对象
+        """
+        if page_no is None or page_size is None:
+            return {
+                "items": items,
+                "total": total,
+                "page_no": None,
+                "page_size": None,
+                "has_next": False
+            }
+
+        return {
+            "items": items,
+            "total": total,
+            "page_no": page_no,
+            "page_size": page_size,
+            "has_next": page_no * page_size < total
+        }
+
+    @staticmethod
+    def encode_cursor(cursor: Optional[Tuple[datetime, int]]) -> Optional[str]:
+        """
+        将 (created_at, id) 编码为不透明的游标字符串
+
+        :param cursor: 最后一条记录的 (created_at, id)
+        :return: 游标字符串,cursor为空时返回None
+        """
+        if not cursor:
+            return None
+        created_at, last_id = cursor
+        raw = json.dumps([created_at.isoformat(), last_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """
+        将游标字符串解码为 (created_at, id)
+
+        :param cursor: 游标字符串
+        :return: (created_at, id),cursor为空时返回None
+        :raises: CustomException 当游标不合法时抛出
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return datetime.fromisoformat(created_at), int(last_id)
+        except Exception:
+            raise CustomException(code=RET.BAD_REQUEST.code, msg="分页游标不合法")
+
+    @staticmethod
+    async def get_cursor_result(items: List[Any], page_size: int, next_cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        组装游标分页结果。游标分页不统计总数,结果中不含total。
+
+        :param items: 当前页数据列表
+        :param page_size: 当前页面数据量
+        :param next_cursor: 下一页游标,为空表示没有下一页
+        :return: 游标分页数据对象
+        """
+        return {
+            "items": items,
+            "page_no": None,
+            "page_size": page_size,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor
+        }
@@ -82,6 +82,12 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080   # refresh_token过期时间(分钟)
     TOKEN_TYPE: str = "bearer"                  # token类型
     JWT_REDIS_EXPIRE_MINUTES: int = 30          # redis缓存过期时间(分钟)
+    PRINCIPAL_CACHE_ENABLE: bool = True         # 是否启用认证用户快照缓存
+    PRINCIPAL_CACHE_LOCAL_SIZE: int = 1024      # 进程内快照缓存最大条数
+    PRINCIPAL_CACHE_LOCAL_TTL: int = 60         # 进程内快照缓存过期时间(秒)
+    PRINCIPAL_CACHE_REDIS_TTL: int = 1800       # Redis快照缓存过期时间(秒)
+    PASSWORD_HASH_WORKERS: int = 4              # 密码计算(bcrypt)线程数
+    PASSWORD_HASH_QUEUE_SIZE: int = 200         # 密码计算最大排队数,超出时拒绝请求
 
     # ================================================= #
     # ******************** 数据库配置 ******************* #
@@ -98,6 +104,7 @@ class Settings(BaseSettings):
     AUTOCOMMIT: bool = False            # 是否自动提交
     AUTOFETCH: bool = False             # 是否自动获取
     EXPIRE_ON_COMMIT: bool = False      # 是否在提交时过期
+    TREE_PATH_ENABLE: bool = True       # 部门、菜单树是否使用层级路径查询(关闭时使用WITH RECURSIVE递归查询)
 
     # SQLite数据库连接
     DB_DRIVER: str
@@ -135,6 +142,8 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_DB_NAME: int
     REDIS_PASSWORD: str
+    REDIS_SCAN_COUNT: int = 1000        # SCAN每批扫描数量提示
+    REDIS_DELETE_BATCH: int = 500       # 批量UNLINK每批键数量
 
     # ================================================= #
     # ******************** 验证码配置 ******************* #
@@ -143,6 +152,9 @@ class Settings(BaseSettings):
     CAPTCHA_EXPIRE_SECONDS: int = 60    # 验证码过期时间(秒)
     CAPTCHA_FONT_SIZE: int = 40         # 字体大小
     CAPTCHA_FONT_PATH: Path = 'static/assets/font/Arial.ttf'  # 字体路径
+    CAPTCHA_POOL_SIZE: int = 200        # 预生成验证码池容量(0为不启用,每次请求即时生成)
+    CAPTCHA_POOL_WORKERS: int = 2       # 验证码生成进程数
+    CAPTCHA_POOL_BATCH: int = 20        # 每个进程每批生成数量
 
     # ================================================= #
     # ********************* 日志配置 ******************* #
@@ -161,6 +173,36 @@ class Settings(BaseSettings):
     OPERATION_LOG_RECORD: bool = True              # 是否记录操作日志
     OPERATION_RECORD_METHOD: List[str] = ["POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]     # 需要记录的请求方法
     IGNORE_OPERATION_FUNCTION: List[str] = ["get_captcha_for_login"]   # 忽略记录的函数
+    OPERATION_LOG_QUEUE_SIZE: int = 10000          # 操作日志写入队列容量,队列满时丢弃并计数
+    OPERATION_LOG_BATCH_SIZE: int = 200            # 操作日志单批写入条数
+    OPERATION_LOG_FLUSH_INTERVAL: float = 1.0      # 操作日志最长刷新间隔(秒)
+    OPERATION_LOG_LOCATE_TIMEOUT: float = 2.0      # 登录日志单批解析IP归属地的总超时时间(秒),超时记为未知
+    OPERATION_LOG_FIELD_MAX_LENGTH: Dict[str, int] = {"request_payload": 8192, "response_json": 8192}    # 操作日志字段最大长度,超出截断
+    OPERATION_LOG_COMPRESS_MIN_SIZE: int = 256     # 操作日志大字段达到该字节数时zlib压缩存储
+    OPERATION_LOG_SINK: str = "sql"                # 操作日志写入目标(sql:数据库 mongo:MongoDB file:压缩JSONL文件)
+    OPERATION_LOG_MONGO_COLLECTION: str = "system_operation_log"   # 操作日志MongoDB集合名
+    OPERATION_LOG_MONGO_TTL: int = 90 * 24 * 3600  # 操作日志MongoDB过期时间(秒),0为不过期
+    OPERATION_LOG_FILE_DIR: Path = LOGGER_DIR.joinpath('operation')    # 操作日志文件目录
+    OPERATION_LOG_RETENTION_DAYS: int = 180        # 数据库操作日志保留天数,0为不清理
+    OPERATION_LOG_PURGE_CRON: str = "0 30 3 * * ?" # 操作日志清理任务执行时间(秒 分 时 日 月 周)
+    OPERATION_LOG_PURGE_BATCH_SIZE: int = 1000     # 操作日志清理单批条数,每批单独提交
+    OPERATION_LOG_PURGE_PAUSE: float = 0.2         # 操作日志清理批次间隔(秒)
+    OPERATION_LOG_PURGE_LOCK_TTL: int = 600        # 操作日志清理任务锁过期时间(秒),每批续期,防止多个工作进程同时清理
+    OPERATION_LOG_ARCHIVE_ENABLE: bool = True      # 清理前是否归档为压缩JSONL文件(至少一次,删除提交失败时可能重复归档)
+    OPERATION_LOG_ARCHIVE_DIR: Path = LOGGER_DIR.joinpath('archive')   # 操作日志归档目录
+
+    # ================================================= #
+    # ****************** IP归属地配置 ****************** #
+    # ================================================= #
+    IP_LOCATION_DB_PATH: Path = BASE_DIR.joinpath('static/ipdb/ip_location.db')  # 离线IP库文件路径
+    IP_LOCATION_HTTP_ENABLE: bool = True    # 离线IP库未收录时是否在线查询
+    IP_LOCATION_HTTP_TIMEOUT: float = 3     # 在线查询超时时间(秒)
+    IP_LOCATION_HTTP_MAX_CONNECTIONS: int = 20  # 在线查询最大连接数
+    IP_LOCATION_CACHE_SIZE: int = 10000     # 在线查询结果进程内缓存条数
+    IP_LOCATION_CACHE_TTL: int = 3600       # 在线查询结果进程内缓存时间(秒)
+    IP_LOCATION_CACHE_REDIS_TTL: int = 7 * 24 * 3600    # 在线查询结果Redis缓存时间(秒)
+    IP_LOCATION_BREAKER_THRESHOLD: int = 5  # 在线查询连续失败熔断阈值
+    IP_LOCATION_BREAKER_RESET: int = 60     # 在线查询熔断冷却时间(秒)
 
     # ================================================= #
     # ******************* Gzip压缩配置 ******************* #
@@ -208,6 +250,15 @@ class Settings(BaseSettings):
     ]
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 最大文件大小(10MB)
 
+    # ================================================= #
+    # ***************** 后台导出配置 ***************** #
+    # ================================================= #
+    EXPORT_JOB_WORKERS: int = 2                         # 同时执行的导出任务数
+    EXPORT_JOB_TTL: int = 2 * 3600                      # 导出任务记录和文件保留时间(秒)
+    EXPORT_JOB_DIR: Path = BASE_DIR.joinpath('export')  # 导出文件目录(不在静态目录下,只能通过下载接口获取)
+    EXPORT_JOB_PURGE_CRON: str = "0 */10 * * * ?"       # 过期导出文件清理时间(秒 分 时 日 月 周)
+    EXPORT_JOB_HEARTBEAT: int = 30                      # 导出进程心跳间隔(秒),超过3个间隔未更新视为进程已退出,其未完成任务置为失败
+
     # ================================================= #
     # ***************** Swagger配置 ***************** #
     # ================================================= #
@@ -22,6 +22,7 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from pymongo import MongoClient
+from aioredis import Redis
 
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.config.setting import settings
@@ -30,6 +31,8 @@ from app.core.exceptions import CustomException
 from app.core.logger import logger
 from app.api.v1.cruds.system.job_crud import JobCRUD
 from app.api.v1.models.system.job_model import JobModel
+from app.module_task.operation_log_task import purge_operation_log
+from app.module_task.export_job_task import purge_export_file
 
 # job 存储
 # 处理Redis 6.0+ ACL格式的用户名:密码
@@ -71,6 +74,8 @@ class SchedulerUtil:
     定时任务相关方法
     """
 
+    redis: Optional[Redis] = None  # 内置任务加锁使用的Redis连接,应用启动时绑定
+
     @classmethod
     def scheduler_event_listener(cls, event: JobEvent | JobExecutionEvent):
         logger.info(f"定时任务事件: {event}")
@@ -89,13 +94,15 @@ class SchedulerUtil:
                 # JobCRUD(AuthSchema(db=session)).set_obj_field_crud(ids=[job_id], status=status, message=job_message)
 
     @classmethod
-    async def init_system_scheduler(cls):
+    async def init_system_scheduler(cls, redis: Optional[Redis] = None):
         """
         应用启动时初始化定时任务
 
+        :param redis: Redis连接,内置任务通过它加锁,保证多进程部署时只有一个进程执行
         :return:
         """
         logger.info('开始启动定时任务...')
+        cls.redis = redis
 
         scheduler.add_listener(cls.scheduler_event_listener, EVENT_ALL)
         scheduler.start()
@@ -110,6 +117,22 @@ class SchedulerUtil:
                     cls.add_job(item)
                 await JobCRUD(auth).set_obj_field_crud(ids=ids, status=True)
 
+        # 内置任务
+        if settings.OPERATION_LOG_RETENTION_DAYS > 0:
+            cls.add_system_job(
+                job_id='system_operation_log_purge',
+                name='操作日志清理',
+                func=purge_operation_log,
+                trigger_args=settings.OPERATION_LOG_PURGE_CRON,
+                kwargs={"redis": cls.redis}
+            )
+        cls.add_system_job(
+            job_id='system_export_file_purge',
+            name='过期导出文件清理',
+            func=purge_export_file,
+            trigger_args=settings.EXPORT_JOB_PURGE_CRON
+        )
+
         logger.info('系统初始定时任务加载成功')
 
     @classmethod
@@ -182,27 +205,10 @@ class SchedulerUtil:
                     jitter=None
                 )
             elif job_info.trigger == 'cron':
-                # 秒、分、时、天、月、星期几、年 ()
-                fields = job_info.trigger_args.strip().split()
-                if len(fields) not in (6, 7):
-                    raise ValueError("无效的 Cron 表达式")
-
-                parsed_fields = [None if field in ('*', '?') else field for field in fields]
-                if len(fields) == 6:
-                    parsed_fields.append(None)
-
-                second, minute, hour, day, month, day_of_week, year = tuple(parsed_fields)
-                trigger = CronTrigger(
-                    second=second,
-                    minute=minute,
-                    hour=hour,
-                    day=day,
-                    month=month,
-                    day_of_week=day_of_week,
-                    year=year,
+                trigger = cls.cron_trigger(
+                    trigger_args=job_info.trigger_args,
                     start_date=job_info.start_date,
-                    end_date=job_info.end_date,
-                    timezone='Asia/Shanghai'
+                    end_date=job_info.end_date
                 )
             else:
                 raise ValueError("无效的 trigger 触发器")
@@ -228,6 +234,64 @@ class SchedulerUtil:
         except Exception as e:
             raise CustomException(msg=f"添加任务失败: {str(e)}")
 
+    @classmethod
+    def cron_trigger(cls, trigger_args: str, start_date: Any = None, end_date: Any = None) -> CronTrigger:
+        """
+        解析 Cron 表达式
+
+        :param trigger_args: Cron 表达式(秒 分 时 天 月 星期几 [年])
+        :param start_date: 开始时间
+        :param end_date: 结束时间
+        :return: Cron 触发器
+        """
+        # 秒、分、时、天、月、星期几、年 ()
+        fields = trigger_args.strip().split()
+        if len(fields) not in (6, 7):
+            raise ValueError("无效的 Cron 表达式")
+
+        parsed_fields = [None if field in ('*', '?') else field for field in fields]
+        if len(fields) == 6:
+            parsed_fields.append(None)
+
+        second, minute, hour, day, month, day_of_week, year = tuple(parsed_fields)
+        return CronTrigger(
+            second=second,
+            minute=minute,
+            hour=hour,
+            day=day,
+            month=month,
+            day_of_week=day_of_week,
+            year=year,
+            start_date=start_date,
+            end_date=end_date,
+            timezone='Asia/Shanghai'
+        )
+
+    @classmethod
+    def add_system_job(cls, job_id: str, name: str, func: Callable, trigger_args: str, kwargs: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        注册内置定时任务,不保存在任务表中,每次启动时重新注册
+
+        :param job_id: 任务id
+        :param name: 任务名称
+        :param func: 任务函数
+        :param trigger_args: Cron 表达式
+        :param kwargs: 任务函数的关键字参数(内存存储,可传入连接等不可序列化对象)
+        :return: 任务对象
+        """
+        return scheduler.add_job(
+            func=func,
+            trigger=cls.cron_trigger(trigger_args=trigger_args),
+            kwargs=kwargs,
+            id=job_id,
+            name=name,
+            coalesce=True,
+            max_instances=1,
+            jobstore='default',
+            executor='default',
+            replace_existing=True,
+        )
+
     @classmethod
     def remove_job(cls, job_id: Union[str, int]) -> None:
         """
@@ -1,27 +1,53 @@
 # -*- coding: utf-8 -*-
 
 from pydantic import BaseModel
-from typing import TypeVar, Sequence, Generic, Dict, Any, List, Union, Optional
+from typing import AsyncIterator, TypeVar, Sequence, Generic, Dict, Any, List, Set, Union, Optional, Tuple
 from sqlalchemy.sql.elements import ColumnElement
-from sqlalchemy.orm import selectinload, DeclarativeBase
+from sqlalchemy.orm import selectinload, load_only, raiseload, DeclarativeBase
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import asc, func, select, delete, Select, desc, update, or_, and_
+from sqlalchemy import asc, func, literal, select, delete, Select, desc, update, or_, and_
 
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.models.system.dept_model import DeptModel
 from app.api.v1.models.system.user_model import UserModel
-from app.utils.common_util import get_child_id_map, get_child_recursion
 from app.core.exceptions import CustomException
+from app.core.data_scope_cache import DataScopeCache
+from app.config.setting import settings
+from app.utils.common_util import (
+    get_parent_cte,
+    get_child_cte,
+    get_parent_recursion_sql,
+    get_child_recursion_sql
+)
 
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def load_creator(model: Any) -> ORMOption:
+    """
+    构建创建人加载选项,只加载 UserInfoSchema 所需的 id、name、username,不再级联加载创建人的关联关系
+    
+    Args:
+        model: 含creator关联的模型
+        
+    Returns:
+        ORMOption: 加载选项,可直接用于查询或嵌套在其它加载选项中
+    """
+    return selectinload(model.creator).options(load_only(UserModel.id, UserModel.name, UserModel.username), raiseload("*"))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """基础数据层"""
 
+    # 查询加载策略: {配置名: 关联关系加载选项},由子类按需声明,未声明的配置名使用模型默认加载策略
+    loader_profiles: Dict[str, List[ORMOption]] = {}
+    # 按ID批量更新树节点时每条语句的ID数量
+    TREE_UPDATE_BATCH: int = 500
+
     def __init__(self, model: ModelType, auth: AuthSchema) -> None:
         """
         初始化CRUDBase类
@@ -34,11 +60,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.auth = auth
         self.db: AsyncSession = auth.db
         self.current_user = auth.user
-    async def get(self, **kwargs) -> Optional[ModelType]:
+    async def get(self, profile: Optional[str] = None, **kwargs) -> Optional[ModelType]:
         """
         根据条件获取单个对象
         
         Args:
+            profile: 加载策略配置名
             **kwargs: 查询条件
             
         Returns:
@@ -51,23 +78,22 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             conditions = await self.__build_conditions(**kwargs)
             sql = (select(self.model)
                   .where(*conditions)
-                  .distinct())
-            if hasattr(self.model, "creator"):
-                sql = sql.options(selectinload(self.model.creator))
+                  .options(*self.__loader_options(profile)))
             
             result: Result = await self.db.execute(sql)
-            obj = result.scalars().unique().first()
+            obj = result.scalars().first()
             return obj
         except Exception as e:
             raise CustomException(msg=f"获取查询失败: {str(e)}")
 
-    async def list(self, search: Dict = None, order_by: List[Dict[str, str]] = None) -> Sequence[ModelType]:
+    async def list(self, search: Dict = None, order_by: List[Dict[str, str]] = None, profile: Optional[str] = None) -> Sequence[ModelType]:
         """
         根据条件获取对象列表和总数
         
         Args:
             search: 查询条件,格式为 {'id': value, 'name': value}
             order_by: 排序字段,格式为 [{'id': 'asc'}, {'name': 'desc'}]
+            profile: 加载策略配置名
             
         Returns:
             Sequence[ModelType]: 对象列表
@@ -81,13 +107,159 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             sql = (select(self.model)
                   .where(*conditions)
                   .order_by(*self.__order_by(order))
-                  .distinct())
+                  .options(*self.__loader_options(profile)))
             sql = await self.__filter_permissions(sql)
             result: Result = await self.db.execute(sql)
-            return result.scalars().unique().all()
+            return result.scalars().all()
         except Exception as e:
             raise CustomException(msg=f"列表查询失败: {str(e)}")
 
+    async def page(
+            self,
+            page_no: Optional[int] = None,
+            page_size: Optional[int] = None,
+            search: Dict = None,
+            order_by: List[Dict[str, str]] = None,
+            profile: Optional[str] = None
+    ) -> Tuple[Sequence[ModelType], int]:
+        """
+        根据条件分页获取对象列表和总数,LIMIT/OFFSET 与 COUNT 均下推到数据库执行
+        
+        Args:
+            page_no: 当前页码,为空时返回全部数据
+            page_size: 每页数量,为空时返回全部数据
+            search: 查询条件,格式为 {'id': value, 'name': value}
+            order_by: 排序字段,格式为 [{'id': 'asc'}, {'name': 'desc'}]
+            profile: 加载策略配置名
+            
+        Returns:
+            Tuple[Sequence[ModelType], int]: 当前页对象列表和总数
+            
+        Raises:
+            CustomException: 查询失败时抛出异常
+        """
+        if page_no is None or page_size is None:
+            obj_list = await self.list(search=search, order_by=order_by, profile=profile)
+            return obj_list, len(obj_list)
+
+        try:
+            conditions = await self.__build_conditions(**search) if search else []
+            permission_condition = await self.__permission_condition()
+            if permission_condition is not None:
+                conditions.append(permission_condition)
+
+            # 总数: 单独的 COUNT(*),不加载任何关联对象
+            count_sql = select(func.count()).select_from(self.model).where(*conditions)
+            total = (await self.db.execute(count_sql)).scalar_one()
+
+            # 追加主键排序,保证分页结果稳定
+            order = list(order_by or [{'id': 'asc'}])
+            if not any('id' in item for item in order):
+                order.append({'id': 'asc'})
+            sql = (select(self.model)
+                  .where(*conditions)
+                  .order_by(*self.__order_by(order))
+                  .offset((page_no - 1) * page_size)
+                  .limit(page_size)
+                  .options(*self.__loader_options(profile)))
+
+            result: Result = await self.db.execute(sql)
+            return result.scalars().all(), total
+        except Exception as e:
+            raise CustomException(msg=f"分页查询失败: {str(e)}")
+
+    async def cursor_page(
+            self,
+            page_size: int,
+            cursor: Optional[Tuple[Any, int]] = None,
+            search: Dict = None,
+            profile: Optional[str] = None
+    ) -> Tuple[Sequence[ModelType], Optional[Tuple[Any, int]]]:
+        """
+        根据条件按 (created_at, id) 倒序进行游标(keyset)分页
+
+        与 page 不同,不执行 COUNT 和 OFFSET,每页仅按索引定位到上一页最后一条记录之后,
+        因此查询耗时与翻页深度无关,适用于操作日志等只追加的数据表。
+
+        Args:
+            page_size: 每页数量
+            cursor: 上一页最后一条记录的 (created_at, id),为空时从最新记录开始
+            search: 查询条件,格式为 {'id': value, 'name': value}
+            profile: 加载策略配置名
+
+        Returns:
+            Tuple[Sequence[ModelType], Optional[Tuple[Any, int]]]: 当前页对象列表和下一页游标,没有下一页时游标为None
+
+        Raises:
+            CustomException: 查询失败时抛出异常
+        """
+        if not hasattr(self.model, "created_at"):
+            raise CustomException(msg=f"{self.model.__name__} 不支持游标分页")
+
+        try:
+            conditions = await self.__build_conditions(**search) if search else []
+            permission_condition = await self.__permission_condition()
+            if permission_condition is not None:
+                conditions.append(permission_condition)
+
+            if cursor:
+                created_at, last_id = cursor
+                conditions.append(or_(
+                    self.model.created_at < created_at,
+                    and_(self.model.created_at == created_at, self.model.id < last_id)
+                ))
+
+            # 多取一条用于判断是否存在下一页
+            sql = (select(self.model)
+                  .where(*conditions)
+                  .order_by(self.model.created_at.desc(), self.model.id.desc())
+                  .limit(page_size + 1)
+                  .options(*self.__loader_options(profile)))
+
+            result: Result = await self.db.execute(sql)
+            obj_list = result.scalars().all()
+            if len(obj_list) <= page_size:
+                return obj_list, None
+
+            obj_list = obj_list[:page_size]
+            last = obj_list[-1]
+            return obj_list, (last.created_at, last.id)
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"游标分页查询失败: {str(e)}")
+
+    async def stream(
+            self,
+            search: Dict = None,
+            order_by: List[Dict[str, str]] = None,
+            profile: Optional[str] = None,
+            chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """
+        根据条件以服务端游标分块读取对象列表,适用于导出等全量扫描,内存占用与总行数无关
+        
+        Args:
+            search: 查询条件,格式为 {'id': value, 'name': value}
+            order_by: 排序字段,格式为 [{'id': 'asc'}, {'name': 'desc'}]
+            profile: 加载策略配置名
+            chunk_size: 每块条数
+            
+        Yields:
+            Sequence[ModelType]: 每块对象列表
+        """
+        conditions = await self.__build_conditions(**search) if search else []
+        order = order_by or [{'id': 'asc'}]
+        sql = (select(self.model)
+              .where(*conditions)
+              .order_by(*self.__order_by(order))
+              .options(*self.__loader_options(profile))
+              .execution_options(yield_per=chunk_size))
+        sql = await self.__filter_permissions(sql)
+        result = await self.db.stream(sql)
+        async for obj_list in result.scalars().partitions(chunk_size):
+            yield obj_list
+
     async def create(self, data: Union[CreateSchemaType, Dict]) -> ModelType:
         """
         创建新对象
@@ -106,13 +278,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj = self.model(**obj_dict)
             
             if hasattr(self.model, "creator") and self.current_user:
-                # 设置创建人ID
+                # 设置创建人ID,创建人对象在refresh时加载
                 obj.creator_id = self.current_user.id
-                # 设置创建人对象
-                obj.creator = self.current_user
                 
             self.db.add(obj)
             await self.db.flush()
+            if hasattr(self.model, "tree_path"):
+                # 主键生成后才能确定层级路径
+                obj.tree_path = await self.__build_tree_path(id=obj.id, parent_id=obj.parent_id)
+                await self.db.flush()
             await self.db.refresh(obj)
             return obj
         except Exception as e:
@@ -135,12 +309,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         try:
             obj_dict = data if isinstance(data, dict) else data.model_dump(exclude_unset=True, exclude={"id"})
             obj = await self.get(id=id)
+            old_parent_id = getattr(obj, "parent_id", None)
             
             for key, value in obj_dict.items():
                 if hasattr(obj, key):
                     setattr(obj, key, value)
                     
             await self.db.flush()
+            if hasattr(self.model, "tree_path") and obj.parent_id != old_parent_id:
+                await self.__move_tree_path(obj)
             await self.db.refresh(obj)
             return obj
         except Exception as e:
@@ -196,6 +373,141 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:
             raise CustomException(msg=f"批量更新失败: {str(e)}")
 
+    async def get_tree_child_ids(self, ids: List[int]) -> List[int]:
+        """
+        根据层级路径获取节点自身及所有下级节点ID(单条索引查询)
+        
+        Args:
+            ids: 节点ID列表
+            
+        Returns:
+            List[int]: 节点及下级节点ID列表
+        """
+        if not settings.TREE_PATH_ENABLE:
+            return await get_child_recursion_sql(db=self.db, model=self.model, ids=ids)
+        paths = await self.__get_tree_paths(ids)
+        if not paths:
+            return []
+        sql = select(self.model.id).where(or_(*[self.model.tree_path.like(f"{path}%") for path in paths]))
+        result: Result = await self.db.execute(sql)
+        return list(result.scalars().all())
+
+    async def get_tree_parent_ids(self, ids: List[int]) -> List[int]:
+        """
+        根据层级路径获取节点自身及所有上级节点ID,路径中已包含全部上级ID,无需递归查询
+        
+        Args:
+            ids: 节点ID列表
+            
+        Returns:
+            List[int]: 节点及上级节点ID列表
+        """
+        if not settings.TREE_PATH_ENABLE:
+            return await get_parent_recursion_sql(db=self.db, model=self.model, ids=ids)
+        paths = await self.__get_tree_paths(ids)
+        return list({int(node) for path in paths for node in path.strip("/").split("/") if node})
+
+    async def set_tree_available(self, ids: List[int], available: bool) -> None:
+        """
+        按层级批量设置可用状态: 启用时同时启用所有上级,禁用时同时禁用所有下级
+        
+        Args:
+            ids: 节点ID列表
+            available: 可用状态
+            
+        Raises:
+            CustomException: 更新失败时抛出异常
+        """
+        try:
+            if not settings.TREE_PATH_ENABLE:
+                # MySQL不允许UPDATE的子查询引用被更新的表(错误1093),先用递归CTE查出节点ID,
+                # 再按ID分批更新,避免超长的IN参数列表
+                tree = get_parent_cte(self.model, ids) if available else get_child_cte(self.model, ids)
+                result: Result = await self.db.execute(select(tree.c.id))
+                tree_ids = list(result.scalars().all())
+                for i in range(0, len(tree_ids), self.TREE_UPDATE_BATCH):
+                    sql = (update(self.model)
+                          .where(self.model.id.in_(tree_ids[i:i + self.TREE_UPDATE_BATCH]))
+                          .values(available=available)
+                          .execution_options(synchronize_session=False))
+                    await self.db.execute(sql)
+                await self.db.flush()
+                return
+            paths = await self.__get_tree_paths(ids)
+            if not paths:
+                return
+            if available:
+                parent_ids = {int(node) for path in paths for node in path.strip("/").split("/") if node}
+                condition = self.model.id.in_(parent_ids)
+            else:
+                condition = or_(*[self.model.tree_path.like(f"{path}%") for path in paths])
+            sql = update(self.model).where(condition).values(available=available).execution_options(synchronize_session=False)
+            await self.db.execute(sql)
+            await self.db.flush()
+        except Exception as e:
+            raise CustomException(msg=f"批量更新失败: {str(e)}")
+
+    async def rebuild_tree_path(self) -> None:
+        """
+        根据parent_id重建全表层级路径,用于初始化数据或修复历史数据
+        
+        Raises:
+            CustomException: 重建失败时抛出异常
+        """
+        try:
+            result: Result = await self.db.execute(select(self.model.id, self.model.parent_id))
+            parent_map = {row.id: row.parent_id for row in result.all()}
+            paths: Dict[int, str] = {}
+
+            def build(node_id: int) -> str:
+                if node_id not in paths:
+                    parent_id = parent_map.get(node_id)
+                    prefix = build(parent_id) if parent_id in parent_map else "/"
+                    paths[node_id] = f"{prefix}{node_id}/"
+                return paths[node_id]
+
+            for node_id in parent_map:
+                build(node_id)
+            if paths:
+                await self.db.execute(update(self.model), [{"id": k, "tree_path": v} for k, v in paths.items()])
+                await self.db.flush()
+        except Exception as e:
+            raise CustomException(msg=f"重建层级路径失败: {str(e)}")
+
+    async def __get_tree_paths(self, ids: List[int]) -> List[str]:
+        """获取节点的层级路径"""
+        if not ids:
+            return []
+        result: Result = await self.db.execute(
+            select(self.model.tree_path).where(self.model.id.in_(ids), self.model.tree_path.isnot(None))
+        )
+        return list(result.scalars().all())
+
+    async def __build_tree_path(self, id: int, parent_id: Optional[int]) -> str:
+        """根据上级节点路径生成节点层级路径,格式为 /根ID/.../自身ID/"""
+        if not parent_id:
+            return f"/{id}/"
+        result: Result = await self.db.execute(select(self.model.tree_path).where(self.model.id == parent_id))
+        parent_path = result.scalar_one_or_none() or f"/{parent_id}/"
+        return f"{parent_path}{id}/"
+
+    async def __move_tree_path(self, obj: ModelType) -> None:
+        """节点变更上级后,同步更新自身及所有下级节点的层级路径"""
+        old_path = obj.tree_path
+        new_path = await self.__build_tree_path(id=obj.id, parent_id=obj.parent_id)
+        if not old_path:
+            obj.tree_path = new_path
+            await self.db.flush()
+            return
+        if new_path.startswith(old_path):
+            raise CustomException(msg="上级不能是自身或其下级")
+        sql = (update(self.model)
+              .where(self.model.tree_path.like(f"{old_path}%"))
+              .values(tree_path=literal(new_path) + func.substr(self.model.tree_path, len(old_path) + 1))
+              .execution_options(synchronize_session=False))
+        await self.db.execute(sql)
+        await self.db.flush()
+
     async def update_relationships(self, objs_to_update: List[ModelType], relationship_field: str, related_objs: List[ModelType]) -> None:
         """
         更新对象关系
@@ -217,25 +529,56 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:
             raise CustomException(msg=f"更新关系失败: {str(e)}")
 
+    def __loader_options(self, profile: Optional[str] = None) -> List[ORMOption]:
+        """
+        获取查询加载选项
+        
+        创建人只加载 UserInfoSchema 所需的字段,不再级联加载其角色、岗位等关联;
+        其余关联关系按 profile 对应的加载策略加载。
+        
+        Args:
+            profile: 加载策略配置名
+            
+        Returns:
+            List[ORMOption]: 加载选项列表
+        """
+        options = list(self.loader_profiles.get(profile, [])) if profile else []
+        if hasattr(self.model, "creator"):
+            options.append(load_creator(self.model))
+        return options
+
     async def __filter_permissions(self, sql: Select[Any]) -> Select[Any]:
         """过滤数据权限"""
-        # 1. 如果模型没有creator字段,则不需要过滤
+        # 如果模型没有creator字段,则不需要过滤
         if not hasattr(self.model, "creator"):
             return sql
         
-        sql = sql.options(selectinload(self.model.creator))
+        condition = await self.__permission_condition()
+        if condition is None:
+            return sql
+        return sql.where(condition)
+
+    async def __permission_condition(self) -> Optional[ColumnElement]:
+        """
+        构建数据权限过滤条件
+        
+        Returns:
+            Optional[ColumnElement]: 数据权限条件,为None时表示不需要过滤
+        """
+        # 1. 如果模型没有creator字段,则不需要过滤
+        if not hasattr(self.model, "creator"):
+            return None
         
         # 2. 超级管理员可以查看所有数据
         if not self.current_user or self.current_user.is_superuser:
-            return sql
+            return None
             
         # 3. 如果用户没有部门或角色,则只能查看自己的数据
         if not self.current_user.dept_id or not self.current_user.roles:
-            return sql.where(self.model.creator_id == self.current_user.id)
+            return self.model.creator_id == self.current_user.id
         
         # 4. 获取用户所有角色的权限范围
         data_scopes = set()
-        dept_ids = set()
         
         # data_scope 数据权限范围说明:
         # 1: 仅本人数据权限
@@ -247,12 +590,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for role in self.current_user.roles:
             # 如果有全部数据权限,直接返回所有数据
             if role.data_scope == 4:
-                return sql
+                return None
                 
             data_scopes.add(role.data_scope)
-            # 如果是自定义权限,添加自定义部门
-            if role.data_scope == 5:
-                dept_ids.update({dept.id for dept in role.depts})
         
         conditions = []
         
@@ -261,25 +601,54 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             # 1、仅本人数据
             conditions.append(self.model.creator_id == self.current_user.id)
         
-        if 2 in data_scopes:
-            # 2、本部门数据
-            dept_ids.add(self.current_user.dept_id)
-            
-        if 3 in data_scopes:
-            # 3、本部门及以下数据
-            dept_objs = await CRUDBase(DeptModel, self.auth).list()
-            id_map = get_child_id_map(dept_objs)
-            dept_child_ids = get_child_recursion(id=self.current_user.dept_id, id_map=id_map)
-            dept_ids.update(dept_child_ids)
-        
-        if dept_ids:
-            conditions.append(self.model.creator.has(UserModel.dept_id.in_(list(dept_ids))))
+        # 2、本部门 3、本部门及以下 5、自定义部门
+        if data_scopes & {2, 3, 5}:
+            dept_ids = await self.__visible_dept_ids(data_scopes)
+            if dept_ids:
+                conditions.append(self.model.creator.has(UserModel.dept_id.in_(list(dept_ids))))
         
         # 6. 组合所有条件
         if conditions:
-            return sql.where(and_(*conditions))
+            return and_(*conditions)
             
-        return sql.where(self.model.creator_id == self.current_user.id)
+        return self.model.creator_id == self.current_user.id
+
+    async def __visible_dept_ids(self, data_scopes: Set[int]) -> Set[int]:
+        """
+        获取当前用户按数据权限可见的部门ID集合
+        
+        结果按 用户ID + 权限版本号 缓存,命中时不访问数据库;
+        未知权限版本号(Redis不可用)时每次重新计算。
+        
+        Args:
+            data_scopes: 用户所有可用角色的数据权限范围
+            
+        Returns:
+            Set[int]: 部门ID集合
+        """
+        version = self.auth.permission_version
+        if version is not None:
+            dept_ids = await DataScopeCache.get(user_id=self.current_user.id, version=version)
+            if dept_ids is not None:
+                return dept_ids
+
+        dept_ids = set()
+        # 自定义数据权限部门
+        for role in self.current_user.roles:
+            if role.data_scope == 5:
+                dept_ids.update(dept.id for dept in role.depts)
+
+        # 本部门数据
+        if 2 in data_scopes:
+            dept_ids.add(self.current_user.dept_id)
+
+        # 本部门及以下数据,按部门层级路径单条查询
+        if 3 in data_scopes:
+            dept_ids.update(await CRUDBase(DeptModel, self.auth).get_tree_child_ids([self.current_user.dept_id]))
+
+        if version is not None:
+            await DataScopeCache.set(user_id=self.current_user.id, version=version, dept_ids=dept_ids)
+        return dept_ids
 
     def __order_by(self, order_by: List[Dict[str, str]]) -> List[ColumnElement]:
         """
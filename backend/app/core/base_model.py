@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import zlib
+from typing import Any, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
 
@@ -10,3 +15,51 @@ class ModelBase(AsyncAttrs, DeclarativeBase):
     继承自 AsyncAttrs 和 DeclarativeBase,提供异步操作支持
     """
     __abstract__ = True  # 声明为抽象基类,不会创建实际数据库表
+
+
+class CompressedText(TypeDecorator):
+    """
+    压缩存储的大文本类型
+
+    以二进制存储,首字节为格式标记: 0x00 原文UTF-8, 0x01 zlib压缩。
+    达到 min_size 字节且压缩后更小时压缩,读取时透明解压;
+    兼容由Text列迁移而来、没有格式标记的历史数据。
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    RAW: bytes = b'\x00'
+    ZLIB: bytes = b'\x01'
+
+    def __init__(self, min_size: int = 256, *args: Any, **kwargs: Any) -> None:
+        """
+        :param min_size: 启用压缩的最小字节数
+        """
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        # MySQL的BLOB上限为64KB
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Optional[str], dialect: Any) -> Optional[bytes]:
+        if value is None:
+            return None
+        data = value.encode('utf-8')
+        if len(data) >= self.min_size:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return self.ZLIB + compressed
+        return self.RAW + data
+
+    def process_result_value(self, value: Optional[bytes], dialect: Any) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        if value[:1] == self.ZLIB:
+            return zlib.decompress(value[1:]).decode('utf-8')
+        if value[:1] == self.RAW:
+            return value[1:].decode('utf-8')
+        return value.decode('utf-8', errors='replace')
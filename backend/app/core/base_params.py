@@ -12,6 +12,8 @@ class PaginationQueryParams:
             page_no: Optional[int] = Query(default=None, description="当前页码", ge=1),
             page_size: Optional[int] = Query(default=None, description="每页数量", ge=1, le=100), 
             order_by: Optional[str] = Query(default=None, description="排序字段,格式:[{'field':'asc/desc'}]"),
+            cursor: Optional[str] = Query(default=None, description="游标,传入上一页返回的next_cursor(仅支持游标分页的接口有效)"),
+            cursor_mode: bool = Query(default=False, description="是否使用游标分页,首页传true,后续页传cursor即可(仅支持游标分页的接口有效)"),
     ) -> None:
         """
         初始化分页查询参数
@@ -19,8 +21,17 @@ class PaginationQueryParams:
         :param page_no: 当前页码,默认None
         :param page_size: 每页数量,默认None,最大100
         :param order_by: 排序字段
+        :param cursor: 游标分页的游标,默认None
+        :param cursor_mode: 是否使用游标分页,默认False
         """
         self.page_no = page_no
         self.page_size = page_size
         self.order_by = order_by
+        self.cursor = cursor
+        self.cursor_mode = cursor_mode
+
+    @property
+    def use_cursor(self) -> bool:
+        """是否使用游标分页: 只有显式传入游标或游标分页标记时才使用,其余情况保持页码分页"""
+        return self.cursor is not None or self.cursor_mode
 
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Optional, Set
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+from app.core.principal_cache import PrincipalCache
+from app.utils.cache_util import TTLCache
+
+
+class DataScopeCache:
+    """
+    数据权限可见部门集合缓存
+
+    按 用户ID + 全局权限版本号 缓存用户可见的部门ID集合,L1为进程内TTL LRU缓存,L2为Redis。
+    部门树、角色数据权限变更时递增权限版本号(见 PrincipalCache.invalidate),旧集合随之失效。
+    """
+
+    _local: TTLCache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_LOCAL_SIZE, ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL)
+
+    @staticmethod
+    def _redis_key(user_id: int, version: str) -> str:
+        return f"{RedisInitKeyConfig.DATA_SCOPE.key}:{user_id}:{version}"
+
+    @classmethod
+    async def get(cls, user_id: int, version: str) -> Optional[Set[int]]:
+        """
+        获取用户可见部门ID集合
+
+        :param user_id: 用户ID
+        :param version: 全局权限版本号
+        :return: 部门ID集合,未命中时返回None
+        """
+        dept_ids = cls._local.get((user_id, version))
+        if dept_ids is not None:
+            return dept_ids
+
+        redis = PrincipalCache.redis
+        if redis is None:
+            return None
+        try:
+            data = await redis.get(cls._redis_key(user_id, version))
+        except Exception as e:
+            logger.warning(f"读取用户 {user_id} 数据权限缓存失败: {str(e)}")
+            return None
+        if data is None:
+            return None
+
+        dept_ids = frozenset(json.loads(data))
+        cls._local.set((user_id, version), dept_ids)
+        return dept_ids
+
+    @classmethod
+    async def set(cls, user_id: int, version: str, dept_ids: Set[int]) -> None:
+        """
+        回填用户可见部门ID集合
+
+        :param user_id: 用户ID
+        :param version: 全局权限版本号
+        :param dept_ids: 部门ID集合
+        """
+        dept_ids = frozenset(dept_ids)
+        cls._local.set((user_id, version), dept_ids)
+
+        redis = PrincipalCache.redis
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                cls._redis_key(user_id, version),
+                json.dumps(sorted(dept_ids)),
+                ex=settings.PRINCIPAL_CACHE_REDIS_TTL
+            )
+        except Exception as e:
+            logger.warning(f"写入用户 {user_id} 数据权限缓存失败: {str(e)}")
@@ -11,6 +11,8 @@ from app.core.exceptions import CustomException
 from app.core.security import OAuth2Schema, decode_access_token
 from app.core.database import session_connect
 from app.core.logger import logger
+from app.core.principal_cache import PrincipalCache
+from app.core.permission_cache import PermissionCache, PermissionRegistry
 from app.api.v1.cruds.system.user_crud import UserCRUD
 from app.api.v1.schemas.system.auth_schema import AuthSchema
 
@@ -61,24 +63,23 @@ async def get_current_user(
         
     auth = AuthSchema(db=db)
     
-    # 获取用户信息
-    user = await UserCRUD(auth).get_by_username_crud(username=username)
+    # 优先读取用户快照缓存,未命中时查库并回填(快照中仅保留可用的角色和职位)
+    user, version = await PrincipalCache.get(username=username)
     if not user:
-        raise CustomException(msg="用户不存在")
+        user_obj = await UserCRUD(auth).get_by_username_crud(username=username, profile="auth")
+        if not user_obj:
+            raise CustomException(msg="用户不存在")
+        user = await PrincipalCache.build(user_obj)
+        await PrincipalCache.set(username=username, version=version, principal=user)
     if not user.available:
         raise CustomException(msg="用户已被停用")
     
     # 设置请求上下文
     request.scope["user_id"] = user.id
     request.scope["user_username"] = user.username
-    
-    # 过滤可用的角色和职位
-    if hasattr(user, 'roles'):
-        user.roles = [role for role in user.roles if role.available]
-    if hasattr(user, 'positions'):
-        user.positions = [pos for pos in user.positions if pos.available]
 
     auth.user = user
+    auth.permission_version = version
     return auth
 
 
@@ -95,9 +96,13 @@ class AuthPermission:
         """
         self.permissions = set(permissions) if permissions else None
         self.check_data_scope = check_data_scope
+        # 预编译所需权限的位掩码
+        self.required_mask = PermissionRegistry.mask(self.permissions) if self.permissions else 0
+        self.is_wildcard = bool(self.permissions) and {"*:*:*"} <= self.permissions
 
     async def __call__(
             self,
+            request: Request,
             auth: AuthSchema = Depends(get_current_user),
     ) -> AuthSchema:
         """
@@ -124,26 +129,25 @@ class AuthPermission:
             return auth
 
         # 超级管理员权限标识
-        if {"*:*:*"} <= self.permissions:
+        if self.is_wildcard:
             return auth
 
-        # 获取用户权限集合
-        user_permissions = {
-            menu.permission 
-            for role in auth.user.roles 
-            for menu in role.menus 
-            if menu.permission and menu.available
-        }
+        # 获取用户权限位掩码(优先读取进程内掩码缓存和Redis权限快照,Redis不可用时遍历角色菜单)
+        user_mask = await PermissionCache.get_mask(
+            redis=getattr(request.app.state, "redis", None),
+            user=auth.user,
+            version=auth.permission_version
+        )
 
         # 权限验证
         if self.check_data_scope:
             # 严格模式:要求所有权限都满足
-            if not all(perm in user_permissions for perm in self.permissions):
+            if user_mask & self.required_mask != self.required_mask:
                 logger.error(f"用户 {auth.user.name} 缺少所需的权限: {self.permissions}")
                 raise CustomException(msg="无权限操作", status_code=403)
         else:
             # 非严格模式:满足任一权限即可
-            if not any(perm in user_permissions for perm in self.permissions):
+            if not user_mask & self.required_mask:
                 logger.error(f"用户 {auth.user.name} 缺少任何所需的权限: {self.permissions}")
                 raise CustomException(msg="无权限操作", status_code=403)
 
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
+from aioredis import Redis
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.database import session_connect
+from app.core.exceptions import CustomException
+from app.core.logger import logger
+from app.api.v1.schemas.system.auth_schema import AuthSchema
+
+# 导出任务进度回调: 传入本次新增的已处理行数
+ProgressCallback = Callable[[int], Awaitable[None]]
+# 导出任务构建函数: 在任务自己的数据库会话中生成文件内容(完整字节或字节块异步迭代器)
+ExportBuilder = Callable[[AuthSchema, ProgressCallback], Awaitable[Union[bytes, AsyncIterator[bytes]]]]
+
+
+class ExportJob:
+    """
+    后台导出任务
+
+    提交时在Redis哈希 export_job:{任务ID} 中登记任务并立即返回任务ID,由进程内并发数受限的
+    后台任务在独立的数据库会话中生成文件,写入 EXPORT_JOB_DIR 目录;任务状态、已处理行数和
+    文件名都记录在该哈希中,任务记录和文件在 EXPORT_JOB_TTL 后过期。
+
+    任务记录所属进程的ID,进程定期刷新心跳键 export_job_owner:{进程ID};进程异常退出后心跳过期,
+    查询时其未完成的任务置为失败,不会一直停留在等待/执行状态。
+    """
+
+    PENDING: str = "pending"
+    RUNNING: str = "running"
+    SUCCESS: str = "success"
+    FAILED: str = "failed"
+
+    redis: Optional[Redis] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _tasks: Set[asyncio.Task] = set()
+    _owner: Optional[str] = None
+    _heartbeat_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def init(cls, redis: Optional[Redis]) -> None:
+        """绑定Redis连接、创建导出目录并启动进程心跳,应用启动时调用"""
+        cls.redis = redis
+        cls._owner = uuid.uuid4().hex
+        cls._semaphore = asyncio.Semaphore(settings.EXPORT_JOB_WORKERS)
+        Path(settings.EXPORT_JOB_DIR).mkdir(parents=True, exist_ok=True)
+        if redis is not None:
+            cls._heartbeat_task = asyncio.create_task(cls._heartbeat())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """取消未完成的导出任务并停止心跳,应用关闭时调用"""
+        for task in list(cls._tasks):
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        if cls._heartbeat_task is not None:
+            cls._heartbeat_task.cancel()
+            await asyncio.gather(cls._heartbeat_task, return_exceptions=True)
+            cls._heartbeat_task = None
+            try:
+                await cls.redis.delete(cls._owner_key(cls._owner))
+            except Exception as e:
+                logger.error(f"删除导出进程心跳失败: {str(e)}")
+
+    @staticmethod
+    def _redis_key(job_id: str) -> str:
+        return f"{RedisInitKeyConfig.EXPORT_JOB.key}:{job_id}"
+
+    @staticmethod
+    def _owner_key(owner: str) -> str:
+        return f"{RedisInitKeyConfig.EXPORT_JOB_OWNER.key}:{owner}"
+
+    @classmethod
+    async def _heartbeat(cls) -> None:
+        """定期刷新本进程的心跳键,Redis暂时不可用时记录日志后继续"""
+        while True:
+            try:
+                await cls.redis.set(cls._owner_key(cls._owner), os.getpid(), ex=settings.EXPORT_JOB_HEARTBEAT * 3)
+            except Exception as e:
+                logger.error(f"刷新导出进程心跳失败: {str(e)}")
+            await asyncio.sleep(settings.EXPORT_JOB_HEARTBEAT)
+
+    @classmethod
+    async def submit(cls, auth: AuthSchema, name: str, builder: ExportBuilder, suffix: str = "xlsx") -> str:
+        """
+        提交导出任务
+
+        :param auth: 提交人的认证信息,任务按其数据权限导出
+        :param name: 导出名称,用于下载文件名
+        :param builder: 导出构建函数
+        :param suffix: 文件扩展名
+        :return: 任务ID
+        """
+        if cls.redis is None or cls._semaphore is None:
+            raise CustomException(msg="后台导出需要启用Redis")
+
+        job_id = uuid.uuid4().hex
+        await cls.redis.hset(cls._redis_key(job_id), mapping={
+            "status": cls.PENDING,
+            "name": name,
+            "suffix": suffix,
+            "progress": 0,
+            "user_id": auth.user.id,
+            "owner": cls._owner,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+        await cls.redis.expire(cls._redis_key(job_id), settings.EXPORT_JOB_TTL)
+
+        task = asyncio.create_task(cls._run(job_id=job_id, auth=auth, builder=builder, suffix=suffix))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return job_id
+
+    @classmethod
+    async def get(cls, job_id: str, user_id: int) -> Dict[str, Any]:
+        """
+        获取导出任务信息,只能查看自己提交的任务
+
+        :param job_id: 任务ID
+        :param user_id: 当前用户ID
+        :return: 任务信息
+        """
+        if cls.redis is None:
+            raise CustomException(msg="后台导出需要启用Redis")
+        job = await cls.redis.hgetall(cls._redis_key(job_id))
+        if not job or job.get("user_id") != str(user_id):
+            raise CustomException(msg="导出任务不存在或已过期")
+        if job.get("status") in (cls.PENDING, cls.RUNNING) and not await cls.redis.exists(cls._owner_key(job.get("owner", ""))):
+            # 所属进程已退出,任务不会再继续执行
+            job.update(status=cls.FAILED, msg="导出进程已退出,任务中断")
+            await cls.redis.hset(cls._redis_key(job_id), mapping={"status": job["status"], "msg": job["msg"]})
+        job["job_id"] = job_id
+        job["progress"] = int(job.get("progress") or 0)
+        return job
+
+    @classmethod
+    def file_path(cls, job_id: str, suffix: str) -> Path:
+        """导出文件路径"""
+        return Path(settings.EXPORT_JOB_DIR).joinpath(f"{job_id}.{suffix}")
+
+    @classmethod
+    async def _run(cls, job_id: str, auth: AuthSchema, builder: ExportBuilder, suffix: str) -> None:
+        """执行导出任务,结果写入临时文件,完成后改名为正式文件"""
+        key = cls._redis_key(job_id)
+        path = cls.file_path(job_id, suffix)
+        part = path.with_name(f"{path.name}.part")
+
+        async def progress(count: int) -> None:
+            await cls.redis.hincrby(key, "progress", count)
+
+        async with cls._semaphore:
+            start = time.monotonic()
+            try:
+                await cls.redis.hset(key, "status", cls.RUNNING)
+                async with session_connect() as session:
+                    result = await builder(auth.model_copy(update={"db": session}), progress)
+                    with open(part, "wb") as f:
+                        if isinstance(result, bytes):
+                            await asyncio.to_thread(f.write, result)
+                        else:
+                            async for data in result:
+                                await asyncio.to_thread(f.write, data)
+                os.replace(part, path)
+                await cls.redis.hset(key, mapping={
+                    "status": cls.SUCCESS,
+                    "elapsed": round(time.monotonic() - start, 3)
+                })
+                logger.info(f"导出任务 {job_id} 完成,耗时 {time.monotonic() - start:.2f} 秒")
+            except BaseException as e:
+                part.unlink(missing_ok=True)
+                logger.error(f"导出任务 {job_id} 失败: {str(e)}")
+                try:
+                    await cls.redis.hset(key, mapping={"status": cls.FAILED, "msg": str(e) or type(e).__name__})
+                except Exception:
+                    pass
+                if not isinstance(e, Exception):
+                    raise
+
+    @staticmethod
+    def list_builder(
+            fetch: Callable[[AuthSchema], Awaitable[List[Any]]],
+            export: Callable[[List[Any]], bytes]
+    ) -> ExportBuilder:
+        """
+        由 查询全量数据 + 生成Excel 两步组成的导出构建函数,查询完成后一次性上报行数
+
+        :param fetch: 查询函数,接收任务的认证信息
+        :param export: 生成文件函数,为普通同步函数,在线程中执行
+        :return: 导出构建函数
+        """
+        async def builder(auth: AuthSchema, progress: ProgressCallback) -> bytes:
+            data_list = await fetch(auth)
+            await progress(len(data_list))
+            # 生成文件为纯CPU计算,放入线程中执行,避免阻塞事件循环
+            return await asyncio.to_thread(export, data_list)
+        return builder
+
+    @classmethod
+    def purge_files(cls) -> int:
+        """
+        删除超过保留时间的导出文件
+
+        :return: 删除的文件数
+        """
+        directory = Path(settings.EXPORT_JOB_DIR)
+        if not directory.exists():
+            return 0
+        expire_before = time.time() - settings.EXPORT_JOB_TTL
+        count = 0
+        for path in directory.iterdir():
+            if path.is_file() and path.stat().st_mtime < expire_before:
+                path.unlink(missing_ok=True)
+                count += 1
+        return count
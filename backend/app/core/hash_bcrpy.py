@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config.setting import settings
+from app.core.exceptions import CustomException
+from app.core.logger import logger
 
 # 密码加密配置
 PwdContext = CryptContext(
@@ -14,8 +20,116 @@ PwdContext = CryptContext(
 class PwdUtil:
     """
     密码工具类,提供密码加密和验证功能
+
+    bcrypt每次计算耗时数百毫秒,异步接口(*_async)将计算放入专用的有界线程池,
+    不阻塞事件循环;等待数超过上限时直接拒绝,避免登录洪峰拖垮其他请求。
     """
 
+    running: int = 0        # 正在计算数
+    waiting: int = 0        # 排队等待数
+    max_waiting: int = 0    # 历史最大排队数
+    rejected: int = 0       # 排队已满被拒绝数
+    total: int = 0          # 累计完成数
+    _executor: Optional[ThreadPoolExecutor] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    async def _run(cls, func: Callable[..., Any], *args: Any) -> Any:
+        """在密码计算线程池中执行,并发数不超过线程数,其余请求排队"""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwd_hash")
+            cls._semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+        if cls.waiting >= settings.PASSWORD_HASH_QUEUE_SIZE:
+            cls.rejected += 1
+            logger.warning(f"密码计算排队已满({cls.waiting}),累计拒绝 {cls.rejected} 次")
+            raise CustomException(msg="系统繁忙,请稍后重试")
+
+        cls.waiting += 1
+        cls.max_waiting = max(cls.max_waiting, cls.waiting)
+        acquired = False
+        try:
+            async with cls._semaphore:
+                cls.waiting -= 1
+                acquired = True
+                cls.running += 1
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(cls._executor, func, *args)
+                finally:
+                    cls.running -= 1
+                    cls.total += 1
+        finally:
+            if not acquired:
+                cls.waiting -= 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """密码计算线程池指标"""
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "running": cls.running,
+            "waiting": cls.waiting,
+            "max_waiting": cls.max_waiting,
+            "rejected": cls.rejected,
+            "total": cls.total
+        }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """关闭密码计算线程池,应用关闭时调用"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False)
+            cls._executor = None
+            cls._semaphore = None
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, password_hash: str) -> bool:
+        """
+        在线程池中校验密码是否匹配
+
+        Args:
+            plain_password: 明文密码
+            password_hash: 加密后的密码哈希值
+
+        Returns:
+            bool: 密码是否匹配
+        """
+        return await cls._run(PwdContext.verify, plain_password, password_hash)
+
+    @classmethod
+    async def set_password_hash_async(cls, password: str) -> str:
+        """
+        在线程池中对密码进行加密
+
+        Args:
+            password: 明文密码
+
+        Returns:
+            str: 加密后的密码哈希值
+        """
+        return await cls._run(PwdContext.hash, password)
+
+    @classmethod
+    async def set_password_hash_many_async(cls, password: str, count: int) -> List[str]:
+        """
+        在线程池中为同一明文逐条计算加密哈希,每条使用独立的盐
+
+        每批最多提交线程数个任务,避免批量导入占满排队名额导致登录请求被拒绝。
+
+        Args:
+            password: 明文密码
+            count: 需要生成的哈希数量
+
+        Returns:
+            List[str]: 加密后的密码哈希值列表
+        """
+        hashes: List[str] = []
+        batch_size = settings.PASSWORD_HASH_WORKERS
+        for i in range(0, count, batch_size):
+            hashes.extend(await asyncio.gather(
+                *(cls._run(PwdContext.hash, password) for _ in range(min(batch_size, count - i)))
+            ))
+        return hashes
+
     @classmethod
     def verify_password(cls, plain_password: str, password_hash: str) -> bool:
         """
@@ -7,7 +7,7 @@ from bson.errors import InvalidId
 from bson.json_util import dumps
 from fastapi.encoders import jsonable_encoder
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.results import InsertOneResult, UpdateResult, DeleteResult
+from pymongo.results import InsertOneResult, InsertManyResult, UpdateResult, DeleteResult
 
 from app.core.exceptions import CustomException
 from app.api.v1.schemas.system.operation_log_schema import OperationLogOutSchema
@@ -80,6 +80,30 @@ class MongoCURD:
         except Exception as e:
             raise CustomException(msg=f"创建数据失败: {str(e)}")
 
+    async def create_many(self, data_list: List[Dict], ordered: bool = False) -> InsertManyResult:
+        """
+        批量创建数据,单次 insert_many 写入,已包含时间戳的数据不再覆盖。
+
+        :param data_list: 要创建的数据列表
+        :param ordered: 是否按顺序写入,为False时单条失败不影响其余数据
+        :return: 插入结果
+        """
+        try:
+            now = datetime.datetime.now()
+            documents = []
+            for data in data_list:
+                document = dict(data) if isinstance(data, dict) else jsonable_encoder(data)
+                document.setdefault('created_at', now)
+                document.setdefault('updated_at', now)
+                documents.append(document)
+
+            result = await self.collection.insert_many(documents, ordered=ordered)
+            if not result.acknowledged:
+                raise CustomException(msg="批量创建数据失败")
+            return result
+        except Exception as e:
+            raise CustomException(msg=f"批量创建数据失败: {str(e)}")
+
     async def update(self, _id: str, data: Union[Dict, Any], upsert: bool = False) -> UpdateResult:
         """
         更新数据。
@@ -219,39 +243,28 @@ class MongoCURD:
         return params
 
 
-# class OperationRecordDal(MongoCURD):
-#     """
-#     操作记录数据访问层
-#     """
+class OperationRecordDal(MongoCURD):
+    """
+    操作记录数据访问层
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection: str = "system_operation_log"):
+        """
+        初始化操作记录数据访问层。
 
-#     def __init__(self, db: AsyncIOMotorDatabase):
-#         """
-#         初始化操作记录数据访问层。
+        :param db: 数据库连接
+        :param collection: 集合名称
+        """
+        super().__init__(
+            db=db,
+            collection=collection,
+            schema=OperationLogOutSchema,
+        )
 
-#         :param db: 数据库连接
-#         """
-#         super().__init__(
-#             db=db,
-#             collection="system_operation_log",
-#             schema=OperationLogOutSchema,
-#         )
+    async def create_ttl_index(self, expire_seconds: int) -> None:
+        """
+        按创建时间创建TTL索引,过期文档由MongoDB后台自动删除。
 
-# 创建日志到mongodb(已测试成功，可以成功创建):暂时注释，是因为该中间保存日志到mongodb(已调试成功)，而我现在实现的是记录到mysql的log表
-# if not settings.MONGO_DB_ENABLE:
-#     return response
-# document = OperationLogCreateSchema(
-#     request_ip = request.client.host,
-#     request_os = user_agent.os.family,
-#     request_browser = user_agent.browser.family,
-#     request_path = request.url.path,
-#     request_method = request.method,
-#     request_payload = oper_param,
-#     response_code = response.status_code,
-#     response_json = response_data.decode(),
-#     description = route.name,
-#     creator_id = creator_id
-# )
-# from app.core.mongo_curd import OperationRecordDal
-# from app.core.dependencies import mongo_getter
-# operation_record_dal = OperationRecordDal(db = await mongo_getter(request))
-# await operation_record_dal.create(data=document.model_dump())
\ No newline at end of file
+        :param expire_seconds: 过期时间(秒)
+        """
+        await self.collection.create_index("created_at", name="ttl_created_at", expireAfterSeconds=expire_seconds)
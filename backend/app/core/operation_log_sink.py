@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import gzip
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.config.setting import settings
+from app.core.database import session_connect
+from app.core.logger import logger
+from app.core.mongo_crud import OperationRecordDal
+from app.api.v1.schemas.system.auth_schema import AuthSchema
+from app.api.v1.services.system.operation_log_service import OperationLogService
+
+
+class OperationLogSink:
+    """
+    操作日志写入目标
+
+    由 OperationLogWriter 按批调用 write,open/close 在写入任务启动、停止时各调用一次。
+    """
+
+    async def open(self) -> None:
+        """初始化写入目标"""
+
+    async def write(self, batch: List[Dict]) -> None:
+        """
+        批量写入操作日志
+
+        :param batch: 操作日志字典列表
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """释放写入目标"""
+
+
+class SQLOperationLogSink(OperationLogSink):
+    """写入数据库操作日志表,每批一条多行INSERT"""
+
+    async def write(self, batch: List[Dict]) -> None:
+        async with session_connect() as session:
+            async with session.begin():
+                await OperationLogService.create_log_batch_service(auth=AuthSchema(db=session), data_list=batch)
+
+
+class MongoOperationLogSink(OperationLogSink):
+    """写入MongoDB集合,每批一次无序 insert_many,按创建时间TTL索引自动过期"""
+
+    def __init__(self, db: Any) -> None:
+        """
+        :param db: MongoDB数据库连接
+        """
+        self.dal = OperationRecordDal(db=db, collection=settings.OPERATION_LOG_MONGO_COLLECTION)
+
+    async def open(self) -> None:
+        if settings.OPERATION_LOG_MONGO_TTL <= 0:
+            return
+        try:
+            await self.dal.create_ttl_index(expire_seconds=settings.OPERATION_LOG_MONGO_TTL)
+        except Exception as e:
+            logger.warning(f"创建操作日志TTL索引失败: {str(e)}")
+
+    async def write(self, batch: List[Dict]) -> None:
+        await self.dal.create_many(data_list=batch, ordered=False)
+
+
+class FileOperationLogSink(OperationLogSink):
+    """
+    追加写入gzip压缩的JSONL文件,按天、按进程切分
+
+    每批追加为一个独立的gzip成员,gzip格式允许成员直接拼接,zcat/gzip.open 可完整读出。
+    多个工作进程同时追加同一文件时,超过写缓冲的批次会拆成多次系统调用,不同进程的成员会交错损坏,
+    因此文件名中带进程号,每个文件只有一个写入方。文件写入在线程池中执行,不阻塞事件循环。
+    """
+
+    def __init__(self, directory: Path, prefix: str = "operation_log") -> None:
+        """
+        :param directory: 日志文件目录
+        :param prefix: 文件名前缀
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+
+    async def open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def write(self, batch: List[Dict]) -> None:
+        await asyncio.to_thread(self._append, batch)
+
+    def _append(self, batch: List[Dict]) -> None:
+        filepath = self.directory.joinpath(f"{self.prefix}_{date.today():%Y-%m-%d}_{os.getpid()}.jsonl.gz")
+        lines = ''.join(json.dumps(item, ensure_ascii=False, default=str) + '\n' for item in batch)
+        with gzip.open(filepath, 'ab') as f:
+            f.write(lines.encode('utf-8'))
+
+
+def get_operation_log_sink(state: Any = None) -> OperationLogSink:
+    """
+    根据配置创建操作日志写入目标
+
+    :param state: 应用状态(app.state),MongoDB写入目标从中获取连接
+    :return: 操作日志写入目标
+    """
+    sink = settings.OPERATION_LOG_SINK
+    if sink == "mongo":
+        db = getattr(state, "mongo", None)
+        if db is not None:
+            return MongoOperationLogSink(db=db)
+        logger.warning("未启用MongoDB连接,操作日志改为写入数据库")
+    elif sink == "file":
+        return FileOperationLogSink(directory=settings.OPERATION_LOG_FILE_DIR)
+    elif sink != "sql":
+        logger.warning(f"未知的操作日志写入目标 {sink},改为写入数据库")
+    return SQLOperationLogSink()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.config.setting import settings
+from app.core.logger import logger
+from app.core.operation_log_sink import OperationLogSink, SQLOperationLogSink
+from app.utils.string_util import StringUtil
+from app.utils.ip_local_util import IpLocalUtil
+from app.api.v1.schemas.system.operation_log_schema import OperationLogCreateSchema
+
+
+class OperationLogWriter:
+    """
+    操作日志异步批量写入器
+
+    请求处理完成后只把日志放入进程内有界队列,由后台任务按条数或时间间隔批量写入写入目标(见 OperationLogSink),
+    请求不再等待日志的写入。队列已满时丢弃日志并计数,服务关闭时写完队列中剩余日志。
+    未启动(如脚本中直接调用)时退化为逐条同步写入数据库。
+    """
+
+    dropped: int = 0    # 队列已满被丢弃的日志数
+    failed: int = 0     # 写入失败被丢弃的日志数
+    _queue: Optional[asyncio.Queue] = None
+    _task: Optional[asyncio.Task] = None
+    _sink: OperationLogSink = SQLOperationLogSink()
+    _STOP: Any = object()
+    _LOCATE: str = "_locate"
+
+    @classmethod
+    async def start(cls, sink: OperationLogSink) -> None:
+        """
+        启动后台写入任务,应用启动时调用
+
+        :param sink: 操作日志写入目标
+        """
+        if cls._task is not None:
+            return
+        await sink.open()
+        cls._sink = sink
+        cls._queue = asyncio.Queue(maxsize=settings.OPERATION_LOG_QUEUE_SIZE)
+        cls._spawn()
+        logger.info(f"操作日志异步写入任务已启动,写入目标: {type(sink).__name__}")
+
+    @classmethod
+    def sink(cls) -> OperationLogSink:
+        """当前使用的操作日志写入目标"""
+        return cls._sink
+
+    @classmethod
+    async def stop(cls) -> None:
+        """停止后台写入任务并写完队列中剩余日志,应用关闭时调用"""
+        if cls._task is None:
+            return
+        queue, task = cls._queue, cls._task
+        cls._queue, cls._task = None, None
+        await queue.put(cls._STOP)
+        await task
+        await cls._sink.close()
+        cls._sink = SQLOperationLogSink()
+        if cls.dropped or cls.failed:
+            logger.warning(f"操作日志写入任务已停止,队列满丢弃 {cls.dropped} 条,写入失败 {cls.failed} 条")
+        else:
+            logger.info("操作日志写入任务已停止")
+
+    @classmethod
+    async def put(cls, data: OperationLogCreateSchema, locate: bool = False) -> None:
+        """
+        提交一条操作日志
+
+        :param data: 操作日志创建模型
+        :param locate: 是否在写入前解析请求IP的归属地(登录日志)
+        """
+        item = data.model_dump()
+        if locate:
+            item[cls._LOCATE] = True
+        item["created_at"] = item["updated_at"] = datetime.now()
+        for field, max_length in settings.OPERATION_LOG_FIELD_MAX_LENGTH.items():
+            item[field] = StringUtil.truncate(item.get(field), max_length)
+
+        if cls._queue is None:
+            await cls._write([item])
+            return
+        try:
+            cls._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            cls.dropped += 1
+            if cls.dropped % 1000 == 1:
+                logger.warning(f"操作日志写入队列已满,累计丢弃 {cls.dropped} 条")
+
+    @classmethod
+    def _spawn(cls) -> None:
+        """创建后台写入任务,任务异常退出时自动重启"""
+        cls._task = asyncio.create_task(cls._run(cls._queue))
+        cls._task.add_done_callback(cls._on_task_done)
+
+    @classmethod
+    def _on_task_done(cls, task: asyncio.Task) -> None:
+        """后台写入任务结束回调: 非 stop 导致的退出视为异常,重启任务继续消费队列"""
+        if task is not cls._task or task.cancelled():
+            return
+        exc = task.exception()
+        logger.error(f"操作日志写入任务异常退出,重新启动: {exc!r}")
+        cls._spawn()
+
+    @classmethod
+    async def _run(cls, queue: asyncio.Queue) -> None:
+        """后台任务: 攒够一批或等待超过刷新间隔后批量写入"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is cls._STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + settings.OPERATION_LOG_FLUSH_INTERVAL
+            while len(batch) < settings.OPERATION_LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is cls._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await cls._write(batch)
+
+    @classmethod
+    async def _write(cls, batch: List[Dict]) -> None:
+        """批量写入写入目标,失败时记录日志并丢弃该批次"""
+        try:
+            await cls._locate(batch)
+            await cls._sink.write(batch)
+        except Exception as e:
+            cls.failed += len(batch)
+            logger.error(f"批量写入操作日志失败,丢弃 {len(batch)} 条: {str(e)}")
+
+    @classmethod
+    async def _locate(cls, batch: List[Dict]) -> None:
+        """
+        并发解析批次中登录日志的IP归属地,总耗时不超过 OPERATION_LOG_LOCATE_TIMEOUT,
+        超时或解析失败的记为"未知",不影响日志写入
+
+        :param batch: 操作日志字典列表
+        """
+        items = [item for item in batch if item.pop(cls._LOCATE, False)]
+        if not items:
+            return
+        ips = list({item["request_ip"] for item in items})
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*[IpLocalUtil.get_ip_location(ip) for ip in ips], return_exceptions=True),
+                timeout=settings.OPERATION_LOG_LOCATE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"解析 {len(ips)} 个登录IP归属地超时")
+            results = [None] * len(ips)
+        locations = {ip: result if isinstance(result, str) else "未知" for ip, result in zip(ips, results)}
+        for item in items:
+            item["login_location"] = locations[item["request_ip"]]
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+from aioredis import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+from app.api.v1.models.system.menu_model import MenuModel
+from app.utils.cache_util import TTLCache
+
+
+class PermissionRegistry:
+    """
+    权限标识注册表
+
+    将权限标识字符串映射为进程内唯一的位序号,权限集合以int位掩码表示,
+    校验时只需一次按位与。位序号只在当前进程内有效,不可持久化或跨进程共享。
+    """
+
+    _bits: Dict[str, int] = {}
+
+    @classmethod
+    def intern(cls, permission: str) -> int:
+        """获取权限标识的位序号,未注册时自动分配"""
+        bit = cls._bits.get(permission)
+        if bit is None:
+            bit = cls._bits[permission] = len(cls._bits)
+        return bit
+
+    @classmethod
+    def mask(cls, permissions: Iterable[str]) -> int:
+        """将权限标识集合编译为位掩码"""
+        mask = 0
+        for permission in permissions:
+            mask |= 1 << cls.intern(permission)
+        return mask
+
+    @classmethod
+    async def init_registry(cls, db: AsyncSession) -> None:
+        """应用启动时预注册全部菜单权限标识,使位序号保持紧凑"""
+        result = await db.execute(
+            select(MenuModel.permission).where(MenuModel.permission.isnot(None)).order_by(MenuModel.id)
+        )
+        for permission in result.scalars().all():
+            cls.intern(permission)
+        logger.info(f"权限注册表初始化完成,共 {len(cls._bits)} 个权限标识")
+
+
+class PermissionCache:
+    """
+    用户权限快照缓存
+
+    Redis键 user_permissions:{username} 中保存JSON格式的权限快照:
+    {
+        "schema_version": 快照结构版本,
+        "permission_version": 生成快照时的全局权限版本号,
+        "permissions": 权限标识列表,
+        "menus": 菜单列表,
+        "roles": 角色名称列表,
+        "is_superuser": 是否超级管理员
+    }
+    结构版本或权限版本号不一致时视为失效,由调用方惰性重建。
+    """
+
+    SCHEMA_VERSION: int = 1
+    _masks: TTLCache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_LOCAL_SIZE, ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL)
+
+    @staticmethod
+    def redis_key(username: str) -> str:
+        return f"{RedisInitKeyConfig.USER_PERMISSIONS.key}:{username}"
+
+    @staticmethod
+    def collect_permissions(user: Any) -> Set[str]:
+        """遍历用户可用角色的菜单,收集权限标识集合"""
+        return {
+            menu.permission
+            for role in user.roles
+            if role.available
+            for menu in role.menus
+            if menu.permission and menu.available
+        }
+
+    @classmethod
+    def build(cls, user: Any, menus: List[Dict], permission_version: Optional[str]) -> Dict:
+        """
+        构建权限快照
+
+        :param user: 用户对象(ORM对象或用户快照)
+        :param menus: 用户可见菜单列表
+        :param permission_version: 当前全局权限版本号
+        :return: 权限快照
+        """
+        return {
+            "schema_version": cls.SCHEMA_VERSION,
+            "permission_version": permission_version,
+            "permissions": sorted(cls.collect_permissions(user)),
+            "menus": menus,
+            "roles": [role.name for role in user.roles if role.available],
+            "is_superuser": user.is_superuser
+        }
+
+    @classmethod
+    async def save(cls, redis: Redis, username: str, info: Dict) -> None:
+        """写入权限快照"""
+        await redis.set(
+            cls.redis_key(username),
+            json.dumps(info, ensure_ascii=False, default=str),
+            ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+    @classmethod
+    async def get_permissions(cls, redis: Optional[Redis], user: Any, version: Optional[str] = None) -> Set[str]:
+        """
+        获取用户权限标识集合
+
+        一次MGET同时读取全局权限版本号和权限快照;快照缺失或版本不一致时,
+        由当前用户对象重建并回写。Redis不可用时直接遍历用户角色菜单。
+        重建的快照按用户对象读取时的版本号标记;该版本号已过期时,期间的角色变更
+        不会反映在用户对象中,重建结果只用于本次请求,不回写。
+
+        :param redis: Redis连接
+        :param user: 当前用户(用户快照)
+        :param version: 读取用户快照时的全局权限版本号,为None时视为当前版本
+        :return: 权限标识集合
+        """
+        if redis is None:
+            return cls.collect_permissions(user)
+
+        try:
+            current, data = await redis.mget(
+                RedisInitKeyConfig.PERMISSION_VERSION.key,
+                cls.redis_key(user.username)
+            )
+        except Exception as e:
+            logger.error(f"读取用户 {user.username} 权限快照失败: {str(e)}")
+            return cls.collect_permissions(user)
+
+        current = current or "0"
+        if data:
+            try:
+                info = json.loads(data)
+                if info.get("schema_version") == cls.SCHEMA_VERSION and info.get("permission_version") == current:
+                    return set(info.get("permissions") or [])
+            except ValueError:
+                logger.warning(f"用户 {user.username} 权限快照格式错误,重新构建")
+
+        menus = [
+            menu.model_dump()
+            for role in user.roles
+            if role.available
+            for menu in role.menus
+            if menu.available and menu.type in [1, 2]
+        ]
+        if version is None:
+            version = current
+        info = cls.build(user=user, menus=menus, permission_version=version)
+        if version != current:
+            return set(info["permissions"])
+        try:
+            await cls.save(redis=redis, username=user.username, info=info)
+        except Exception as e:
+            logger.warning(f"回写用户 {user.username} 权限快照失败: {str(e)}")
+        return set(info["permissions"])
+
+    @classmethod
+    async def get_mask(cls, redis: Optional[Redis], user: Any, version: Optional[str] = None) -> int:
+        """
+        获取用户权限位掩码
+
+        已知当前权限版本号时,先查进程内 (用户名, 版本号) 掩码缓存,命中则不访问Redis。
+
+        :param redis: Redis连接
+        :param user: 当前用户(用户快照)
+        :param version: 当前请求已读取的全局权限版本号
+        :return: 权限位掩码
+        """
+        if version is not None:
+            mask = cls._masks.get((user.username, version))
+            if mask is not None:
+                return mask
+
+        mask = PermissionRegistry.mask(await cls.get_permissions(redis=redis, user=user, version=version))
+        if version is not None:
+            cls._masks.set((user.username, version), mask)
+        return mask
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+from typing import Optional, Set, Tuple
+from aioredis import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+from app.api.v1.models.system.user_model import UserModel
+from app.api.v1.schemas.system.user_schema import UserOutSchema
+from app.utils.cache_util import TTLCache
+
+
+class PrincipalCache:
+    """
+    认证用户快照缓存
+
+    L1为进程内TTL LRU缓存,L2为Redis快照,键均由 用户名 + 权限版本号 组成。
+    用户、角色、菜单、部门发生变更时递增全局权限版本号,旧版本快照随之失效。
+    Redis不可用时不做缓存,直接回源数据库。
+    """
+
+    redis: Optional[Redis] = None
+    _local: TTLCache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_LOCAL_SIZE, ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL)
+    _pending: Set[asyncio.Task] = set()
+    _SESSION_FLAG: str = "principal_cache_invalidate"
+
+    @classmethod
+    def init(cls, redis: Optional[Redis]) -> None:
+        """绑定Redis连接,应用启动时调用"""
+        cls.redis = redis
+        cls._local.clear()
+
+    @classmethod
+    def _redis_key(cls, username: str, version: str) -> str:
+        return f"{RedisInitKeyConfig.USER_PRINCIPAL.key}:{username}:{version}"
+
+    @classmethod
+    async def get_version(cls) -> Optional[str]:
+        """获取当前权限版本号,Redis不可用时返回None"""
+        if cls.redis is None:
+            return None
+        try:
+            version = await cls.redis.get(RedisInitKeyConfig.PERMISSION_VERSION.key)
+            return version or "0"
+        except Exception as e:
+            logger.error(f"获取权限版本号失败: {str(e)}")
+            return None
+
+    @classmethod
+    async def get(cls, username: str) -> Tuple[Optional[UserOutSchema], Optional[str]]:
+        """
+        获取用户快照
+
+        :param username: 用户名
+        :return: (用户快照, 权限版本号),未命中时快照为None,回填缓存时需使用返回的版本号
+        """
+        if not settings.PRINCIPAL_CACHE_ENABLE:
+            return None, None
+
+        version = await cls.get_version()
+        if version is None:
+            return None, None
+
+        local_key = (username, version)
+        principal = cls._local.get(local_key)
+        if principal is not None:
+            return principal, version
+
+        try:
+            data = await cls.redis.get(cls._redis_key(username, version))
+            if not data:
+                return None, version
+            principal = UserOutSchema.model_validate_json(data)
+        except Exception as e:
+            logger.warning(f"读取用户 {username} 认证快照失败: {str(e)}")
+            return None, version
+
+        cls._local.set(local_key, principal)
+        return principal, version
+
+    @classmethod
+    async def set(cls, username: str, version: Optional[str], principal: UserOutSchema) -> None:
+        """
+        回填用户快照
+
+        :param username: 用户名
+        :param version: 读取快照时返回的权限版本号,为None时不缓存
+        :param principal: 用户快照
+        """
+        if version is None:
+            return
+        cls._local.set((username, version), principal)
+        try:
+            await cls.redis.set(
+                cls._redis_key(username, version),
+                principal.model_dump_json(),
+                ex=settings.PRINCIPAL_CACHE_REDIS_TTL
+            )
+        except Exception as e:
+            logger.warning(f"写入用户 {username} 认证快照失败: {str(e)}")
+
+    @staticmethod
+    async def build(user: UserModel) -> UserOutSchema:
+        """
+        由用户ORM对象构建快照,仅保留可用的角色和岗位,不包含密码
+
+        :param user: 用户对象
+        :return: 用户快照
+        """
+        if user.dept_id:
+            await user.awaitable_attrs.dept
+        principal = UserOutSchema.model_validate(user)
+        principal.password = None
+        principal.roles = [role for role in principal.roles if role.available]
+        principal.positions = [pos for pos in principal.positions if pos.available]
+        return principal
+
+    @classmethod
+    async def invalidate(cls, db: Optional[AsyncSession] = None) -> None:
+        """
+        递增权限版本号,使所有用户快照失效
+
+        传入db时在事务提交后会再递增一次,避免提交前被并发请求以旧数据回填缓存。
+
+        :param db: 当前请求的数据库会话
+        """
+        await cls._bump()
+        if db is None:
+            return
+        session = db.sync_session
+        if not session.info.get(cls._SESSION_FLAG):
+            session.info[cls._SESSION_FLAG] = True
+            event.listen(session, "after_commit", cls._after_commit, once=True)
+
+    @classmethod
+    def _after_commit(cls, session: Session) -> None:
+        """事务提交后异步递增权限版本号"""
+        session.info.pop(cls._SESSION_FLAG, None)
+        task = asyncio.get_running_loop().create_task(cls._bump())
+        cls._pending.add(task)
+        task.add_done_callback(cls._pending.discard)
+
+    @classmethod
+    async def _bump(cls) -> None:
+        cls._local.clear()
+        if cls.redis is None:
+            return
+        try:
+            await cls.redis.incr(RedisInitKeyConfig.PERMISSION_VERSION.key)
+        except Exception as e:
+            logger.error(f"递增权限版本号失败: {str(e)}")
@@ -1,15 +1,49 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import pickle
-from typing import Any, Optional
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 from aioredis import Redis
+from aioredis.client import Pipeline
+from aioredis.exceptions import NoScriptError
 
+from app.config.setting import settings
 from app.core.logger import logger
 
 
 class RedisCURD:
     """缓存工具类"""
 
+    # 内置Lua脚本,按名称调用,脚本在Redis中原子执行
+    SCRIPTS: Dict[str, str] = {
+        # 读取并删除键,兼容不支持GETDEL的Redis 6.2以下版本
+        "getdel": """
+            local value = redis.call('GET', KEYS[1])
+            if value then
+                redis.call('DEL', KEYS[1])
+            end
+            return value
+        """,
+        # 当前值等于ARGV[1]时替换为ARGV[2]并设置过期时间ARGV[3](秒),返回是否替换
+        "compare_and_set": """
+            if redis.call('GET', KEYS[1]) == ARGV[1] then
+                redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+                return 1
+            end
+            return 0
+        """,
+        # 当前值等于ARGV[1]时删除,返回是否删除
+        "compare_and_delete": """
+            if redis.call('GET', KEYS[1]) == ARGV[1] then
+                return redis.call('DEL', KEYS[1])
+            end
+            return 0
+        """,
+    }
+    _shas: Dict[str, str] = {name: hashlib.sha1(source.encode()).hexdigest() for name, source in SCRIPTS.items()}
+
     def __init__(self, redis: Redis):
         """初始化"""
         self.redis = redis
@@ -30,11 +64,27 @@ class RedisCURD:
             logger.error(f"批量获取缓存失败: {str(e)}")
             return []
     
-    async def get_keys(self, pattern: str = "*") -> list:
+    async def scan_iter(self, pattern: str = "*", count: Optional[int] = None) -> AsyncIterator[str]:
+        """增量遍历缓存键名
+        
+        使用SCAN分批遍历,每次只扫描少量键,不会像KEYS那样长时间阻塞Redis。
+        遍历期间一直存在的键保证返回,期间新增或删除的键可能返回也可能不返回,同一个键可能返回多次。
+        
+        Args:
+            pattern: 键名匹配模式
+            count: 每批扫描数量提示,默认为 REDIS_SCAN_COUNT
+            
+        Returns:
+            AsyncIterator[str]: 键名异步迭代器
+        """
+        async for key in self.redis.scan_iter(match=pattern, count=count or settings.REDIS_SCAN_COUNT):
+            yield key
+
+    async def get_keys(self, pattern: str = "*", count: Optional[int] = None) -> list:
         """获取缓存键名"""
         try:
-            keys = await self.redis.keys(f"{pattern}")
-            return keys
+            # SCAN可能重复返回同一个键,按首次出现顺序去重
+            return list(dict.fromkeys([key async for key in self.scan_iter(pattern, count)]))
         except Exception as e:
             logger.error(f"获取缓存键名失败: {str(e)}")
             return []
@@ -54,6 +104,13 @@ class RedisCURD:
             logger.error(f"获取缓存失败: {str(e)}")
             return None
 
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        """序列化缓存值: 数字和字符串按UTF-8编码,其余对象使用pickle"""
+        if isinstance(value, (int, float, str)):
+            return str(value).encode('utf-8')
+        return pickle.dumps(value)
+
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         """设置缓存"""
         try:
@@ -61,14 +118,11 @@ class RedisCURD:
                 expire = 300
                 
             # 根据数据类型选择序列化方式
-            if isinstance(value, (int, float, str)):
-                data = str(value).encode('utf-8')
-            else:
-                try:
-                    data = pickle.dumps(value)
-                except Exception as e:
-                    logger.error(f"序列化数据失败: {str(e)}")
-                    return False
+            try:
+                data = self._dumps(value)
+            except Exception as e:
+                logger.error(f"序列化数据失败: {str(e)}")
+                return False
                     
             await self.redis.set(
                 name = key,
@@ -81,6 +135,37 @@ class RedisCURD:
             logger.error(f"设置缓存失败: {str(e)}")
             return False
 
+    async def set_many(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """批量设置缓存
+        
+        MSET不支持过期时间,这里在一个事务管道中为每个键执行 SET ... EX,一次往返全部写入。
+        
+        Args:
+            mapping: 键名到缓存值的映射
+            expire: 过期时间(秒),默认300
+            
+        Returns:
+            bool: 是否全部写入成功
+        """
+        if not mapping:
+            return True
+        try:
+            if expire is None:
+                expire = 300
+            try:
+                items = {key: self._dumps(value) for key, value in mapping.items()}
+            except Exception as e:
+                logger.error(f"序列化数据失败: {str(e)}")
+                return False
+
+            async with self.pipeline() as pipe:
+                for key, data in items.items():
+                    pipe.set(name=key, value=data, ex=expire)
+            return True
+        except Exception as e:
+            logger.error(f"批量设置缓存失败: {str(e)}")
+            return False
+
     async def delete(self, *keys: str) -> bool:
         """删除缓存"""
         try:
@@ -90,12 +175,169 @@ class RedisCURD:
             logger.error(f"删除缓存失败: {str(e)}")
             return False
 
+    async def unlink(self, *keys: str) -> int:
+        """批量删除缓存
+        
+        按 REDIS_DELETE_BATCH 分批执行UNLINK,键值内存由Redis后台线程回收。
+        
+        Args:
+            *keys: 可变参数,接收多个键名
+            
+        Returns:
+            int: 删除的键数量
+        """
+        count = 0
+        for i in range(0, len(keys), settings.REDIS_DELETE_BATCH):
+            count += await self.redis.unlink(*keys[i:i + settings.REDIS_DELETE_BATCH])
+        return count
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """批量删除缓存,一次UNLINK删除全部键
+        
+        Args:
+            keys: 键名列表
+            
+        Returns:
+            int: 删除的键数量
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            return await self.redis.unlink(*keys)
+        except Exception as e:
+            logger.error(f"批量删除缓存失败: {str(e)}")
+            return 0
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[Pipeline]:
+        """管道上下文
+        
+        上下文内向管道追加的命令在退出时一次往返执行;transaction为True时以MULTI/EXEC包裹,
+        原子执行。上下文内抛出异常时放弃全部命令。
+        
+        Args:
+            transaction: 是否以事务执行
+            
+        Returns:
+            AsyncIterator[Pipeline]: 管道对象
+        """
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            await pipe.execute()
+
+    @classmethod
+    def register_script(cls, name: str, source: str) -> None:
+        """注册Lua脚本,之后可通过 eval_script 按名称调用
+        
+        Args:
+            name: 脚本名称
+            source: Lua脚本内容
+        """
+        cls.SCRIPTS[name] = source
+        cls._shas[name] = hashlib.sha1(source.encode()).hexdigest()
+
+    async def load_scripts(self) -> None:
+        """将已注册的Lua脚本预加载到Redis脚本缓存,应用启动时调用"""
+        try:
+            for source in self.SCRIPTS.values():
+                await self.redis.script_load(source)
+        except Exception as e:
+            logger.warning(f"预加载Lua脚本失败: {str(e)}")
+
+    async def eval_script(self, name: str, keys: Iterable[str] = (), args: Iterable[Any] = ()) -> Any:
+        """执行已注册的Lua脚本
+        
+        先以EVALSHA只发送脚本摘要执行;Redis重启或脚本缓存被清空时回退为EVAL,同时重新缓存脚本。
+        
+        Args:
+            name: 脚本名称
+            keys: 脚本使用的键名(KEYS)
+            args: 脚本参数(ARGV)
+            
+        Returns:
+            Any: 脚本返回值
+        """
+        keys, args = list(keys), list(args)
+        try:
+            return await self.redis.evalsha(self._shas[name], len(keys), *keys, *args)
+        except NoScriptError:
+            return await self.redis.eval(self.SCRIPTS[name], len(keys), *keys, *args)
+
+    async def getdel(self, key: str) -> Any:
+        """原子读取并删除缓存,一次往返
+        
+        Args:
+            key: 键名
+            
+        Returns:
+            Any: 删除前的缓存值,不存在时返回None
+        """
+        return await self.eval_script("getdel", keys=[key])
+
+    async def compare_and_set(self, key: str, expected: str, value: str, expire: int) -> bool:
+        """当前值等于期望值时原子替换,可用于令牌轮换等场景
+        
+        Args:
+            key: 键名
+            expected: 期望的当前值
+            value: 新值
+            expire: 过期时间(秒)
+            
+        Returns:
+            bool: 是否替换成功
+        """
+        return bool(await self.eval_script("compare_and_set", keys=[key], args=[expected, value, expire]))
+
+    async def compare_and_delete(self, key: str, expected: str) -> bool:
+        """当前值等于期望值时原子删除
+        
+        Args:
+            key: 键名
+            expected: 期望的当前值
+            
+        Returns:
+            bool: 是否删除成功
+        """
+        return bool(await self.eval_script("compare_and_delete", keys=[key], args=[expected]))
+
+    async def acquire_lock(self, key: str, expire: int) -> Optional[str]:
+        """获取分布式锁(SET NX EX)
+        
+        Args:
+            key: 锁键名
+            expire: 锁过期时间(秒),持有方异常退出时自动释放
+            
+        Returns:
+            Optional[str]: 获取成功时返回锁令牌,用于续期和释放;锁已被占用时返回None
+        """
+        token = uuid.uuid4().hex
+        if await self.redis.set(key, token, nx=True, ex=expire):
+            return token
+        return None
+
+    async def extend_lock(self, key: str, token: str, expire: int) -> bool:
+        """为仍由自己持有的锁续期,返回是否仍持有锁"""
+        return await self.compare_and_set(key, token, token, expire)
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """释放仍由自己持有的锁,不会误删其他持有方的锁"""
+        return await self.compare_and_delete(key, token)
+
     async def clear(self, pattern: str = "*") -> bool:
-        """清空缓存"""
+        """清空缓存
+        
+        边SCAN边分批UNLINK,不一次性加载全部键名。
+        """
         try:
-            keys = await self.redis.keys(f"{pattern}")
-            if keys:
-                await self.redis.delete(*keys)
+            batch: List[str] = []
+            async for key in self.scan_iter(pattern):
+                batch.append(key)
+                if len(batch) >= settings.REDIS_DELETE_BATCH:
+                    await self.unlink(*batch)
+                    batch = []
+            if batch:
+                await self.unlink(*batch)
             return True
         except Exception as e:
             logger.error(f"清空缓存失败: {str(e)}")
@@ -6,12 +6,9 @@ from fastapi import Request, Response
 from fastapi.routing import APIRoute
 from user_agents import parse
 
-from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.schemas.system.operation_log_schema import OperationLogCreateSchema
-from app.api.v1.services.system.operation_log_service import OperationLogService
-from app.core.database import session_connect
+from app.core.operation_log_writer import OperationLogWriter
 from app.config.setting import settings
-from app.utils.ip_local_util import IpLocalUtil
 from app.core.logger import logger
 
 """
@@ -59,32 +56,25 @@ class OperationLogRoute(APIRoute):
             response_data = response.body if "application/json" in response.headers.get("Content-Type", "") else b"{}"
             process_time = time.time() - start_time
 
-            async with session_connect() as session:
-                async with session.begin():
-                    auth = AuthSchema(db=session)
-                    # 获取当前用户ID,如果是登录接口则为空
-                    login_location = None
-                    current_user_id = None
-                    if "user_id" in request.scope:
-                        current_user_id = request.scope.get("user_id")
-                    if request.url.path == '/api/v1/system/auth/login':
-                        # 只有登录的才会获取登录地址
-                        login_location = await IpLocalUtil.get_ip_location(request.client.host)
+            # 获取当前用户ID,如果是登录接口则为空
+            current_user_id = None
+            if "user_id" in request.scope:
+                current_user_id = request.scope.get("user_id")
 
-                    await OperationLogService.create_log_service(data=OperationLogCreateSchema(
-                        request_path = request.url.path,
-                        request_method = request.method,
-                        request_payload = payload,
-                        request_ip = request.client.host,
-                        login_location=login_location,
-                        request_os = user_agent.os.family,
-                        request_browser = user_agent.browser.family,
-                        response_code = response.status_code,
-                        response_json = response_data.decode(),
-                        process_time = process_time,
-                        description = route.summary,
-                        creator_id = current_user_id
-                    ), auth = auth) 
+            # 放入写入队列,由后台任务批量写库;只有登录的才会获取登录地址,由后台任务解析
+            await OperationLogWriter.put(OperationLogCreateSchema(
+                request_path = request.url.path,
+                request_method = request.method,
+                request_payload = payload,
+                request_ip = request.client.host,
+                request_os = user_agent.os.family,
+                request_browser = user_agent.browser.family,
+                response_code = response.status_code,
+                response_json = response_data.decode(),
+                process_time = process_time,
+                description = route.summary,
+                creator_id = current_user_id
+            ), locate=request.url.path == '/api/v1/system/auth/login')
             
             return response
 
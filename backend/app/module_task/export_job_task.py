@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from app.core.export_job import ExportJob
+from app.core.logger import logger
+
+
+async def purge_export_file(*args, **kwargs):
+    """
+    清理超过保留时间的后台导出文件
+    """
+    count = await asyncio.to_thread(ExportJob.purge_files)
+    if count:
+        logger.info(f"过期导出文件清理完成,共删除 {count} 个文件")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from aioredis import Redis
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.database import session_connect
+from app.core.logger import logger
+from app.core.operation_log_sink import FileOperationLogSink
+from app.core.redis_crud import RedisCURD
+from app.api.v1.schemas.system.auth_schema import AuthSchema
+from app.api.v1.services.system.operation_log_service import OperationLogService
+
+
+async def purge_operation_log(*args, redis: Optional[Redis] = None, **kwargs):
+    """
+    清理超过保留天数的操作日志
+
+    定时任务注册在每个工作进程中,由Redis锁保证同一时间只有一个进程执行清理,锁在每批后续期;
+    Redis连接由 SchedulerUtil 在注册任务时传入,未启用Redis时记录警告后不加锁执行。
+    按创建时间分批删除,每批在独立事务中提交并短暂休眠,避免长时间持有锁。
+    开启归档时,每批删除的日志在同一事务提交前追加写入压缩JSONL归档文件:归档失败则回滚删除,
+    日志不会丢失;归档后删除提交失败时,这批日志下次清理会再次归档。归档为至少一次语义,
+    可按日志id去重。
+    """
+    days = settings.OPERATION_LOG_RETENTION_DAYS
+    if days <= 0:
+        return
+
+    redis = RedisCURD(redis) if redis is not None else None
+    lock_key = f"{RedisInitKeyConfig.SCHEDULER_LOCK.key}:system_operation_log_purge"
+    token = None
+    if redis is not None:
+        token = await redis.acquire_lock(lock_key, expire=settings.OPERATION_LOG_PURGE_LOCK_TTL)
+        if token is None:
+            logger.info("操作日志清理任务正在其他进程中执行,本次跳过")
+            return
+    else:
+        logger.warning("未启用Redis,操作日志清理任务不加锁执行,多进程部署时可能重复清理")
+
+    try:
+        total = await _purge_batches(redis=redis, lock_key=lock_key, token=token)
+    finally:
+        if redis is not None:
+            await redis.release_lock(lock_key, token)
+    logger.info(f"操作日志清理完成,共清理 {total} 条")
+
+
+async def _purge_batches(redis: Optional[RedisCURD], lock_key: str, token: Optional[str]) -> int:
+    """分批清理过期日志,返回清理条数"""
+    before = datetime.now() - timedelta(days=settings.OPERATION_LOG_RETENTION_DAYS)
+    archive = None
+    if settings.OPERATION_LOG_ARCHIVE_ENABLE:
+        archive = FileOperationLogSink(directory=settings.OPERATION_LOG_ARCHIVE_DIR, prefix="operation_log_archive")
+        await archive.open()
+
+    logger.info(f"开始清理 {before:%Y-%m-%d %H:%M:%S} 之前的操作日志")
+    total = 0
+    while True:
+        async with session_connect() as session:
+            async with session.begin():
+                log_list = await OperationLogService.purge_log_batch_service(
+                    auth=AuthSchema(db=session),
+                    before=before,
+                    batch_size=settings.OPERATION_LOG_PURGE_BATCH_SIZE
+                )
+                if log_list and archive:
+                    await archive.write(log_list)
+
+        total += len(log_list)
+        if len(log_list) < settings.OPERATION_LOG_PURGE_BATCH_SIZE:
+            break
+        if redis is not None and not await redis.extend_lock(lock_key, token, expire=settings.OPERATION_LOG_PURGE_LOCK_TTL):
+            logger.warning("操作日志清理任务锁已失效,停止本次清理")
+            break
+        await asyncio.sleep(settings.OPERATION_LOG_PURGE_PAUSE)
+    return total
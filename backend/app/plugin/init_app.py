@@ -35,6 +35,15 @@ from app.core.exceptions import (
 from app.api.v1.services.system.config_service import ConfigService
 from app.api.v1.services.system.dict_service import DictDataService
 from app.core.database import async_session
+from app.core.principal_cache import PrincipalCache
+from app.core.permission_cache import PermissionRegistry
+from app.core.operation_log_writer import OperationLogWriter
+from app.core.operation_log_sink import get_operation_log_sink
+from app.utils.ip_local_util import IpLocalUtil
+from app.core.hash_bcrpy import PwdUtil
+from app.core.export_job import ExportJob
+from app.core.redis_crud import RedisCURD
+from app.utils.captcha_util import CaptchaPool
 
 
 @asynccontextmanager
@@ -44,18 +53,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     """
     logger.info(settings.BANNER + '\n' + f'{settings.TITLE} 服务开始启动...')
     await import_modules_async(modules=settings.EVENT_LIST, desc="全局事件", app=app, status=True)
+    PrincipalCache.init(redis=getattr(app.state, "redis", None))
+    if getattr(app.state, "redis", None) is not None:
+        await RedisCURD(app.state.redis).load_scripts()
     async with async_session() as session:
         await ConfigService().init_config_service(redis=app.state.redis, db=session)
         logger.info("初始化系统配置完成...")
         await DictDataService().init_dict_service(redis=app.state.redis, db=session)
         logger.info('初始化数据字典完成...')
-    await SchedulerUtil.init_system_scheduler()
+        await PermissionRegistry.init_registry(db=session)
+    await SchedulerUtil.init_system_scheduler(redis=getattr(app.state, "redis", None))
+    IpLocalUtil.init(redis=getattr(app.state, "redis", None))
+    ExportJob.init(redis=getattr(app.state, "redis", None))
+    CaptchaPool.start()
+    if settings.OPERATION_LOG_RECORD:
+        await OperationLogWriter.start(sink=get_operation_log_sink(app.state))
     logger.info(f'{settings.TITLE} 服务成功启动...')
 
     yield
 
+    await CaptchaPool.stop()
+    await ExportJob.stop()
+    await OperationLogWriter.stop()
     await import_modules_async(modules=settings.EVENT_LIST, desc="全局事件", app=app, status=False)
     await SchedulerUtil.close_system_scheduler()
+    await IpLocalUtil.close()
+    PwdUtil.shutdown()
     logger.info(f'{settings.TITLE} 服务关闭...')
 
 def register_middlewares(app: FastAPI) -> None:
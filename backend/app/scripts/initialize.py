@@ -7,7 +7,9 @@ from typing import Dict, List
 from app.core.logger import logger
 from app.config.setting import settings
 from app.core.base_model import ModelBase
+from app.core.base_crud import CRUDBase
 from app.core.database import async_engine, async_session
+from app.api.v1.schemas.system.auth_schema import AuthSchema
 from app.api.v1.models.system import (
     user_model,
     dept_model,
@@ -79,6 +81,10 @@ class InitializeData:
                             session.add_all(objs)
                             await session.flush()  # 立即刷新以检查约束
                             logger.info(f"已向 {table_name} 表写入 {len(objs)} 条记录")
+                            if hasattr(model, "tree_path"):
+                                # 初始化数据只包含parent_id,需补全层级路径
+                                await CRUDBase(model, AuthSchema(db=session)).rebuild_tree_path()
+                                logger.info(f"已重建 {table_name} 表层级路径")
                     except Exception as e:
                         logger.error(f"初始化 {table_name} 表数据失败: {str(e)}")
                         raise
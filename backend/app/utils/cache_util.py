@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    进程内带过期时间的LRU缓存
+
+    仅在单个事件循环内使用,不做线程同步。超过容量时淘汰最久未访问的键,
+    过期的键在访问时惰性删除。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60) -> None:
+        """
+        初始化缓存
+
+        :param maxsize: 最大缓存条数
+        :param ttl: 过期时间(秒)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取缓存,不存在或已过期时返回default"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expire_at, value = item
+        if expire_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """设置缓存,ttl为空时使用默认过期时间"""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """删除缓存"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,19 +1,30 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
 import base64
+import multiprocessing
 import random
 import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from typing import Tuple
+from typing import List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
 
 from app.config.setting import settings
+from app.core.logger import logger
 
 
 class CaptchaUtil:
     """
     验证码工具类
     """
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_font() -> ImageFont.FreeTypeFont:
+        """加载验证码字体,每个进程只加载一次"""
+        return ImageFont.truetype(font=settings.CAPTCHA_FONT_PATH, size=settings.CAPTCHA_FONT_SIZE)
+
     @classmethod 
     def generate_captcha(cls) -> Tuple[str, str]:
         """
@@ -31,7 +42,7 @@ class CaptchaUtil:
         draw = ImageDraw.Draw(image)
 
         # 使用指定字体
-        font = ImageFont.truetype(font=settings.CAPTCHA_FONT_PATH, size=settings.CAPTCHA_FONT_SIZE)
+        font = cls.get_font()
 
         # 计算文本总宽度和高度
         total_width = sum(draw.textbbox((0, 0), char, font=font)[2] for char in captcha_value)
@@ -90,7 +101,7 @@ class CaptchaUtil:
         draw = ImageDraw.Draw(image)
 
         # 设置字体
-        font = ImageFont.truetype(font=settings.CAPTCHA_FONT_PATH, size=settings.CAPTCHA_FONT_SIZE)
+        font = cls.get_font()
 
         # 生成运算数字和运算符
         operators = ['+', '-', '*']
@@ -132,4 +143,87 @@ class CaptchaUtil:
         image.save(buffer, format='PNG', optimize=True)
         base64_string = base64.b64encode(buffer.getvalue()).decode()
 
-        return base64_string, captcha_value
\ No newline at end of file
+        return base64_string, captcha_value
+
+
+def render_captcha_batch(count: int) -> List[Tuple[str, int]]:
+    """
+    批量生成运算验证码,在验证码池的进程池中执行
+    :param count: 生成数量
+    :return: [(base64编码的图片字符串, 计算结果), ...]
+    """
+    return [CaptchaUtil.captcha_arithmetic() for _ in range(count)]
+
+
+class CaptchaPool:
+    """
+    预生成验证码池
+
+    后台生产任务在独立进程池中批量绘制运算验证码,放入容量为 CAPTCHA_POOL_SIZE 的队列,
+    池满时生产任务阻塞等待;获取验证码时直接从队列取出,不在事件循环中绘图和编码。
+    池为空(刚启动或取用过快)时回退为在线程中即时生成。每张验证码只取出一次。
+    """
+
+    _queue: Optional[asyncio.Queue] = None
+    _executor: Optional[ProcessPoolExecutor] = None
+    _tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def start(cls) -> None:
+        """创建进程池并启动生产任务,应用启动时调用"""
+        if not settings.CAPTCHA_ENABLE or settings.CAPTCHA_POOL_SIZE <= 0:
+            return
+        cls._queue = asyncio.Queue(maxsize=settings.CAPTCHA_POOL_SIZE)
+        # 使用spawn启动子进程,避免fork继承事件循环、连接池等运行时状态
+        cls._executor = ProcessPoolExecutor(
+            max_workers=settings.CAPTCHA_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        cls._tasks = [asyncio.create_task(cls._produce()) for _ in range(settings.CAPTCHA_POOL_WORKERS)]
+        logger.info(f"验证码池启动,容量 {settings.CAPTCHA_POOL_SIZE},生产进程 {settings.CAPTCHA_POOL_WORKERS} 个")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """停止生产任务并关闭进程池,应用关闭时调用"""
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+        cls._queue = None
+
+    @classmethod
+    async def _produce(cls) -> None:
+        """生产任务: 批量生成验证码并填充队列"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch = await loop.run_in_executor(cls._executor, render_captcha_batch, settings.CAPTCHA_POOL_BATCH)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"验证码池生成验证码失败: {str(e)}")
+                await asyncio.sleep(5)
+                continue
+            for item in batch:
+                await cls._queue.put(item)
+
+    @classmethod
+    async def get(cls) -> Tuple[str, int]:
+        """
+        获取一张运算验证码
+        :return: [base64编码的图片字符串, 计算结果]
+        """
+        if cls._queue is not None:
+            try:
+                return cls._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        return await asyncio.to_thread(CaptchaUtil.captcha_arithmetic)
+
+    @classmethod
+    def size(cls) -> int:
+        """当前池中可用验证码数量"""
+        return cls._queue.qsize() if cls._queue is not None else 0
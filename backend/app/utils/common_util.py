@@ -3,8 +3,10 @@
 import importlib
 import uuid
 
+from sqlalchemy import CTE, select
 from sqlalchemy.orm import DeclarativeBase
-from typing import Any, List, Dict, Sequence, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Dict, Sequence, Optional, Type
 
 from app.core.logger import logger
 from app.core.exceptions import CustomException
@@ -114,6 +116,56 @@ def get_child_recursion(
         get_child_recursion(child, id_map, ids)
     return ids
 
+def get_parent_cte(model: Type[DeclarativeBase], ids: Sequence[int]) -> CTE:
+    """
+    构建获取节点及所有父级ID的递归CTE(WITH RECURSIVE)
+    使用UNION去重,数据中存在环时递归也能终止
+    :param model: 含id、parent_id字段的模型
+    :param ids: 节点ID列表
+    :return: 递归CTE,列为id、parent_id
+    """
+    tree = select(model.id, model.parent_id).where(model.id.in_(ids)).cte(name="tree_parent", recursive=True)
+    return tree.union(select(model.id, model.parent_id).join(tree, model.id == tree.c.parent_id))
+
+def get_child_cte(model: Type[DeclarativeBase], ids: Sequence[int]) -> CTE:
+    """
+    构建获取节点及所有子级ID的递归CTE(WITH RECURSIVE)
+    使用UNION去重,数据中存在环时递归也能终止
+    :param model: 含id、parent_id字段的模型
+    :param ids: 节点ID列表
+    :return: 递归CTE,列为id
+    """
+    tree = select(model.id).where(model.id.in_(ids)).cte(name="tree_child", recursive=True)
+    return tree.union(select(model.id).join(tree, model.parent_id == tree.c.id))
+
+async def get_parent_recursion_sql(db: AsyncSession, model: Type[DeclarativeBase], ids: Sequence[int]) -> List[int]:
+    """
+    在数据库中递归获取节点及所有父级ID,无需加载全表
+    :param db: 数据库会话
+    :param model: 含id、parent_id字段的模型
+    :param ids: 节点ID列表
+    :return: 节点及所有父级ID列表
+    """
+    if not ids:
+        return []
+    tree = get_parent_cte(model, ids)
+    result = await db.execute(select(tree.c.id))
+    return list(result.scalars().all())
+
+async def get_child_recursion_sql(db: AsyncSession, model: Type[DeclarativeBase], ids: Sequence[int]) -> List[int]:
+    """
+    在数据库中递归获取节点及所有子级ID,无需加载全表
+    :param db: 数据库会话
+    :param model: 含id、parent_id字段的模型
+    :param ids: 节点ID列表
+    :return: 节点及所有子级ID列表
+    """
+    if not ids:
+        return []
+    tree = get_child_cte(model, ids)
+    result = await db.execute(select(tree.c.id))
+    return list(result.scalars().all())
+
 def bytes2human(n: int, format_str: str = '%(value).1f%(symbol)s') -> str:
     """
     字节数转人类可读格式
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import csv
 import io
+import tempfile
 import pandas as pd
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment, PatternFill
@@ -11,6 +15,13 @@ from openpyxl.worksheet.datavalidation import DataValidation
 
 class ExcelUtil:
     """Excel文件处理工具类"""
+
+    # 流式导出支持的格式及其媒体类型
+    EXPORT_MEDIA_TYPES: Dict[str, str] = {
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'csv': 'text/csv; charset=utf-8',
+        'tsv': 'text/tab-separated-values; charset=utf-8'
+    }
     
     @classmethod
     def __mapping_list(cls, list_data: List[Dict[str, Any]], mapping_dict: Dict) -> List:
@@ -87,3 +98,83 @@ class ExcelUtil:
         buffer = io.BytesIO()
         df.to_excel(buffer, index=False, engine='openpyxl')
         return buffer.getvalue()
+
+    @classmethod
+    async def stream_list2excel(cls, chunks: AsyncIterator[List[Dict[str, Any]]], mapping_dict: Dict, read_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """
+        将分块数据流式导出为Excel
+
+        使用openpyxl只写模式逐行写入,工作表内容暂存在临时文件中,生成后分块读出,
+        内存占用与总行数无关;每块数据的写入和保存均在线程中执行,不阻塞事件循环。
+
+        Args:
+            chunks: 分块数据的异步迭代器
+            mapping_dict: 字段名到表头的映射字典
+            read_size: 每次输出的字节数
+
+        Yields:
+            bytes: Excel文件的二进制数据块
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(mapping_dict.values()))
+
+        def append_rows(chunk: List[Dict[str, Any]]) -> None:
+            for item in chunk:
+                ws.append([cls.__cell_value(item.get(key)) for key in mapping_dict])
+
+        async for chunk in chunks:
+            await asyncio.to_thread(append_rows, chunk)
+
+        with tempfile.TemporaryFile() as f:
+            await asyncio.to_thread(wb.save, f)
+            f.seek(0)
+            while data := await asyncio.to_thread(f.read, read_size):
+                yield data
+
+    @classmethod
+    async def stream_list2csv(cls, chunks: AsyncIterator[List[Dict[str, Any]]], mapping_dict: Dict, delimiter: str = ',') -> AsyncIterator[bytes]:
+        """
+        将分块数据流式导出为CSV/TSV,每块数据编码后立即输出
+
+        Args:
+            chunks: 分块数据的异步迭代器
+            mapping_dict: 字段名到表头的映射字典
+            delimiter: 分隔符,TSV传入制表符
+
+        Yields:
+            bytes: UTF-8(带BOM,便于Excel识别中文)编码的数据块
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=delimiter)
+        writer.writerow(mapping_dict.values())
+        yield buffer.getvalue().encode('utf-8-sig')
+        async for chunk in chunks:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([cls.__cell_value(item.get(key)) for key in mapping_dict] for item in chunk)
+            yield buffer.getvalue().encode('utf-8')
+
+    @classmethod
+    def stream_export(cls, chunks: AsyncIterator[List[Dict[str, Any]]], mapping_dict: Dict, file_format: str = 'xlsx') -> AsyncIterator[bytes]:
+        """
+        按格式流式导出分块数据
+
+        Args:
+            chunks: 分块数据的异步迭代器
+            mapping_dict: 字段名到表头的映射字典
+            file_format: 导出格式(xlsx/csv/tsv)
+
+        Returns:
+            AsyncIterator[bytes]: 文件数据块的异步迭代器
+        """
+        if file_format == 'xlsx':
+            return cls.stream_list2excel(chunks=chunks, mapping_dict=mapping_dict)
+        return cls.stream_list2csv(chunks=chunks, mapping_dict=mapping_dict, delimiter='\t' if file_format == 'tsv' else ',')
+
+    @staticmethod
+    def __cell_value(value: Any) -> Any:
+        """将嵌套对象等无法直接写入单元格的值转为字符串"""
+        if value is None or isinstance(value, (str, int, float, bool, datetime)):
+            return value
+        return str(value)
@@ -1,22 +1,224 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import csv
+import ipaddress
+import mmap
 import re
-import requests
+import struct
+import time
 import httpx
+from aioredis import Redis
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
 from app.core.logger import logger
+from app.utils.cache_util import TTLCache
+
+
+class IpLocationDB:
+    """
+    离线IP归属地库
+
+    文件结构(整数均为大端无符号):
+        文件头 16字节: 魔数(8) + 记录数(4) + 保留(4)
+        索引区 每条16字节: 起始IP(4) + 结束IP(4) + 归属地偏移(4) + 归属地长度(4),按起始IP升序
+        文本区 UTF-8编码的归属地字符串,相同归属地只存一份
+    启动时以只读方式内存映射,查询时在索引区二分查找,不整体载入内存。
+    """
+
+    MAGIC: bytes = b"PADMIP\x00\x01"
+    HEADER = struct.Struct(">8sII")
+    RECORD = struct.Struct(">IIII")
+
+    def __init__(self, path: Path) -> None:
+        """
+        打开并映射IP库文件
+
+        :param path: IP库文件路径
+        """
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, _ = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            self._mm.close()
+            raise ValueError(f"IP库文件格式错误: {path}")
+
+    def close(self) -> None:
+        """关闭内存映射"""
+        self._mm.close()
+
+    def search(self, ip: str) -> Optional[str]:
+        """
+        查询IPv4地址归属地
+
+        :param ip: IP地址
+        :return: 归属地,未收录时返回None
+        """
+        value = int(ipaddress.IPv4Address(ip))
+        # 查找最后一条起始IP不大于目标IP的记录
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, = struct.unpack_from(">I", self._mm, self.HEADER.size + mid * self.RECORD.size)
+            if start <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        start, end, offset, length = self.RECORD.unpack_from(self._mm, self.HEADER.size + (lo - 1) * self.RECORD.size)
+        if value > end:
+            return None
+        return self._mm[offset:offset + length].decode("utf-8")
+
+    @classmethod
+    def build(cls, source: Path, target: Path) -> int:
+        """
+        由CSV文件生成IP库文件
+
+        CSV每行为: 起始IP,结束IP,归属地。IP可为点分格式或整数,以#开头的行忽略。
+
+        :param source: CSV文件路径
+        :param target: 生成的IP库文件路径
+        :return: 记录数
+        """
+        ranges: List[Tuple[int, int, str]] = []
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith("#"):
+                    continue
+                start, end, location = row[0], row[1], ",".join(row[2:]).strip()
+                start = int(start) if start.isdigit() else int(ipaddress.IPv4Address(start.strip()))
+                end = int(end) if end.isdigit() else int(ipaddress.IPv4Address(end.strip()))
+                if start > end:
+                    raise ValueError(f"IP段起止颠倒: {row}")
+                ranges.append((start, end, location))
+        ranges.sort()
+        for prev, cur in zip(ranges, ranges[1:]):
+            if cur[0] <= prev[1]:
+                raise ValueError(f"IP段重叠: {prev[:2]} 与 {cur[:2]}")
+
+        text_offset = cls.HEADER.size + len(ranges) * cls.RECORD.size
+        texts: Dict[str, Tuple[int, int]] = {}
+        text_area = bytearray()
+        index_area = bytearray()
+        for start, end, location in ranges:
+            if location not in texts:
+                data = location.encode("utf-8")
+                texts[location] = (text_offset + len(text_area), len(data))
+                text_area += data
+            index_area += cls.RECORD.pack(start, end, *texts[location])
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(ranges), 0))
+            f.write(index_area)
+            f.write(text_area)
+        return len(ranges)
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续失败达到阈值后熔断,熔断期间直接拒绝调用;冷却时间过后放行一次试探调用,
+    成功则恢复,失败则重新熔断。仅在单个事件循环内使用。
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 60) -> None:
+        """
+        初始化熔断器
+
+        :param threshold: 连续失败次数阈值
+        :param reset_timeout: 熔断冷却时间(秒)
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    def allow(self) -> bool:
+        """是否允许本次调用"""
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._probing = True
+        return True
+
+    def success(self) -> None:
+        """记录调用成功"""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def failure(self) -> None:
+        """记录调用失败"""
+        self.failures += 1
+        self._probing = False
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning(f"连续失败 {self.failures} 次,熔断 {self.reset_timeout} 秒")
+            self.opened_at = time.monotonic()
 
 
 class IpLocalUtil:
     """
     获取IP归属地工具类
+
+    优先查询离线IP库,未收录且开启在线查询时再请求ip-api.com。
+    在线查询结果缓存在进程内TTL LRU和Redis中,同一IP的并发查询只发起一次请求,
+    在线服务连续失败时熔断,熔断期间直接返回"未知"。
     """
-    
+
+    db: Optional[IpLocationDB] = None
+    redis: Optional[Redis] = None
+    client: Optional[httpx.AsyncClient] = None
+    breaker: CircuitBreaker = CircuitBreaker(
+        threshold=settings.IP_LOCATION_BREAKER_THRESHOLD,
+        reset_timeout=settings.IP_LOCATION_BREAKER_RESET
+    )
+    _local: TTLCache = TTLCache(maxsize=settings.IP_LOCATION_CACHE_SIZE, ttl=settings.IP_LOCATION_CACHE_TTL)
+    _inflight: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def init(cls, redis: Optional[Redis] = None) -> None:
+        """加载离线IP库并创建共享HTTP客户端,应用启动时调用"""
+        cls.redis = redis
+        if settings.IP_LOCATION_HTTP_ENABLE:
+            cls.client = httpx.AsyncClient(
+                timeout=settings.IP_LOCATION_HTTP_TIMEOUT,
+                limits=httpx.Limits(max_connections=settings.IP_LOCATION_HTTP_MAX_CONNECTIONS)
+            )
+        path = Path(settings.IP_LOCATION_DB_PATH)
+        if not path.exists():
+            logger.warning(f"离线IP库不存在: {path},归属地将仅使用在线查询")
+            return
+        try:
+            cls.db = IpLocationDB(path)
+            logger.info(f"离线IP库加载完成,共 {cls.db.count} 条记录")
+        except Exception as e:
+            logger.error(f"离线IP库加载失败: {str(e)}")
+
+    @classmethod
+    async def close(cls) -> None:
+        """释放离线IP库和HTTP客户端,应用关闭时调用"""
+        if cls.db is not None:
+            cls.db.close()
+            cls.db = None
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
+
     @classmethod
     def is_valid_ip(cls, ip: str) -> bool:
         """
         校验IP格式是否合法
-        
+
         :param ip: IP地址
         :return: 是否合法
         """
@@ -27,42 +229,96 @@ class IpLocalUtil:
     async def get_ip_location(cls, ip: str) -> str:
         """
         获取IP归属地信息
-        
+
         :param ip: IP地址
         :return: IP归属地信息
         """
-        # 校验IP格式
-        if not cls.is_valid_ip(ip):
+        # 校验IP格式,IPv4和IPv6均可
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
             logger.error(f"IP格式不合法: {ip}")
             return "未知"
-        
-        logger.info(f"获取IP归属地: {ip}, 类型: {type(ip)}")
 
         # 内网IP直接返回
-        if ip == '127.0.0.1' or ip == 'localhost':
+        if address.is_private or address.is_loopback:
             return '内网IP'
-            
-        try:
-            # 百度API失败，使用其他API
-            # async with httpx.AsyncClient() as client:
-            #     response = await client.get(
-            #         f'https://qifu-api.baidubce.com/ip/geo/v1/district?ip={ip}',
-            #         timeout=5
-            #     )
-            #     if response.status_code == 200:
-            #         data = response.json().get('data', {})
-            #         return f"【{data.get('owner','')}】-{data.get('country','')}-{data.get('prov','')}-{data.get('city','')}-{data.get('district','')}"
 
-            # 使用ip-api.com API获取IP归属地信息
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f'http://ip-api.com/json/{ip}?lang=zh-CN',
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    return f"{result.get('country','')}-{result.get('regionName','')}-{result.get('city','')}"
+        # 本地IP库只收录IPv4,IPv6直接走在线查询
+        if cls.db is not None and address.version == 4:
+            location = cls.db.search(ip)
+            if location:
+                return location
+
+        if cls.client is None:
+            return "未知"
+        return await cls.get_cached_location(ip)
+
+    @classmethod
+    async def get_cached_location(cls, ip: str) -> str:
+        """
+        带缓存的在线查询,依次查询进程内缓存、Redis、在线服务
+
+        :param ip: IP地址
+        :return: IP归属地信息
+        """
+        location = cls._local.get(ip)
+        if location is not None:
+            return location
+
+        # 同一IP的并发查询共用一个后台任务,发起方被取消不影响其他等待方
+        task = cls._inflight.get(ip)
+        if task is None:
+            task = asyncio.create_task(cls._load_location(ip))
+            cls._inflight[ip] = task
+            task.add_done_callback(lambda _: cls._inflight.pop(ip, None))
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _load_location(cls, ip: str) -> str:
+        """缓存未命中时读取Redis,仍未命中则在线查询并回填缓存"""
+        key = f"{RedisInitKeyConfig.IP_LOCATION.key}:{ip}"
+        if cls.redis is not None:
+            try:
+                location = await cls.redis.get(key)
+                if location:
+                    cls._local.set(ip, location)
+                    return location
+            except Exception as e:
+                logger.warning(f"读取IP归属地缓存失败: {str(e)}")
+
+        location = await cls.get_http_location(ip)
+        if location is None:
+            return "未知"
+
+        cls._local.set(ip, location)
+        if cls.redis is not None:
+            try:
+                await cls.redis.set(key, location, ex=settings.IP_LOCATION_CACHE_REDIS_TTL)
+            except Exception as e:
+                logger.warning(f"写入IP归属地缓存失败: {str(e)}")
+        return location
+
+    @classmethod
+    async def get_http_location(cls, ip: str) -> Optional[str]:
+        """
+        在线查询IP归属地,熔断期间不发起请求
 
+        :param ip: IP地址
+        :return: IP归属地信息,查询失败时返回None
+        """
+        if cls.client is None or not cls.breaker.allow():
+            return None
+        try:
+            # 使用ip-api.com API获取IP归属地信息
+            response = await cls.client.get(f'http://ip-api.com/json/{ip}?lang=zh-CN')
+            response.raise_for_status()
+            result = response.json()
         except Exception as e:
+            cls.breaker.failure()
             logger.error(f"获取IP归属地失败: {e}")
+            return None
+        cls.breaker.success()
+        if result.get('status') == 'fail':
             return "未知"
+        return f"{result.get('country','')}-{result.get('regionName','')}-{result.get('city','')}"
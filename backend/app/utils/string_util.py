@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+from typing import List, Optional
 from app.common.constant import CommonConstant
 
 
@@ -95,3 +95,17 @@ class StringUtil:
         if not (search_str and compare_str_list):
             return False
         return any(search_str.startswith(comp_str) for comp_str in compare_str_list if comp_str)
+
+    @classmethod
+    def truncate(cls, string: Optional[str], max_length: int, marker: str = '...[已截断,原长度{length}]') -> Optional[str]:
+        """
+        超过最大长度时截断字符串并追加截断标记
+
+        :param string: 需要截断的字符串
+        :param max_length: 最大长度,小于等于0时不截断
+        :param marker: 截断标记,{length}为原字符串长度
+        :return: 截断后的字符串
+        """
+        if not string or max_length <= 0 or len(string) <= max_length:
+            return string
+        return string[:max_length] + marker.format(length=len(string))
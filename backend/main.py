@@ -89,6 +89,18 @@ def upgrade(env: EnvironmentEnum = typer.Option(EnvironmentEnum.DEV, "--env", he
     typer.echo("所有迁移已应用。")
 
 
+@shell_app.command()
+def ipdb(source: str = typer.Argument(..., help="IP段CSV文件(起始IP,结束IP,归属地)"), env: EnvironmentEnum = typer.Option(EnvironmentEnum.DEV, "--env", help="运行环境 (dev, test, prod)")):
+    """
+    由CSV文件生成离线IP归属地库。
+    """
+    from pathlib import Path
+    os.environ["ENVIRONMENT"] = env.value
+    from app.config.setting import settings
+    from app.utils.ip_local_util import IpLocationDB
+    count = IpLocationDB.build(source=Path(source), target=Path(settings.IP_LOCATION_DB_PATH))
+    typer.echo(f"离线IP库已生成: {settings.IP_LOCATION_DB_PATH}, 共 {count} 条记录")
+
 if __name__ == '__main__':
     # 启动服务
     # 方式一：
@@ -105,5 +117,8 @@ if __name__ == '__main__':
     # python main.py revision "初始化迁移" --env=dev(不加默认为dev)
     # 应用迁移
     # python main.py upgrade --env=dev(不加默认为dev)
+
+    # 生成离线IP归属地库
+    # python main.py ipdb ip_ranges.csv --env=dev(不加默认为dev)
     
     shell_app()
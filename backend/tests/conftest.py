@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共配置
+
+模型之间通过字符串互相引用(如 UserModel.roles -> "RoleModel"),映射器初始化前必须导入全部模型模块,
+与 app/scripts/initialize.py 一致,测试单独运行时也能正常初始化映射器。
+缺少环境配置文件或SQLAlchemy时不导入,由各测试模块自行跳过(pytest -rs 可查看跳过原因)。
+"""
+
+import importlib
+import pkgutil
+
+try:
+    import sqlalchemy  # noqa: F401
+    from app.config.setting import settings  # noqa: F401
+except (ImportError, FileNotFoundError):
+    pass
+else:
+    from app.api.v1.models import system as system_models
+
+    for module in pkgutil.iter_modules(system_models.__path__):
+        importlib.import_module(f"{system_models.__name__}.{module.name}")
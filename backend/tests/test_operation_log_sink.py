@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+操作日志写入目标测试
+
+MongoDB写入目标使用 mongomock_motor 代替真实的 mongod;文件写入目标验证按进程切分的gzip JSONL文件。
+"""
+
+import asyncio
+import gzip
+import json
+import os
+
+import pytest
+
+pytest.importorskip("motor")
+# 写入目标模块会导入操作日志模型,关联模型由 conftest 统一注册
+pytest.importorskip("sqlalchemy")
+
+try:
+    from app.config.setting import settings
+except FileNotFoundError as e:
+    pytest.skip(f"缺少环境配置文件: {e}", allow_module_level=True)
+
+from app.core.operation_log_sink import FileOperationLogSink, MongoOperationLogSink
+
+BATCH = [
+    {"request_path": "/api/v1/system/user/list", "request_method": "GET", "response_code": 200},
+    {"request_path": "/api/v1/system/role/list", "request_method": "GET", "response_code": 200},
+]
+
+
+def test_mongo_sink_writes_batch_and_ttl_index(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    monkeypatch.setattr(settings, "OPERATION_LOG_MONGO_TTL", 3600)
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["padm_test"]
+        sink = MongoOperationLogSink(db=db)
+        await sink.open()
+        await sink.write([dict(item) for item in BATCH])
+        await sink.close()
+
+        collection = db[settings.OPERATION_LOG_MONGO_COLLECTION]
+        documents = [doc async for doc in collection.find({}, sort=[("request_path", -1)])]
+        indexes = await collection.index_information()
+        return documents, indexes
+
+    documents, indexes = asyncio.run(run())
+    assert [doc["request_path"] for doc in documents] == [item["request_path"] for item in BATCH]
+    assert all(doc["created_at"] and doc["updated_at"] for doc in documents)
+    assert indexes["ttl_created_at"]["expireAfterSeconds"] == 3600
+
+
+def test_mongo_sink_skips_ttl_index_when_disabled(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    monkeypatch.setattr(settings, "OPERATION_LOG_MONGO_TTL", 0)
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["padm_test"]
+        sink = MongoOperationLogSink(db=db)
+        await sink.open()
+        await sink.write([dict(item) for item in BATCH])
+        return await db[settings.OPERATION_LOG_MONGO_COLLECTION].index_information()
+
+    assert "ttl_created_at" not in asyncio.run(run())
+
+
+def test_file_sink_appends_gzip_members_per_process(tmp_path):
+    async def run():
+        sink = FileOperationLogSink(directory=tmp_path)
+        await sink.open()
+        await sink.write(BATCH[:1])
+        await sink.write(BATCH[1:])
+        await sink.close()
+
+    asyncio.run(run())
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    assert files[0].name.endswith(f"_{os.getpid()}.jsonl.gz")
+    with gzip.open(files[0], "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == BATCH
@@ -28,7 +28,7 @@ export function exportLog(query) {
   return request({
     url: '/api/v1/system/log/export',
     method: 'post',
-    data: query,
+    params: query,
     responseType: 'blob',
   })
 }